@@ -1,8 +1,60 @@
 import streamlit as st
-import math
+import altair as alt
+import functools
+import time
+import numpy as np
 import pandas as pd
 from datetime import datetime
-import json
+import os
+import shutil
+import tempfile
+
+from unit_converter import (
+    UnitConverter,
+    CATEGORIES,
+    stream_convert_csv,
+    convert_dataframe,
+    row_pvt_correction,
+    hydrostatic_pressure,
+    hydrostatic_profile,
+    pipe_volume,
+    annular_velocity_grid,
+    string_tally,
+    annular_velocity,
+    pump_pressure,
+    pvt_correction_factor,
+    expression_factor,
+    parse_unit,
+    ConversionHistory,
+    ConversionMetrics,
+    error_summary,
+)
+from unit_converter.expressions import format_dimensions
+from unit_converter.profiling import StageTimer
+from unit_converter.artifacts import (
+    SPOOL_MAX_BYTES,
+    artifact_type,
+    compression_options,
+    iter_csv,
+    iter_csv_as_ndjson,
+    iter_file,
+    iter_ndjson,
+    render_artifact,
+)
+from unit_converter.columnar import (
+    COMPRESSION_OPTIONS,
+    detect_format,
+    read_schema,
+    read_table,
+    convert_table,
+    numeric_columns,
+    write_dataframe,
+    csv_to_columnar,
+)
+from unit_converter.calculators import PSI_TO_BAR, PSI_TO_MPA, BBL_TO_M3, BBL_TO_GAL, FT_TO_M
+
+# Start of this script run, for the rerun latency report
+script_start = time.perf_counter()
 
 # Page configuration
 st.set_page_config(
@@ -214,376 +266,154 @@ st.markdown("""
 
 # Initialize session state
 if 'conversion_history' not in st.session_state:
-    st.session_state.conversion_history = []
+    # Set UNIT_CONVERTER_HISTORY_DB to keep history in a local SQLite file across sessions
+    st.session_state.conversion_history = ConversionHistory(
+        maxlen=50, db_path=os.environ.get("UNIT_CONVERTER_HISTORY_DB")
+    )
 if 'favorites' not in st.session_state:
     st.session_state.favorites = []
 if 'conversion_count' not in st.session_state:
     st.session_state.conversion_count = 0
 
-# Unit definitions (comprehensive)
-length_units = {
-    "millimeter (mm)": 0.001,
-    "centimeter (cm)": 0.01,
-    "meter (m)": 1,
-    "kilometer (km)": 1000,
-    "inch (in)": 0.0254,
-    "foot (ft)": 0.3048,
-    "yard (yd)": 0.9144,
-    "mile (mi)": 1609.34,
-    "nautical mile (nmi)": 1852
-}
-
-area_units = {
-    "square millimeter (mm²)": 1e-6,
-    "square centimeter (cm²)": 1e-4,
-    "square meter (m²)": 1,
-    "square kilometer (km²)": 1e6,
-    "square inch (in²)": 0.00064516,
-    "square foot (ft²)": 0.092903,
-    "square yard (yd²)": 0.836127,
-    "acre": 4046.86,
-    "hectare (ha)": 10000,
-    "square mile (mi²)": 2.58999e6
-}
-
-volume_units = {
-    "cubic millimeter (mm³)": 1e-9,
-    "cubic centimeter (cm³)": 1e-6,
-    "cubic meter (m³)": 1,
-    "liter (L)": 0.001,
-    "milliliter (mL)": 1e-6,
-    "barrel (bbl)": 0.158987,
-    "US gallon (gal)": 0.00378541,
-    "imperial gallon (UK gal)": 0.00454609,
-    "cubic foot (ft³)": 0.0283168,
-    "cubic inch (in³)": 1.63871e-5,
-    "acre-foot": 1233.48,
-    "standard cubic foot (scf)": 0.0283168,
-    "thousand standard cubic feet (mscf)": 28.3168,
-    "million standard cubic feet (mmscf)": 28316.8,
-    "billion cubic feet (bcf)": 2.83168e7,
-    "standard cubic meter (sm³)": 1
-}
-
-mass_units = {
-    "milligram (mg)": 1e-6,
-    "gram (g)": 0.001,
-    "kilogram (kg)": 1,
-    "tonne (metric ton)": 1000,
-    "ounce (oz)": 0.0283495,
-    "pound (lb)": 0.453592,
-    "short ton (US)": 907.185,
-    "long ton (UK)": 1016.05
-}
-
-density_units = {
-    "kg/m³": 1,
-    "g/cm³": 1000,
-    "g/mL": 1000,
-    "lb/ft³": 16.0185,
-    "lb/gal (US)": 119.826,
-    "lb/bbl": 2.85301,
-    "g/L": 1
-}
-
-pressure_units = {
-    "Pascal (Pa)": 1,
-    "kilopascal (kPa)": 1000,
-    "megapascal (MPa)": 1e6,
-    "bar": 1e5,
-    "millibar (mbar)": 100,
-    "psi": 6894.76,
-    "ksi (1000 psi)": 6.89476e6,
-    "atmosphere (atm)": 101325,
-    "mmHg (torr)": 133.322,
-    "kg/cm²": 98066.5,
-    "kg/m²": 9.80665
-}
-
-force_units = {
-    "Newton (N)": 1,
-    "kilonewton (kN)": 1000,
-    "meganewton (MN)": 1e6,
-    "pound-force (lbf)": 4.44822,
-    "kilogram-force (kgf)": 9.80665,
-    "dyne": 1e-5,
-    "kilopond (kp)": 9.80665
-}
-
-energy_units = {
-    "Joule (J)": 1,
-    "kilojoule (kJ)": 1000,
-    "megajoule (MJ)": 1e6,
-    "gigajoule (GJ)": 1e9,
-    "erg": 1e-7,
-    "calorie (cal)": 4.184,
-    "kilocalorie (kcal)": 4184,
-    "British thermal unit (BTU)": 1055.06,
-    "kilowatt-hour (kWh)": 3.6e6,
-    "megawatt-hour (MWh)": 3.6e9,
-    "therm": 1.05506e8,
-    "barrel of oil equivalent (boe)": 6.12e9,
-    "tonne of oil equivalent (toe)": 4.1868e10,
-    "foot-pound (ft·lbf)": 1.35582
-}
-
-power_units = {
-    "Watt (W)": 1,
-    "kilowatt (kW)": 1000,
-    "megawatt (MW)": 1e6,
-    "gigawatt (GW)": 1e9,
-    "horsepower (hp)": 745.7,
-    "metric horsepower (PS)": 735.499,
-    "BTU/hour": 0.293071,
-    "ton of refrigeration": 3516.85
-}
-
-dynamic_visc_units = {
-    "Pascal-second (Pa·s)": 1,
-    "centipoise (cP)": 0.001,
-    "millipascal-second (mPa·s)": 0.001,
-    "poise (P)": 0.1,
-    "lb/(ft·s)": 1.48816,
-    "lb/(ft·hr)": 0.000413378
-}
-
-kinematic_visc_units = {
-    "square meter per second (m²/s)": 1,
-    "centistoke (cSt)": 1e-6,
-    "stoke (St)": 1e-4,
-    "square millimeter per second (mm²/s)": 1e-6,
-    "square foot per second (ft²/s)": 0.092903
-}
-
-liquid_flow_units = {
-    "cubic meter per second (m³/s)": 1,
-    "cubic meter per hour (m³/h)": 1/3600,
-    "cubic meter per day (m³/d)": 1/86400,
-    "barrel per second (bps)": 0.158987,
-    "barrel per minute (bpm)": 0.158987 / 60,
-    "barrel per hour (bph)": 0.158987 / 3600,
-    "barrel per day (bpd)": 0.158987 / 86400,
-    "US gallon per minute (gpm)": 0.00378541 / 60,
-    "US gallon per hour (gph)": 0.00378541 / 3600,
-    "liter per second (L/s)": 0.001,
-    "liter per minute (L/min)": 0.001 / 60,
-    "liter per hour (L/h)": 0.001 / 3600
-}
-
-gas_flow_units = {
-    "standard cubic meter per day (sm³/d)": 1,
-    "standard cubic meter per hour (sm³/h)": 24,
-    "thousand standard cubic feet per day (mscfd)": 28.3168,
-    "million standard cubic feet per day (mmscfd)": 28316.8,
-    "billion cubic feet per day (bcfd)": 2.83168e7,
-    "normal cubic meter per hour (nm³/h)": 24 / 1.0549,
-    "normal cubic meter per day (nm³/d)": 1 / 1.0549,
-    "standard cubic foot per hour (scfh)": 0.0283168 / 24,
-    "standard cubic foot per day (scfd)": 0.0283168
-}
-
-perm_units = {
-    "square meter (m²)": 1,
-    "Darcy (D)": 9.86923e-13,
-    "millidarcy (mD)": 9.86923e-16,
-    "microdarcy (μD)": 9.86923e-19
-}
-
-time_units = {
-    "microsecond (μs)": 1e-6,
-    "millisecond (ms)": 0.001,
-    "second (s)": 1,
-    "minute (min)": 60,
-    "hour (h)": 3600,
-    "day (d)": 86400,
-    "week": 604800,
-    "month (30 days)": 2592000,
-    "year (yr)": 31536000
-}
+# Initialize converter once per process; the factor matrices and metrics are shared across sessions
+@st.cache_resource
+def get_converter():
+    converter = UnitConverter(metrics=ConversionMetrics())
+    converter.build_factor_matrices()
+    return converter
 
-velocity_units = {
-    "meter per second (m/s)": 1,
-    "kilometer per hour (km/h)": 1/3.6,
-    "foot per second (ft/s)": 0.3048,
-    "foot per minute (ft/min)": 0.00508,
-    "mile per hour (mph)": 0.44704,
-    "knot (nautical mile/h)": 0.514444
-}
-
-torque_units = {
-    "Newton-meter (N·m)": 1,
-    "kilonewton-meter (kN·m)": 1000,
-    "foot-pound (ft·lb)": 1.35582,
-    "foot-pound-force (ft·lbf)": 1.35582,
-    "inch-pound (in·lb)": 0.112985,
-    "dyne-centimeter (dyn·cm)": 1e-7
-}
+converter = get_converter()
 
-gor_units = {
-    "standard cubic meter per cubic meter (sm³/m³)": 1,
-    "standard cubic foot per barrel (scf/bbl)": 0.178107,
-    "normal cubic meter per cubic meter (nm³/m³)": 1.0549,
-    "cubic foot per barrel (cf/bbl)": 0.178107
-}
+# Streamed results live on disk in a directory owned by the session
+STREAM_OUTPUT_ROOT = os.path.join(tempfile.gettempdir(), "unit_converter_streams")
+STREAM_OUTPUT_MAX_AGE = 24 * 60 * 60
 
-conc_units = {
-    "milligram per liter (mg/L)": 1,
-    "parts per million (ppm)": 1,
-    "gram per liter (g/L)": 1000,
-    "kilogram per cubic meter (kg/m³)": 1,
-    "parts per billion (ppb)": 0.001,
-    "percent (%)": 10000,
-    "pound per million gallon (lb/Mgal)": 0.119826
-}
-
-heat_cap_units = {
-    "J/(kg·K)": 1,
-    "kJ/(kg·K)": 1000,
-    "cal/(g·°C)": 4186.8,
-    "Btu/(lb·°F)": 4186.8
-}
+@st.cache_resource
+def stream_output_root():
+    """Shared root of the session directories; leftovers of dead processes are swept once at startup"""
+    os.makedirs(STREAM_OUTPUT_ROOT, exist_ok=True)
+    cutoff = time.time() - STREAM_OUTPUT_MAX_AGE
+    for entry in os.scandir(STREAM_OUTPUT_ROOT):
+        if entry.is_dir(follow_symlinks=False) and entry.stat().st_mtime < cutoff:
+            shutil.rmtree(entry.path, ignore_errors=True)
+    return STREAM_OUTPUT_ROOT
 
-therm_cond_units = {
-    "W/(m·K)": 1,
-    "cal/(cm·s·°C)": 418.68,
-    "Btu/(hr·ft·°F)": 1.73073,
-    "Btu·in/(hr·ft²·°F)": 0.144228
-}
+def session_temp_dir():
+    """Temporary directory of this session, deleted with its session state or at process exit"""
+    if 'temp_dir' not in st.session_state:
+        st.session_state.temp_dir = tempfile.TemporaryDirectory(prefix="session_", dir=stream_output_root())
+    return st.session_state.temp_dir.name
 
-angle_units = {
-    "radian (rad)": 1,
-    "degree (deg or °)": math.pi / 180,
-    "gradian (grad)": math.pi / 200,
-    "minute of arc (')" : math.pi / 10800,
-    "second of arc (\")" : math.pi / 648000
-}
+def timed_fragment(func):
+    """Run func as an independent fragment and report how long each run takes"""
+    @st.fragment
+    @functools.wraps(func)
+    def fragment(*args, **kwargs):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        st.session_state.setdefault('fragment_timings', {})[func.__name__] = elapsed_ms
+        st.caption(f"⏱️ {elapsed_ms:.1f} ms")
+    return fragment
 
-resist_units = {
-    "ohm-meter (Ω·m)": 1,
-    "ohm-centimeter (Ω·cm)": 0.01,
-    "ohm-foot (Ω·ft)": 0.3048
+# Download formats: label -> (format, file extension, MIME type)
+EXPORT_FORMATS = {
+    "CSV": ("csv", "csv", "text/csv"),
+    "NDJSON": ("ndjson", "ndjson", "application/x-ndjson"),
+    "Parquet": ("parquet", "parquet", "application/vnd.apache.parquet"),
+    "Feather (Arrow IPC)": ("feather", "feather", "application/vnd.apache.arrow.file"),
 }
+# Text formats are written in chunks: format -> chunk generator
+TEXT_EXPORTS = {"csv": iter_csv, "ndjson": iter_ndjson}
 
-mud_units = {
-    "Specific Gravity (SG)": 1,
-    "pounds per gallon (ppg)": 1 / 8.3454,
-    "pounds per cubic foot (lb/ft³)": 1 / 62.428,
-    "kilograms per cubic meter (kg/m³)": 1 / 1000,
-    "grams per cubic centimeter (g/cm³)": 1
-}
+def export_dataframe(df, export_format, compression=None):
+    """Deferred download of a results table; returns (data, extension, mime)
 
-rop_units = {
-    "meter per hour (m/h)": 1,
-    "meter per minute (m/min)": 60,
-    "foot per hour (ft/h)": 0.3048,
-    "foot per minute (ft/min)": 18.288
-}
+    ``data`` is a callable for st.download_button, so nothing is serialized
+    until the download is clicked.
+    """
+    fmt, extension, mime = EXPORT_FORMATS[export_format]
+    if fmt in TEXT_EXPORTS:
+        extension, mime = artifact_type(extension, mime, compression)
+        return (lambda: render_artifact(TEXT_EXPORTS[fmt](df), compression)), extension, mime
+    
+    def write_columnar():
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as output:
+            write_dataframe(df, output, fmt, compression)
+            output.seek(0)
+            return output.read()
+    return write_columnar, extension, mime
 
-productivity_units = {
-    "barrel per day per psi (bpd/psi)": 1,
-    "cubic meter per day per bar (m³/d/bar)": 6.89476 / 0.158987,
-    "cubic meter per day per kPa (m³/d/kPa)": 0.00689476 / 0.158987
+# Column types of stream_convert_csv output, so columnar re-encoding keeps one schema
+STREAM_COLUMN_TYPES = {
+    "Input Value": "float64",
+    "Input Unit": "string",
+    "Output Value": "float64",
+    "Output Unit": "string",
+    "Error Code": "uint8",
+    "PVT Correction": "float64",
 }
 
-# Unit Converter Class
-class UnitConverter:
-    def __init__(self):
-        self.units = {
-            "Length": length_units,
-            "Area": area_units,
-            "Volume": volume_units,
-            "Mass": mass_units,
-            "Density": density_units,
-            "Pressure": pressure_units,
-            "Force": force_units,
-            "Energy": energy_units,
-            "Power": power_units,
-            "Dynamic Viscosity": dynamic_visc_units,
-            "Kinematic Viscosity": kinematic_visc_units,
-            "Liquid Flow Rate": liquid_flow_units,
-            "Gas Flow Rate": gas_flow_units,
-            "Permeability": perm_units,
-            "Time": time_units,
-            "Velocity": velocity_units,
-            "Torque": torque_units,
-            "Gas-Oil Ratio (GOR)": gor_units,
-            "Salinity / Concentration": conc_units,
-            "Heat Capacity": heat_cap_units,
-            "Thermal Conductivity": therm_cond_units,
-            "Angle": angle_units,
-            "Electrical Resistivity": resist_units,
-            "Mud Weight": mud_units,
-            "Rate of Penetration (ROP)": rop_units,
-            "Productivity Index": productivity_units
-        }
-        self.special_conversions = {
-            "Temperature": self.convert_temperature,
-            "API Gravity ↔ Specific Gravity": self.convert_api_sg,
-        }
-
-    def validate_input(self, category, value):
-        """Validate input values based on category"""
-        invalid_negative = [
-            "Length", "Mass", "Volume", "Area", "Density", "Time", "Permeability",
-            "Dynamic Viscosity", "Kinematic Viscosity", "Liquid Flow Rate", 
-            "Gas Flow Rate", "Energy", "Power", "Force"
-        ]
-        if category in invalid_negative and value < 0:
-            raise ValueError(f"Negative values are not valid for {category}.")
-        if category == "API Gravity ↔ Specific Gravity" and value <= 0:
-            raise ValueError("Invalid value for gravity (must be positive).")
-        return True
-
-    def get_units(self, category):
-        """Get available units for a category"""
-        return self.units.get(category, {})
-
-    def convert(self, category, from_unit, to_unit, value, pvt_correction=1.0):
-        """Convert value from one unit to another"""
-        self.validate_input(category, value)
-        
-        if category in self.special_conversions:
-            return self.special_conversions[category](from_unit, to_unit, value)
-        
-        units = self.get_units(category)
-        if from_unit == to_unit:
-            return value
+def export_csv_file(path, export_format, compression=None):
+    """Deferred download of a streamed CSV result in the chosen format; returns (data, extension, mime)"""
+    fmt, extension, mime = EXPORT_FORMATS[export_format]
+    if fmt in TEXT_EXPORTS:
+        extension, mime = artifact_type(extension, mime, compression)
+        chunks = iter_file if fmt == "csv" else iter_csv_as_ndjson
+        return (lambda: render_artifact(chunks(path), compression)), extension, mime
+    
+    def write_columnar():
+        import pyarrow as pa
         
-        # Convert to base unit, then to target unit
-        base_value = value * units[from_unit]
-        result = base_value / units[to_unit] * pvt_correction
-        return result
+        column_types = {name: pa.type_for_alias(alias) for name, alias in STREAM_COLUMN_TYPES.items()}
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as output:
+            csv_to_columnar(path, output, fmt, compression, column_types)
+            output.seek(0)
+            return output.read()
+    return write_columnar, extension, mime
 
-    def convert_temperature(self, from_unit, to_unit, value):
-        """Convert temperature between different scales"""
-        temp_units = {
-            "Celsius (°C)": lambda x: x,
-            "Fahrenheit (°F)": lambda x: (x - 32) / 1.8,
-            "Kelvin (K)": lambda x: x - 273.15,
-            "Rankine (°R)": lambda x: (x - 491.67) / 1.8
-        }
-        
-        # Convert to Celsius first
-        to_celsius = temp_units[from_unit](value)
-        
-        # Convert from Celsius to target
-        return {
-            "Celsius (°C)": to_celsius,
-            "Fahrenheit (°F)": to_celsius * 1.8 + 32,
-            "Kelvin (K)": to_celsius + 273.15,
-            "Rankine (°R)": to_celsius * 1.8 + 491.67
-        }[to_unit]
+def start_stage_timer(key):
+    """New StageTimer for a run, profiled if the panel's cProfile switch is on"""
+    timer = StageTimer()
+    if st.session_state.get(f"{key}_profile"):
+        timer.start_profile()
+    return timer
 
-    def convert_api_sg(self, from_unit, to_unit, value):
-        """Convert between API Gravity and Specific Gravity"""
-        if from_unit == to_unit:
-            return value
-        if from_unit == "API Gravity (°API)":
-            return 141.5 / (value + 131.5)
-        return 141.5 / value - 131.5
+def performance_panel(key, timer):
+    """'Performance' expander with the stage timings and cProfile dump of the last run"""
+    with st.expander("⏱️ Performance"):
+        st.toggle("🔬 Capture cProfile on the next run", key=f"{key}_profile")
+        if timer is None or not timer.stages:
+            st.caption("Run a conversion to see its stage timings")
+            return
+        st.dataframe(pd.DataFrame({
+            "Stage": [record["stage"] for record in timer.stages],
+            "Wall Time (ms)": [record["seconds"] * 1000 for record in timer.stages],
+            "Rows": [record["rows"] for record in timer.stages],
+            "Rows/s": [record["rows_per_second"] for record in timer.stages],
+            "Memory Δ (MB)": [record["memory_delta_bytes"] / 1e6 for record in timer.stages],
+        }), use_container_width=True, hide_index=True)
+        st.caption(f"Total: {timer.total_seconds * 1000:.1f} ms")
+        if timer.profiler is not None:
+            st.code(timer.pstats_text(limit=15), language="text")
+            st.download_button(
+                label="📥 Download cProfile (.pstats)",
+                data=timer.pstats_dump,
+                file_name=f"{key}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pstats",
+                mime="application/octet-stream",
+                key=f"{key}_pstats"
+            )
 
-# Initialize converter
-converter = UnitConverter()
+def rejection_summary(error_counts, rows):
+    """Warning plus a table of rejected rows by reason (their Output Value is empty)"""
+    rejected = sum(error_counts.values())
+    if not rejected:
+        return
+    st.warning(f"⚠️ {rejected:,} of {rows:,} row(s) were rejected and left empty")
+    st.dataframe(pd.DataFrame({
+        "Reason": list(error_counts),
+        "Rows": list(error_counts.values()),
+    }), use_container_width=True, hide_index=True)
 
 # Header
 col1, col2 = st.columns([3, 1])
@@ -594,15 +424,7 @@ with col2:
     st.metric("Total Conversions", st.session_state.conversion_count)
 
 # Categories
-categories = [
-    "Length", "Area", "Volume", "Mass", "Density", "Temperature", "Pressure", 
-    "Force", "Energy", "Power", "Dynamic Viscosity", "Kinematic Viscosity", 
-    "Liquid Flow Rate", "Gas Flow Rate", "Permeability", "Time", "Velocity", 
-    "Torque", "Gas-Oil Ratio (GOR)", "API Gravity ↔ Specific Gravity", 
-    "Salinity / Concentration", "Heat Capacity", "Thermal Conductivity", 
-    "Angle", "Electrical Resistivity", "Mud Weight", "Rate of Penetration (ROP)",
-    "Productivity Index"
-]
+categories = CATEGORIES
 
 # Sidebar
 with st.sidebar:
@@ -649,81 +471,58 @@ with st.sidebar:
     
     st.markdown("---")
     
-    # Handle swap units if requested
-    swap_from = None
-    swap_to = None
-    if st.session_state.get('swap_units'):
-        swap_from = st.session_state.get('to_unit')
-        swap_to = st.session_state.get('from_unit')
-        st.session_state.swap_units = False
-    
-    # Unit selection
-    units = converter.get_units(category)
-    
-    if category == "Temperature":
-        temp_units = ["Celsius (°C)", "Fahrenheit (°F)", "Kelvin (K)", "Rankine (°R)"]
-        default_from = temp_units.index(swap_from) if swap_from and swap_from in temp_units else 0
-        default_to = temp_units.index(swap_to) if swap_to and swap_to in temp_units else 1
-        from_unit = st.selectbox("🔵 From Unit", temp_units, index=default_from, key="from_unit")
-        to_unit = st.selectbox("🔴 To Unit", temp_units, index=default_to, key="to_unit")
-    elif category == "API Gravity ↔ Specific Gravity":
-        grav_units = ["API Gravity (°API)", "Specific Gravity (SG at 60°F)"]
-        default_from = grav_units.index(swap_from) if swap_from and swap_from in grav_units else 0
-        default_to = grav_units.index(swap_to) if swap_to and swap_to in grav_units else 1
-        from_unit = st.selectbox("🔵 From Unit", grav_units, index=default_from, key="from_unit")
-        to_unit = st.selectbox("🔴 To Unit", grav_units, index=default_to, key="to_unit")
-    else:
-        unit_list = list(units.keys())
-        default_from = unit_list.index(swap_from) if swap_from and swap_from in unit_list else 0
-        default_to = unit_list.index(swap_to) if swap_to and swap_to in unit_list else (1 if len(unit_list) > 1 else 0)
-        from_unit = st.selectbox("🔵 From Unit", unit_list, index=default_from, key="from_unit")
-        to_unit = st.selectbox("🔴 To Unit", unit_list, index=default_to, key="to_unit")
+    # Unit selection; keep the current (or swapped) units while they exist in this category
+    unit_list = converter.get_unit_names(category)
+    if st.session_state.get('from_unit') not in unit_list:
+        st.session_state.from_unit = unit_list[0]
+    if st.session_state.get('to_unit') not in unit_list:
+        st.session_state.to_unit = unit_list[1 if len(unit_list) > 1 else 0]
+    from_unit = st.selectbox("🔵 From Unit", unit_list, key="from_unit")
+    to_unit = st.selectbox("🔴 To Unit", unit_list, key="to_unit")
     
     # Value input with scientific notation support
     st.markdown("---")
     
-    # Check if there's a multiplier value or reuse value to use
+    # A reused history entry seeds the value before the widget is drawn
     if reuse_value is not None:
-        default_value = reuse_value
-    else:
-        default_value = st.session_state.get('multiplier_value', 0.0)
-        if 'multiplier_value' in st.session_state:
-            del st.session_state.multiplier_value
-    
-    value = st.number_input(
-        "💯 Value",
-        value=default_value,
-        format="%.6f",
-        key="value_input",
-        help="Enter the value you want to convert"
-    )
+        st.session_state.value_input = reuse_value
     
-    # Quick multipliers
-    st.markdown("**Quick Multipliers:**")
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        if st.button("×10"):
-            st.session_state.multiplier_value = value * 10
-            st.rerun()
-    with col2:
-        if st.button("×100"):
-            st.session_state.multiplier_value = value * 100
-            st.rerun()
-    with col3:
-        if st.button("÷10"):
-            st.session_state.multiplier_value = value / 10
-            st.rerun()
+    def scale_value(factor):
+        st.session_state.value_input = st.session_state.value_input * factor
+    
+    # Value and multipliers rerun on their own; the rest of the page reads the value on Convert
+    @timed_fragment
+    def value_controls():
+        st.number_input(
+            "💯 Value",
+            format="%.6f",
+            key="value_input",
+            help="Enter the value you want to convert"
+        )
+        
+        # Quick multipliers
+        st.markdown("**Quick Multipliers:**")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.button("×10", on_click=scale_value, args=(10,))
+        with col2:
+            st.button("×100", on_click=scale_value, args=(100,))
+        with col3:
+            st.button("÷10", on_click=scale_value, args=(0.1,))
+    
+    value_controls()
+    value = st.session_state.value_input
     
     st.markdown("---")
     
     # Conversion button
     convert_button = st.button("🔄 Convert", use_container_width=True, type="primary")
     
-    # Swap units button
-    if st.button("⇅ Swap Units", use_container_width=True):
-        # Store swap instruction
-        st.session_state.swap_units = True
-        st.rerun()
+    # Swap units button; the callback swaps the selections before the rerun, so no extra st.rerun() is needed
+    def swap_units():
+        st.session_state.from_unit, st.session_state.to_unit = st.session_state.to_unit, st.session_state.from_unit
+    
+    st.button("⇅ Swap Units", use_container_width=True, on_click=swap_units)
     
     # PVT Correction for GOR
     pvt_correction = 1.0
@@ -732,22 +531,25 @@ with st.sidebar:
         with st.expander("⚗️ PVT Adjustments"):
             pressure_psia = st.number_input("Reservoir Pressure (psia)", value=14.7, min_value=0.0)
             temp_f = st.number_input("Reservoir Temperature (°F)", value=60.0)
-            pvt_correction = (pressure_psia / 14.7) * ((temp_f + 460) / 520)
+            pvt_correction = pvt_correction_factor(pressure_psia, temp_f)
             st.info(f"PVT Correction Factor: **{pvt_correction:.4f}**")
 
 # Main content area
 tab1, tab2, tab3, tab4 = st.tabs(["🔄 Converter", "📊 Batch Convert", "📜 History", "🧮 Calculators"])
 
-with tab1:
-    # Conversion result
-    if convert_button or st.session_state.get("auto_convert"):
-        try:
+@timed_fragment
+def converter_result(category, from_unit, to_unit, value, pvt_correction):
+    """Result card, formula details and history entry for one conversion"""
+    timer = start_stage_timer("converter_performance")
+    try:
+        with timer.stage("convert", rows=1):
             if value == 0:
                 st.info("💡 Zero value converts to zero in any unit system.")
                 result = 0
             else:
                 result = converter.convert(category, from_unit, to_unit, value, pvt_correction)
-            
+        
+        with timer.stage("render"):
             # Display result in beautiful card
             st.markdown(f"""
                 <div class='result-card'>
@@ -775,7 +577,8 @@ with tab1:
                 st.info(f"**Scientific Notation:** {result:.4e}")
             with col2:
                 st.info(f"**Precision:** {len(str(result).split('.')[-1])} decimal places")
-            
+        
+        with timer.stage("history"):
             # Add to history
             history_entry = {
                 "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
@@ -786,39 +589,58 @@ with tab1:
                 "to_unit": to_unit,
                 "pvt_correction": pvt_correction
             }
-            st.session_state.conversion_history.insert(0, history_entry)
-            if len(st.session_state.conversion_history) > 50:
-                st.session_state.conversion_history.pop()
+            st.session_state.conversion_history.add(history_entry)
             st.session_state.conversion_count += 1
-            
-        except ValueError as e:
-            st.error(f"❌ Conversion error: {str(e)}")
-        except Exception as e:
-            st.error(f"❌ Unexpected error: {str(e)}")
+        
+    except ValueError as e:
+        st.error(f"❌ Conversion error: {str(e)}")
+    except Exception as e:
+        st.error(f"❌ Unexpected error: {str(e)}")
+    finally:
+        timer.stop_profile()
+        st.session_state.converter_performance = timer
+
+@timed_fragment
+def compound_expression(value):
+    """Convert between free-form compound unit expressions"""
+    st.markdown("Convert units not listed in the tables, e.g. `Mscf/d/psi` → `sm3/d/kPa` or `lbm/ft²/s` → `kg/(m2·s)`")
+    expr_col1, expr_col2 = st.columns(2)
+    with expr_col1:
+        from_expression = st.text_input("From expression", value="bbl/d/psi")
+    with expr_col2:
+        to_expression = st.text_input("To expression", value="m³/d/bar")
+    try:
+        factor = expression_factor(from_expression, to_expression)
+        st.success(f"**{value:,.6g} {from_expression} = {value * factor:,.8g} {to_expression}**")
+        st.caption(f"Dimensions: {format_dimensions(parse_unit(from_expression).dimensions)} · Factor: {factor:.8g}")
+    except ValueError as e:
+        st.error(f"❌ {str(e)}")
+
+with tab1:
+    # Conversion result
+    if convert_button or st.session_state.get("auto_convert"):
+        converter_result(category, from_unit, to_unit, value, pvt_correction)
+    performance_panel("converter_performance", st.session_state.get("converter_performance"))
     
     # Quick reference table
     if category not in ["Temperature", "API Gravity ↔ Specific Gravity"]:
         with st.expander(f"📋 Quick Reference Table - {category}"):
             try:
-                test_value = 1.0
-                results = []
-                units_dict = converter.get_units(category)
-                
-                for unit in list(units_dict.keys())[:10]:  # Limit to first 10 units
-                    try:
-                        converted = converter.convert(category, from_unit, unit, test_value, pvt_correction)
-                        results.append({
-                            "Unit": unit,
-                            f"Value (from 1 {from_unit})": f"{converted:.6g}"
-                        })
-                    except:
-                        pass
+                index = converter.unit_index[category]
+                row = converter.factor_matrices[category][index[from_unit]] * pvt_correction
+                row[index[from_unit]] = 1.0  # Same unit is never PVT-corrected
                 
-                if results:
-                    df = pd.DataFrame(results)
-                    st.dataframe(df, use_container_width=True, hide_index=True)
-            except:
+                df = pd.DataFrame({
+                    "Unit": list(index),
+                    f"Value (from 1 {from_unit})": [f"{converted:.6g}" for converted in row]
+                })
+                st.dataframe(df, use_container_width=True, hide_index=True)
+            except KeyError:
                 st.warning("Reference table not available for this category")
+    
+    # Compound unit expressions built from base dimensions
+    with st.expander("🧪 Compound Unit Expression"):
+        compound_expression(value)
 
 with tab2:
     st.subheader("📊 Batch Unit Conversion")
@@ -826,10 +648,11 @@ with tab2:
     
     # File upload
     uploaded_file = st.file_uploader(
-        "Upload CSV file with values to convert",
-        type=['csv'],
-        help="CSV should have a column named 'value' with numbers to convert"
+        "Upload a CSV, Parquet or Feather file with values to convert",
+        type=['csv', 'parquet', 'feather', 'arrow'],
+        help="The file should have a column named 'value' with numbers to convert"
     )
+    input_format = detect_format(uploaded_file.name) if uploaded_file else "csv"
     
     col1, col2 = st.columns(2)
     with col1:
@@ -838,89 +661,665 @@ with tab2:
             height=150,
             placeholder="10\n20\n30\n40\n50"
         )
+    with col2:
+        streaming_mode = st.checkbox(
+            "🌊 Streaming mode",
+            help="Convert the uploaded file in chunks and write results incrementally (for very large files)"
+        )
+        chunk_rows = st.number_input(
+            "Rows per chunk",
+            value=100_000,
+            min_value=1_000,
+            step=10_000,
+            disabled=not streaming_mode
+        )
+        if streaming_mode and input_format != "csv":
+            st.caption("Streaming applies to CSV; columnar files are read column by column instead")
+        export_format = st.selectbox("Output format", list(EXPORT_FORMATS))
+        export_compression = st.selectbox(
+            "Compression",
+            COMPRESSION_OPTIONS.get(EXPORT_FORMATS[export_format][0], compression_options())
+        )
+    stream_csv = bool(uploaded_file) and streaming_mode and input_format == "csv"
+    
+    # GOR samples can carry their own reservoir conditions
+    pvt_columns = None
+    if uploaded_file:
+        if st.checkbox("🌡️ Per-row PVT correction", help="Correct GOR values with pressure (psia) and temperature (°F) columns of the file instead of the sidebar conditions"):
+            pvt_col1, pvt_col2 = st.columns(2)
+            with pvt_col1:
+                pressure_column = st.text_input("Pressure column (psia)", value="pressure")
+            with pvt_col2:
+                temperature_column = st.text_input("Temperature column (°F)", value="temperature")
+            pvt_columns = (pressure_column, temperature_column)
+    batch_correction = pvt_correction
+    value_pvt_columns = pvt_columns if category == "Gas-Oil Ratio (GOR)" else None
     
     if st.button("🔄 Convert Batch", type="primary"):
-        values_to_convert = []
-        
-        # Get values from file or text area
-        if uploaded_file:
-            df = pd.read_csv(uploaded_file)
-            if 'value' in df.columns:
-                values_to_convert = df['value'].tolist()
-        elif batch_values:
-            values_to_convert = [float(v.strip()) for v in batch_values.split('\n') if v.strip()]
-        
-        if values_to_convert:
-            results = []
-            for val in values_to_convert:
+        values_to_convert = np.empty(0)
+        timer = start_stage_timer("batch_performance")
+        try:
+            # Get values from file or text area
+            if stream_csv:
+                # Drop the output of the previous streaming run
+                previous_output = st.session_state.pop("stream_output_path", None)
+                if previous_output and os.path.exists(previous_output):
+                    os.remove(previous_output)
+            
+                progress = st.progress(0.0, text="Starting conversion...")
+            
+                def report_progress(rows):
+                    done = min(uploaded_file.tell() / max(uploaded_file.size, 1), 1.0)
+                    progress.progress(done, text=f"Converted {rows:,} rows")
+            
                 try:
-                    converted = converter.convert(category, from_unit, to_unit, val, pvt_correction)
-                    results.append({
-                        "Input Value": val,
-                        "Input Unit": from_unit,
-                        "Output Value": converted,
-                        "Output Unit": to_unit
-                    })
+                    with timer.stage("stream_convert_csv") as stage, \
+                            tempfile.NamedTemporaryFile("w", suffix=".csv", newline="", delete=False,
+                                                        dir=session_temp_dir()) as output:
+                        st.session_state.stream_output_path = output.name
+                        error_counts = {}
+                        rows, rejected = stream_convert_csv(
+                            converter, uploaded_file, output, category, from_unit, to_unit,
+                            pvt_correction, chunksize=int(chunk_rows), on_progress=report_progress,
+                            pvt_columns=value_pvt_columns, error_counts=error_counts
+                        )
+                        stage["rows"] = rows
+                    progress.progress(1.0, text=f"Converted {rows:,} rows")
+                    rejection_summary(error_counts, rows)
+                
+                    # Preview only the head of the output; the full result stays on disk
+                    with timer.stage("preview", rows=min(rows, 1000)):
+                        st.dataframe(
+                            pd.read_csv(st.session_state.stream_output_path, nrows=1000),
+                            use_container_width=True,
+                            hide_index=True
+                        )
+                    # Re-encoded from disk in the chosen format only when the download is clicked
+                    data, extension, mime = export_csv_file(
+                        st.session_state.stream_output_path, export_format, export_compression
+                    )
+                    st.download_button(
+                        label=f"📥 Download Results as {export_format}",
+                        data=data,
+                        file_name=f"batch_conversion_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}",
+                        mime=mime
+                    )
+                except ValueError as e:
+                    st.error(f"❌ Streaming conversion failed: {str(e)}")
+            elif uploaded_file and input_format != "csv":
+                # Read only the 'value' column straight from the columnar buffers
+                try:
+                    with timer.stage("read_table") as stage:
+                        table = read_table(uploaded_file, input_format, columns=['value', *(value_pvt_columns or ())])
+                        values_to_convert = np.asarray(table.column('value').to_numpy(), dtype=np.float64)
+                        stage["rows"] = values_to_convert.size
+                    if value_pvt_columns:
+                        batch_correction = row_pvt_correction(
+                            table.column(value_pvt_columns[0]).to_numpy(), table.column(value_pvt_columns[1]).to_numpy()
+                        )
                 except Exception as e:
-                    results.append({
-                        "Input Value": val,
+                    st.error(f"❌ Could not read 'value' column: {str(e)}")
+            elif uploaded_file:
+                with timer.stage("read_csv") as stage:
+                    df = pd.read_csv(uploaded_file)
+                    stage["rows"] = len(df)
+                if value_pvt_columns and not set(value_pvt_columns) <= set(df.columns):
+                    st.error(f"❌ PVT columns not found: {', '.join(set(value_pvt_columns) - set(df.columns))}")
+                elif 'value' in df.columns:
+                    values_to_convert = pd.to_numeric(df['value'], errors='coerce').to_numpy(dtype=np.float64)
+                    if value_pvt_columns:
+                        batch_correction = row_pvt_correction(df[value_pvt_columns[0]], df[value_pvt_columns[1]])
+            elif batch_values:
+                with timer.stage("parse_text") as stage:
+                    # Unparseable lines become NaN and are reported as "not a number"
+                    values_to_convert = pd.to_numeric(
+                        pd.Series([v.strip() for v in batch_values.split('\n') if v.strip()], dtype=object),
+                        errors='coerce'
+                    ).to_numpy(dtype=np.float64)
+                    stage["rows"] = values_to_convert.size
+        
+            if values_to_convert.size:
+                rows = values_to_convert.size
+                with timer.stage("convert", rows):
+                    converted = converter.convert_array(category, from_unit, to_unit, values_to_convert, batch_correction)
+                    error_codes = converter.error_codes(category, from_unit, to_unit, values_to_convert, batch_correction)
+                rejection_summary(error_summary(error_codes), rows)
+            
+                # Display results
+                with timer.stage("build_frame", rows):
+                    df_results = pd.DataFrame({
+                        "Input Value": values_to_convert,
                         "Input Unit": from_unit,
-                        "Output Value": "Error",
-                        "Output Unit": str(e)
+                        "Output Value": converted,
+                        "Output Unit": to_unit,
+                        "Error Code": error_codes
                     })
+                    if value_pvt_columns:
+                        df_results["PVT Correction"] = batch_correction
+                with timer.stage("render", rows):
+                    st.dataframe(df_results, use_container_width=True, hide_index=True)
             
-            # Display results
-            df_results = pd.DataFrame(results)
-            st.dataframe(df_results, use_container_width=True, hide_index=True)
+                # Download button (serialized on click)
+                data, extension, mime = export_dataframe(df_results, export_format, export_compression)
+                st.download_button(
+                    label=f"📥 Download Results as {export_format}",
+                    data=data,
+                    file_name=f"batch_conversion_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}",
+                    mime=mime
+                )
+            elif not stream_csv:
+                st.warning("⚠️ Please provide values to convert")
+        except Exception as e:
+            st.error(f"❌ Unexpected error: {str(e)}")
+        finally:
+            timer.stop_profile()
+            st.session_state.batch_performance = timer
+    
+    performance_panel("batch_performance", st.session_state.get("batch_performance"))
+    
+    # Multi-column conversion with a unit spec per column
+    with st.expander("🧩 Multi-column Conversion"):
+        st.markdown("Convert several columns of the uploaded CSV at once, each with its own units")
+        if uploaded_file:
+            uploaded_file.seek(0)
+            if input_format == "csv":
+                # Column names and dtypes from the first rows only; the selected columns are read on click
+                df_sample = pd.read_csv(uploaded_file, nrows=1000)
+                convertible_columns = list(df_sample.select_dtypes("number").columns)
+                available_columns = list(df_sample.columns)
+                st.caption("Only the selected columns are read when converting")
+            else:
+                # Columnar files: list columns from the schema and read only the selected ones later
+                schema = read_schema(uploaded_file, input_format)
+                convertible_columns = numeric_columns(schema)
+                available_columns = schema.names
+                uploaded_file.seek(0)
+                st.caption("Only the selected columns are read from columnar files")
+            selected_columns = st.multiselect("Columns to convert", convertible_columns)
             
-            # Download button
-            csv = df_results.to_csv(index=False)
-            st.download_button(
-                label="📥 Download Results as CSV",
-                data=csv,
-                file_name=f"batch_conversion_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                mime="text/csv"
-            )
+            column_specs = {}
+            for column in selected_columns:
+                spec_col1, spec_col2, spec_col3 = st.columns(3)
+                with spec_col1:
+                    column_category = st.selectbox(f"{column}: Category", categories, key=f"mc_cat_{column}")
+                column_units = converter.get_unit_names(column_category)
+                with spec_col2:
+                    column_from = st.selectbox(f"{column}: From", column_units, key=f"mc_from_{column}")
+                with spec_col3:
+                    column_to = st.selectbox(
+                        f"{column}: To", column_units,
+                        index=1 if len(column_units) > 1 else 0,
+                        key=f"mc_to_{column}"
+                    )
+                column_specs[column] = (column_category, column_from, column_to)
+            
+            missing_pvt = [column for column in pvt_columns or () if column not in available_columns]
+            if missing_pvt:
+                st.error(f"❌ PVT columns not found: {', '.join(missing_pvt)}")
+            elif selected_columns and st.button("🔄 Convert Columns", type="primary"):
+                read_columns = list(dict.fromkeys([*selected_columns, *(pvt_columns or ())]))
+                uploaded_file.seek(0)
+                if input_format == "csv":
+                    df_converted, column_times = convert_dataframe(
+                        converter, pd.read_csv(uploaded_file, usecols=read_columns), column_specs,
+                        pvt_correction, pvt_columns
+                    )
+                else:
+                    table, column_times = convert_table(
+                        converter,
+                        read_table(uploaded_file, input_format, columns=read_columns),
+                        column_specs, pvt_correction, pvt_columns
+                    )
+                    df_converted = table.to_pandas()
+                st.dataframe(df_converted, use_container_width=True, hide_index=True)
+                
+                st.markdown("**Conversion time per column:**")
+                st.dataframe(pd.DataFrame({
+                    "Column": list(column_times),
+                    "Conversion": [f"{spec[1]} → {spec[2]}" for spec in column_specs.values()],
+                    "Time (ms)": [seconds * 1000 for seconds in column_times.values()]
+                }), use_container_width=True, hide_index=True)
+                
+                data, extension, mime = export_dataframe(df_converted, export_format, export_compression)
+                st.download_button(
+                    label=f"📥 Download Converted Table as {export_format}",
+                    data=data,
+                    file_name=f"multi_column_conversion_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}",
+                    mime=mime
+                )
         else:
-            st.warning("⚠️ Please provide values to convert")
+            st.info("📤 Upload a file above to pick columns")
+
+# History download formats: label -> (ConversionHistory stream method, file extension, MIME type)
+HISTORY_EXPORTS = {
+    "JSON": ("iter_json", "json", "application/json"),
+    "NDJSON": ("iter_ndjson", "ndjson", "application/x-ndjson"),
+    "CSV": ("iter_csv", "csv", "text/csv"),
+}
 
 with tab3:
     st.subheader("📜 Conversion History")
     
-    if st.session_state.conversion_history:
-        col1, col2 = st.columns([3, 1])
+    history = st.session_state.conversion_history
+    if 'history_page' not in st.session_state:
+        st.session_state.history_page = 0
+    
+    def reset_history_page():
+        st.session_state.history_page = 0
+    
+    def change_history_page(step):
+        st.session_state.history_page = max(st.session_state.history_page + step, 0)
+    
+    if history.search(limit=1):
+        # Filters
+        col1, col2, col3, col4 = st.columns([3, 3, 1, 1])
+        with col1:
+            search_text = st.text_input("Unit or category contains", on_change=reset_history_page)
         with col2:
-            if st.button("🗑️ Clear History"):
-                st.session_state.conversion_history = []
-                st.rerun()
-        
-        # Display history
-        for i, entry in enumerate(st.session_state.conversion_history[:20]):  # Show last 20
-            with st.container():
-                col1, col2, col3 = st.columns([2, 3, 1])
-                with col1:
-                    st.markdown(f"**{entry['timestamp']}**")
-                    st.caption(entry['category'])
-                with col2:
-                    st.markdown(f"`{entry['from_value']:.4g}` {entry['from_unit']} → `{entry['to_value']:.4g}` {entry['to_unit']}")
-                with col3:
-                    if st.button("↺", key=f"reuse_{i}", help="Reuse this conversion"):
-                        st.session_state.reuse_conversion = entry
+            search_category = st.selectbox(
+                "Category", ["All"] + categories, key="history_category", on_change=reset_history_page
+            )
+        with col3:
+            page_size = st.selectbox("Rows", [10, 20, 50, 100], index=1, on_change=reset_history_page)
+        with col4:
+            if history.db_path is None:
+                if st.button("🗑️ Clear History"):
+                    history.clear()
+                    reset_history_page()
+                    st.rerun()
+            else:
+                # The SQLite store is shared by every session: deleting it needs an explicit confirm
+                with st.popover("🗑️ Clear History"):
+                    st.warning("This deletes the stored history of **all** sessions.")
+                    confirm_clear = st.checkbox("I understand", key="confirm_clear_history")
+                    if st.button("Delete stored history", type="primary", disabled=not confirm_clear):
+                        history.clear(persistent=True)
+                        reset_history_page()
                         st.rerun()
-                st.markdown("---")
+        history_filters = {
+            "text": search_text or None,
+            "category": None if search_category == "All" else search_category
+        }
+        
+        # Fetch one page (plus one row to know whether another page follows)
+        page = st.session_state.history_page
+        page_entries = history.search(limit=page_size + 1, offset=page * page_size, **history_filters)
+        has_next = len(page_entries) > page_size
+        page_entries = page_entries[:page_size]
+        
+        if page_entries:
+            page_table = pd.DataFrame({
+                "Time": [entry['timestamp'] for entry in page_entries],
+                "Category": [entry['category'] for entry in page_entries],
+                "From": [entry['from_value'] for entry in page_entries],
+                "From Unit": [entry['from_unit'] for entry in page_entries],
+                "To": [entry['to_value'] for entry in page_entries],
+                "To Unit": [entry['to_unit'] for entry in page_entries]
+            })
+            selection = st.dataframe(
+                page_table,
+                use_container_width=True,
+                hide_index=True,
+                on_select="rerun",
+                selection_mode="single-row",
+                key=f"history_table_{page}"
+            )
+            selected_rows = selection.selection.rows
+        else:
+            st.info("No conversions match the current filters")
+            selected_rows = []
+        
+        # Pager and reuse
+        col1, col2, col3, col4 = st.columns([1, 1, 1, 3])
+        with col1:
+            st.button("◀ Previous", disabled=page == 0, on_click=change_history_page, args=(-1,))
+        with col2:
+            st.markdown(f"Page **{page + 1}**")
+        with col3:
+            st.button("Next ▶", disabled=not has_next, on_click=change_history_page, args=(1,))
+        with col4:
+            if st.button("↺ Reuse selected", disabled=not selected_rows, help="Reuse the selected conversion"):
+                st.session_state.reuse_conversion = page_entries[selected_rows[0]]
+                st.rerun()
         
-        # Export history
-        if st.button("📥 Export History as JSON"):
-            json_str = json.dumps(st.session_state.conversion_history, indent=2)
+        # Export history (matching the filters)
+        export_col1, export_col2, export_col3 = st.columns([2, 1, 2])
+        with export_col1:
+            history_format = st.radio("Format", list(HISTORY_EXPORTS), horizontal=True, key="history_format")
+        with export_col2:
+            history_compression = st.selectbox("Compression", compression_options(), key="history_compression")
+        with export_col3:
+            # Streamed from the history store only when the download is clicked
+            iter_name, extension, mime = HISTORY_EXPORTS[history_format]
+            extension, mime = artifact_type(extension, mime, history_compression)
+            export_filters = dict(history_filters)
             st.download_button(
-                label="Download History",
-                data=json_str,
-                file_name=f"conversion_history_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-                mime="application/json"
+                label="📥 Export History",
+                data=lambda: render_artifact(getattr(history, iter_name)(**export_filters), history_compression),
+                file_name=f"conversion_history_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}",
+                mime=mime
             )
     else:
         st.info("📭 No conversion history yet. Start converting to build your history!")
 
+# Calculators: each one reruns on its own when its inputs change
+@timed_fragment
+def hydrostatic_calculator():
+    st.markdown("**Formula:** `P = 0.052 × TVD × MW`")
+    tvd = st.number_input("True Vertical Depth (ft)", value=10000.0, min_value=0.0, key="tvd_hp")
+    mud_weight = st.number_input("Mud Weight (ppg)", value=9.0, min_value=0.0, key="mw_hp")
+    
+    hydro_pressure = hydrostatic_pressure(tvd, mud_weight)
+    
+    st.success(f"**Hydrostatic Pressure:** {hydro_pressure:,.2f} psi")
+    st.info(f"**In bar:** {hydro_pressure * PSI_TO_BAR:,.2f} bar")
+    st.info(f"**In MPa:** {hydro_pressure * PSI_TO_MPA:,.3f} MPa")
+
+def read_uploaded_table(uploaded):
+    """Load an uploaded CSV/Parquet/Feather table with lower-cased column names"""
+    table_format = detect_format(uploaded.name)
+    if table_format == "csv":
+        df = pd.read_csv(uploaded)
+    else:
+        df = read_table(uploaded, table_format).to_pandas()
+    df.columns = [str(column).strip().lower() for column in df.columns]
+    return df
+
+@timed_fragment
+def hydrostatic_profile_calculator():
+    st.markdown("**Formula:** `P(i) = P(i-1) + 0.052 × (TVD(i) - TVD(i-1)) × MW(i)`")
+    st.caption("Columns: `tvd` (ft), `mud_weight` (ppg) of the interval ending at that depth, optional `well`")
+    
+    profile_file = st.file_uploader(
+        "Upload stations (CSV, Parquet, Feather)",
+        type=['csv', 'parquet', 'feather', 'arrow'],
+        key="profile_upload"
+    )
+    
+    if profile_file:
+        stations = read_uploaded_table(profile_file)
+    else:
+        stations = st.data_editor(
+            pd.DataFrame({"tvd": [2000.0, 5000.0, 8000.0, 10000.0], "mud_weight": [9.0, 10.5, 12.0, 13.5]}),
+            num_rows="dynamic",
+            key="profile_editor"
+        )
+    
+    missing = {"tvd", "mud_weight"} - set(stations.columns)
+    if missing:
+        st.error(f"❌ Missing column(s): {', '.join(sorted(missing))}")
+        return
+    
+    stations = stations.dropna(subset=["tvd", "mud_weight"])
+    wells = "well" in stations.columns
+    stations = stations.sort_values(["well", "tvd"] if wells else "tvd", kind="stable").reset_index(drop=True)
+    
+    try:
+        pressures = hydrostatic_profile(
+            stations["tvd"].to_numpy(),
+            stations["mud_weight"].to_numpy(),
+            stations["well"].to_numpy() if wells else None
+        )
+    except ValueError as e:
+        st.error(f"❌ {str(e)}")
+        return
+    
+    profile = pd.DataFrame({
+        "TVD (ft)": stations["tvd"],
+        "Mud Weight (ppg)": stations["mud_weight"],
+        "Pressure (psi)": pressures["psi"],
+        "Pressure (bar)": pressures["bar"],
+        "Pressure (MPa)": pressures["MPa"],
+    })
+    if wells:
+        profile.insert(0, "Well", stations["well"].astype(str))
+    
+    if len(profile):
+        st.success(f"**Bottom-hole Pressure:** {profile['Pressure (psi)'].iloc[-1]:,.2f} psi")
+        st.line_chart(profile, x="TVD (ft)", y="Pressure (psi)", color="Well" if wells else None)
+    st.dataframe(profile.head(1000), use_container_width=True, hide_index=True)
+    
+    profile_export = st.selectbox("Download format", ["CSV", "Parquet"], key="profile_export")
+    data, extension, mime = export_dataframe(profile, profile_export)
+    st.download_button(
+        label="📥 Download Profile",
+        data=data,
+        file_name=f"hydrostatic_profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}",
+        mime=mime,
+        key="profile_download"
+    )
+
+@timed_fragment
+def pipe_calculator():
+    st.markdown("**Pipe Capacity Formula:** `V = L × ID² / 1029.4` (bbl)")
+    st.markdown("**Pipe Displacement Formula:** `V = L × OD² / 1029.4` (bbl)")
+    
+    calc_type = st.radio("Calculate:", ["Capacity", "Displacement"], horizontal=True)
+    
+    length_ft = st.number_input("Pipe Length (ft)", value=10000.0, min_value=0.0, key="length_pipe")
+    
+    if calc_type == "Capacity":
+        id_in = st.number_input("Inner Diameter (in)", value=4.276, min_value=0.0, key="id_pipe")
+        volume_bbl = pipe_volume(length_ft, id_in)
+        st.success(f"**Pipe Capacity:** {volume_bbl:,.3f} bbl")
+    else:
+        od_in = st.number_input("Outer Diameter (in)", value=5.0, min_value=0.0, key="od_pipe")
+        volume_bbl = pipe_volume(length_ft, od_in)
+        st.success(f"**Pipe Displacement:** {volume_bbl:,.3f} bbl")
+    
+    st.info(f"**In cubic meters:** {volume_bbl * BBL_TO_M3:,.3f} m³")
+    st.info(f"**In gallons:** {volume_bbl * BBL_TO_GAL:,.1f} gal")
+
+@timed_fragment
+def string_tally_calculator():
+    st.markdown("**Capacity:** `L × ID² / 1029.4` · **Steel:** `L × (OD² - ID²) / 1029.4` · **Annulus:** `L × (Hole² - OD²) / 1029.4`")
+    st.caption("Columns top to bottom: `length` (ft), `od`, `id`, `hole` (in, open hole or casing ID), optional `section` and `string`")
+    
+    tally_file = st.file_uploader(
+        "Upload string tallies (CSV, Parquet, Feather)",
+        type=['csv', 'parquet', 'feather', 'arrow'],
+        key="tally_upload"
+    )
+    
+    if tally_file:
+        sections = read_uploaded_table(tally_file)
+    else:
+        sections = st.data_editor(
+            pd.DataFrame({
+                "section": ["Drill Pipe", "HWDP", "Drill Collars"],
+                "length": [9000.0, 600.0, 400.0],
+                "od": [5.0, 5.0, 6.5],
+                "id": [4.276, 3.0, 2.813],
+                "hole": [8.535, 8.5, 8.5],
+            }),
+            num_rows="dynamic",
+            key="tally_editor"
+        )
+    
+    missing = {"length", "od", "id", "hole"} - set(sections.columns)
+    if missing:
+        st.error(f"❌ Missing column(s): {', '.join(sorted(missing))}")
+        return
+    
+    sections = sections.dropna(subset=["length", "od", "id", "hole"])
+    strings = "string" in sections.columns
+    if strings:
+        # Group each string's sections together, keeping strings in first-seen order and sections top to bottom
+        order = np.argsort(pd.factorize(sections["string"])[0], kind="stable")
+        sections = sections.iloc[order]
+    sections = sections.reset_index(drop=True)
+    pump_output = st.number_input("Pump Output (bbl/stk)", value=0.1, min_value=0.001, format="%.4f", key="tally_pump")
+    
+    try:
+        volumes = string_tally(
+            sections["length"].to_numpy(),
+            sections["od"].to_numpy(),
+            sections["id"].to_numpy(),
+            sections["hole"].to_numpy(),
+            sections["string"].to_numpy() if strings else None
+        )
+    except ValueError as e:
+        st.error(f"❌ {str(e)}")
+        return
+    
+    tally = pd.DataFrame({
+        "Section": sections["section"].astype(str) if "section" in sections.columns else sections.index + 1,
+        "Length (ft)": sections["length"],
+        "Bottom Depth (ft)": volumes["depth"],
+        "Capacity (bbl)": volumes["capacity"],
+        "Steel Displacement (bbl)": volumes["displacement"],
+        "Annular Volume (bbl)": volumes["annular"],
+        "Cum. Capacity (bbl)": volumes["cumulative_capacity"],
+        "Cum. Annular (bbl)": volumes["cumulative_annular"],
+        "Strokes": volumes["cumulative_capacity"] / pump_output,
+    })
+    if strings:
+        tally.insert(0, "String", sections["string"].astype(str))
+    
+    # One summary row per string: its last section carries the running totals
+    last = tally.groupby("String", sort=False).tail(1) if strings else tally.tail(1)
+    summary = pd.DataFrame({
+        "String": last["String"] if strings else ["String"],
+        "Depth (ft)": last["Bottom Depth (ft)"].to_numpy(),
+        "String Volume (bbl)": last["Cum. Capacity (bbl)"].to_numpy(),
+        "Annular Volume (bbl)": last["Cum. Annular (bbl)"].to_numpy(),
+        "Strokes to Bit": last["Strokes"].to_numpy(),
+        "Bottoms-up Strokes": last["Cum. Annular (bbl)"].to_numpy() / pump_output,
+    })
+    
+    if len(summary) == 1 and len(tally):
+        st.success(f"**Strokes to Bit:** {summary['Strokes to Bit'].iloc[0]:,.0f} stk ({summary['String Volume (bbl)'].iloc[0]:,.1f} bbl)")
+        st.info(f"**Bottoms-up:** {summary['Bottoms-up Strokes'].iloc[0]:,.0f} stk ({summary['Annular Volume (bbl)'].iloc[0]:,.1f} bbl)")
+    else:
+        st.success(f"**{len(summary):,} strings tallied** ({len(tally):,} sections)")
+        st.dataframe(summary, use_container_width=True, hide_index=True)
+    if tally["Annular Volume (bbl)"].isna().any():
+        st.warning("⚠️ Some sections have a hole size not larger than the OD; their annular volume is left blank")
+    st.dataframe(tally.head(1000), use_container_width=True, hide_index=True)
+    
+    tally_export = st.selectbox("Download format", ["CSV", "Parquet"], key="tally_export")
+    data, extension, mime = export_dataframe(tally, tally_export)
+    st.download_button(
+        label="📥 Download Tally",
+        data=data,
+        file_name=f"string_tally_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}",
+        mime=mime,
+        key="tally_download"
+    )
+
+@timed_fragment
+def annular_velocity_calculator():
+    st.markdown("**Formula:** `V = Q / (2.448 × (D² - d²))`")
+    st.markdown("Where V = velocity (ft/min), Q = flow rate (gpm)")
+    
+    av_mode = st.radio("Mode:", ["Single Point", "Sweep Grid"], horizontal=True, key="av_mode")
+    
+    if av_mode == "Sweep Grid":
+        annular_velocity_sweep()
+        return
+    
+    flow_rate = st.number_input("Flow Rate (gpm)", value=500.0, min_value=0.0, key="flow_av")
+    hole_dia = st.number_input("Hole Diameter (in)", value=8.5, min_value=0.0, key="hole_av")
+    pipe_od = st.number_input("Pipe OD (in)", value=5.0, min_value=0.0, key="pipe_av")
+    
+    try:
+        ann_velocity = annular_velocity(flow_rate, hole_dia, pipe_od)
+        st.success(f"**Annular Velocity:** {ann_velocity:,.2f} ft/min")
+        st.info(f"**In ft/sec:** {ann_velocity/60:,.3f} ft/sec")
+        st.info(f"**In m/min:** {ann_velocity * FT_TO_M:,.2f} m/min")
+    except ValueError as e:
+        st.error(f"⚠️ {str(e)}")
+
+def sweep_range(label, low, high, steps, key):
+    """Min / max / steps inputs for one sweep axis; returns the grid values"""
+    col_min, col_max, col_steps = st.columns(3)
+    with col_min:
+        start = st.number_input(f"{label} min", value=low, min_value=0.0, key=f"{key}_min")
+    with col_max:
+        stop = st.number_input(f"{label} max", value=high, min_value=0.0, key=f"{key}_max")
+    with col_steps:
+        count = st.number_input("Steps", value=steps, min_value=2, max_value=1000, step=1, key=f"{key}_steps")
+    return np.linspace(start, stop, int(count))
+
+def annular_velocity_sweep():
+    flow_rates = sweep_range("Flow Rate (gpm)", 200.0, 1200.0, 100, "sweep_flow")
+    hole_dias = sweep_range("Hole Diameter (in)", 6.0, 17.5, 100, "sweep_hole")
+    pipe_ods = sweep_range("Pipe OD (in)", 3.5, 6.625, 100, "sweep_od")
+    
+    start = time.perf_counter()
+    try:
+        grid = annular_velocity_grid(flow_rates, hole_dias, pipe_ods)
+    except ValueError as e:
+        st.error(f"⚠️ {str(e)} — reduce the number of steps")
+        return
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    invalid = int(np.isnan(grid).sum())
+    st.caption(f"{grid.size:,} points in {elapsed_ms:.1f} ms · {invalid:,} cells masked (hole ≤ pipe OD)")
+    
+    if invalid == grid.size:
+        st.warning("⚠️ No hole diameter in the sweep is larger than the pipe OD")
+        return
+    
+    od_index = st.select_slider(
+        "Pipe OD slice (in)",
+        options=range(len(pipe_ods)),
+        format_func=lambda i: f"{pipe_ods[i]:.3f}",
+        key="sweep_od_slice"
+    )
+    velocity = grid[:, :, od_index]
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Min Velocity", f"{np.nanmin(grid):,.1f} ft/min")
+    with col2:
+        st.metric("Max Velocity", f"{np.nanmax(grid):,.1f} ft/min")
+    
+    # Thin the slice to at most 100 × 100 cells for the browser
+    flow_step = max(1, len(flow_rates) // 100)
+    hole_step = max(1, len(hole_dias) // 100)
+    flows, holes = np.meshgrid(flow_rates[::flow_step], hole_dias[::hole_step], indexing="ij")
+    cells = pd.DataFrame({
+        "Flow Rate (gpm)": flows.ravel(),
+        "Hole Diameter (in)": holes.ravel(),
+        "Velocity (ft/min)": velocity[::flow_step, ::hole_step].ravel(),
+    }).dropna()
+    heatmap = alt.Chart(cells).mark_rect().encode(
+        x=alt.X("Hole Diameter (in):Q", bin=alt.Bin(maxbins=min(len(holes[0]), 100))),
+        y=alt.Y("Flow Rate (gpm):Q", bin=alt.Bin(maxbins=min(len(flows), 100))),
+        color=alt.Color("Velocity (ft/min):Q", scale=alt.Scale(scheme="viridis", type="log")),
+        tooltip=["Flow Rate (gpm)", "Hole Diameter (in)", "Velocity (ft/min)"]
+    )
+    
+    # Iso-velocity contours are exact: Q = V × 2.448 × (D² - d²)
+    pipe_od = pipe_ods[od_index]
+    levels = np.unique(np.round(np.nanpercentile(velocity, [10, 25, 50, 75, 90]), -1))
+    valid_holes = hole_dias[hole_dias > pipe_od]
+    contours = pd.DataFrame([
+        {"Hole Diameter (in)": hole, "Flow Rate (gpm)": level * 2.448 * (hole**2 - pipe_od**2), "Contour": f"{level:,.0f} ft/min"}
+        for level in levels for hole in valid_holes
+    ])
+    if len(contours):
+        contours = contours[contours["Flow Rate (gpm)"].between(flow_rates.min(), flow_rates.max())]
+    chart = heatmap
+    if len(contours):
+        chart = heatmap + alt.Chart(contours).mark_line(color="white").encode(
+            x="Hole Diameter (in):Q", y="Flow Rate (gpm):Q", detail="Contour:N", tooltip=["Contour"]
+        )
+    st.altair_chart(chart, use_container_width=True)
+
+@timed_fragment
+def pump_pressure_calculator():
+    st.markdown("**Simplified Formula:** `ΔP = (Δρ × D × 0.052) + P_friction`")
+    
+    depth = st.number_input("Depth (ft)", value=10000.0, min_value=0.0, key="depth_pp")
+    mud_density = st.number_input("Mud Density (ppg)", value=10.0, min_value=0.0, key="mud_pp")
+    friction_loss = st.number_input("Estimated Friction Loss (psi)", value=500.0, min_value=0.0, key="friction_pp")
+    
+    total_pressure, hydrostatic = pump_pressure(depth, mud_density, friction_loss)
+    
+    st.success(f"**Total Pump Pressure:** {total_pressure:,.0f} psi")
+    st.info(f"**Hydrostatic Component:** {hydrostatic:,.0f} psi")
+    st.info(f"**Friction Component:** {friction_loss:,.0f} psi")
+
 with tab4:
     st.subheader("🧮 Petroleum Engineering Calculators")
     
@@ -928,66 +1327,23 @@ with tab4:
     
     with calc_col1:
         with st.expander("💧 Hydrostatic Pressure Calculator", expanded=True):
-            st.markdown("**Formula:** `P = 0.052 × TVD × MW`")
-            tvd = st.number_input("True Vertical Depth (ft)", value=10000.0, min_value=0.0, key="tvd_hp")
-            mud_weight = st.number_input("Mud Weight (ppg)", value=9.0, min_value=0.0, key="mw_hp")
-            
-            hydro_pressure = tvd * mud_weight * 0.052
-            
-            st.success(f"**Hydrostatic Pressure:** {hydro_pressure:,.2f} psi")
-            st.info(f"**In bar:** {hydro_pressure * 0.0689476:,.2f} bar")
-            st.info(f"**In MPa:** {hydro_pressure * 0.00689476:,.3f} MPa")
+            hydrostatic_calculator()
+        
+        with st.expander("📉 Hydrostatic Pressure Profile"):
+            hydrostatic_profile_calculator()
         
         with st.expander("🔄 Drill Pipe Capacity/Displacement"):
-            st.markdown("**Pipe Capacity Formula:** `V = L × ID² / 1029.4` (bbl)")
-            st.markdown("**Pipe Displacement Formula:** `V = L × OD² / 1029.4` (bbl)")
-            
-            calc_type = st.radio("Calculate:", ["Capacity", "Displacement"], horizontal=True)
-            
-            length_ft = st.number_input("Pipe Length (ft)", value=10000.0, min_value=0.0, key="length_pipe")
-            
-            if calc_type == "Capacity":
-                id_in = st.number_input("Inner Diameter (in)", value=4.276, min_value=0.0, key="id_pipe")
-                volume_bbl = length_ft * (id_in ** 2) / 1029.4
-                st.success(f"**Pipe Capacity:** {volume_bbl:,.3f} bbl")
-            else:
-                od_in = st.number_input("Outer Diameter (in)", value=5.0, min_value=0.0, key="od_pipe")
-                volume_bbl = length_ft * (od_in ** 2) / 1029.4
-                st.success(f"**Pipe Displacement:** {volume_bbl:,.3f} bbl")
-            
-            st.info(f"**In cubic meters:** {volume_bbl * 0.158987:,.3f} m³")
-            st.info(f"**In gallons:** {volume_bbl * 42:,.1f} gal")
+            pipe_calculator()
+        
+        with st.expander("🧱 Drill String Tally"):
+            string_tally_calculator()
     
     with calc_col2:
         with st.expander("📊 Annular Velocity Calculator", expanded=True):
-            st.markdown("**Formula:** `V = Q / (2.448 × (D² - d²))`")
-            st.markdown("Where V = velocity (ft/min), Q = flow rate (gpm)")
-            
-            flow_rate = st.number_input("Flow Rate (gpm)", value=500.0, min_value=0.0, key="flow_av")
-            hole_dia = st.number_input("Hole Diameter (in)", value=8.5, min_value=0.0, key="hole_av")
-            pipe_od = st.number_input("Pipe OD (in)", value=5.0, min_value=0.0, key="pipe_av")
-            
-            if hole_dia > pipe_od:
-                ann_velocity = flow_rate / (2.448 * (hole_dia**2 - pipe_od**2))
-                st.success(f"**Annular Velocity:** {ann_velocity:,.2f} ft/min")
-                st.info(f"**In ft/sec:** {ann_velocity/60:,.3f} ft/sec")
-                st.info(f"**In m/min:** {ann_velocity * 0.3048:,.2f} m/min")
-            else:
-                st.error("⚠️ Hole diameter must be larger than pipe OD")
+            annular_velocity_calculator()
         
         with st.expander("⚡ Pump Pressure Required"):
-            st.markdown("**Simplified Formula:** `ΔP = (Δρ × D × 0.052) + P_friction`")
-            
-            depth = st.number_input("Depth (ft)", value=10000.0, min_value=0.0, key="depth_pp")
-            mud_density = st.number_input("Mud Density (ppg)", value=10.0, min_value=0.0, key="mud_pp")
-            friction_loss = st.number_input("Estimated Friction Loss (psi)", value=500.0, min_value=0.0, key="friction_pp")
-            
-            hydrostatic = depth * mud_density * 0.052
-            total_pressure = hydrostatic + friction_loss
-            
-            st.success(f"**Total Pump Pressure:** {total_pressure:,.0f} psi")
-            st.info(f"**Hydrostatic Component:** {hydrostatic:,.0f} psi")
-            st.info(f"**Friction Component:** {friction_loss:,.0f} psi")
+            pump_pressure_calculator()
 
 # Footer with useful references
 st.markdown("---")
@@ -1058,3 +1414,26 @@ if st.session_state.favorites:
 # Auto-save preferences
 st.sidebar.markdown("---")
 st.sidebar.caption("💾 Your conversion history and favorites are saved for this session")
+
+# Rerun latency report: this full run, plus the last run of each fragment
+st.session_state.last_rerun_ms = (time.perf_counter() - script_start) * 1000
+with st.sidebar.expander("⏱️ Rerun Latency"):
+    st.caption(f"Full app rerun: {st.session_state.last_rerun_ms:.1f} ms")
+    for fragment_name, elapsed_ms in st.session_state.get('fragment_timings', {}).items():
+        st.caption(f"{fragment_name}: {elapsed_ms:.1f} ms")
+
+# Process-wide metrics; set UNIT_CONVERTER_METRICS_FILE to dump them for a Prometheus textfile collector
+if os.environ.get("UNIT_CONVERTER_METRICS_FILE"):
+    converter.metrics.write(os.environ["UNIT_CONVERTER_METRICS_FILE"])
+
+with st.sidebar.expander("📈 Metrics"):
+    st.caption("All sessions of this server process, in Prometheus text format")
+    # Rendered only on demand: on click for the download, when toggled for the preview
+    if st.toggle("Show metrics", key="show_metrics"):
+        st.code(converter.metrics.render(), language="text")
+    st.download_button(
+        label="📥 Download metrics",
+        data=converter.metrics.render,
+        file_name="unit_converter_metrics.prom",
+        mime="text/plain"
+    )
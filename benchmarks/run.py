@@ -0,0 +1,308 @@
+"""Benchmark suite for the conversion core, batch I/O and the Streamlit app
+
+Run from the repository root::
+
+    python benchmarks/run.py                       # everything, batches up to 10^7 rows
+    python benchmarks/run.py --max-rows 100000     # quicker batch sweep
+    python benchmarks/run.py --skip-app --output new.json --compare old.json
+
+Results are written as JSON (default: bench_output.json) so runs on two
+commits can be compared with --compare. Stage memory is the tracemalloc
+peak of a separate, untimed pass, so tracing does not skew the timings.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from unit_converter import UnitConverter, CATEGORIES, ConversionMetrics, stream_convert_csv  # noqa: E402
+
+DEFAULT_SIZES = [10**3, 10**4, 10**5, 10**6, 10**7]
+
+
+def measure(func, *args, repeat=1):
+    """Best wall time over ``repeat`` runs plus the tracemalloc peak of one more run"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak, result
+
+
+def baseline_convert(converter, category, from_unit, to_unit, value, pvt_correction=1.0):
+    """The original uncompiled convert(): validate, then two unit-dict lookups per call"""
+    converter.validate_input(category, value)
+    if from_unit == to_unit:
+        return value
+    units = converter.get_units(category)
+    return value * units[from_unit] / units[to_unit] * pvt_correction
+
+
+def best_ns(call):
+    """Best per-call time of ``call`` in nanoseconds"""
+    timer = timeit.Timer(call)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=5, number=number)) / number * 1e9
+
+
+def bench_scalar(converter):
+    """Latency of one cached convert() call per category (first → second unit).
+
+    Linear categories are also timed through baseline_convert(), so a
+    regression of the compiled path against the original shows as
+    ``speedup`` < 1.
+    """
+    results = []
+    for category in CATEGORIES:
+        units = converter.get_unit_names(category)
+        from_unit, to_unit = units[0], units[1 % len(units)]
+        value = 1.5 if category == "API Gravity ↔ Specific Gravity" else 100.0
+        convert_ns = best_ns(lambda: converter.convert(category, from_unit, to_unit, value))
+        baseline_ns = None
+        if category not in converter.special_conversions:
+            baseline_ns = best_ns(lambda: baseline_convert(converter, category, from_unit, to_unit, value))
+
+        start = time.perf_counter()
+        converter.compile(category, from_unit, to_unit)
+        compile_seconds = time.perf_counter() - start
+
+        results.append({
+            "category": category,
+            "from_unit": from_unit,
+            "to_unit": to_unit,
+            "convert_ns": convert_ns,
+            "baseline_ns": baseline_ns,
+            "speedup": baseline_ns / convert_ns if baseline_ns else None,
+            "compile_us": compile_seconds * 1e6,
+        })
+
+    results.append({
+        "category": "Temperature",
+        "from_unit": "Celsius (°C)",
+        "to_unit": "Fahrenheit (°F)",
+        "function": "convert_temperature",
+        "convert_ns": best_ns(lambda: converter.convert_temperature("Celsius (°C)", "Fahrenheit (°F)", 25.0)),
+    })
+    return results
+
+
+def bench_metrics(category="Pressure", from_unit="psi", to_unit="bar", value=1.0):
+    """Cost of ConversionMetrics on the scalar hot path: convert() with and without metrics"""
+    plain = UnitConverter()
+    metered = UnitConverter(metrics=ConversionMetrics())
+    plain_ns = best_ns(lambda: plain.convert(category, from_unit, to_unit, value))
+    metrics_ns = best_ns(lambda: metered.convert(category, from_unit, to_unit, value))
+    return {
+        "category": category,
+        "from_unit": from_unit,
+        "to_unit": to_unit,
+        "convert_ns": plain_ns,
+        "metrics_convert_ns": metrics_ns,
+        "overhead_ns": metrics_ns - plain_ns,
+        "slowdown": metrics_ns / plain_ns,
+    }
+
+
+def bench_batch(converter, rows, workdir, parquet=True):
+    """CSV parse → convert → results frame → CSV/Parquet write for one size"""
+    import numpy as np
+    import pandas as pd
+
+    category, from_unit, to_unit = "Pressure", "psi", "bar"
+    source = os.path.join(workdir, f"input_{rows}.csv")
+    if not os.path.exists(source):
+        rng = np.random.default_rng(rows)
+        pd.DataFrame({"value": rng.uniform(0, 15_000, rows).round(3)}).to_csv(source, index=False)
+
+    stages = {}
+
+    def record(name, func, *args):
+        seconds, peak, result = measure(func, *args)
+        stages[name] = {
+            "seconds": seconds,
+            "rows_per_second": rows / seconds if seconds else None,
+            "peak_bytes": peak,
+        }
+        return result
+
+    df = record("read_csv", lambda: pd.read_csv(source, usecols=["value"]))
+    values = df["value"].to_numpy(dtype=np.float64)
+    converted = record("convert", converter.convert_array, category, from_unit, to_unit, values)
+    results = record("build_frame", lambda: pd.DataFrame({
+        "Input Value": values,
+        "Input Unit": from_unit,
+        "Output Value": converted,
+        "Output Unit": to_unit,
+    }))
+    record("write_csv", lambda: results.to_csv(os.path.join(workdir, "output.csv"), index=False))
+    if parquet:
+        record("write_parquet", lambda: results.to_parquet(os.path.join(workdir, "output.parquet"), index=False))
+
+    def streamed():
+        with open(os.path.join(workdir, "streamed.csv"), "w", newline="") as output:
+            return stream_convert_csv(converter, source, output, category, from_unit, to_unit)
+
+    record("stream_convert_csv", streamed)
+
+    total = sum(stage["seconds"] for name, stage in stages.items() if name != "stream_convert_csv")
+    return {
+        "rows": rows,
+        "input_bytes": os.path.getsize(source),
+        "stages": stages,
+        "pipeline_seconds": total,
+        "pipeline_rows_per_second": rows / total if total else None,
+    }
+
+
+def bench_app(reruns=5):
+    """Streamlit script run time with the AppTest harness (cold run, reruns, a Convert click)"""
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=120)
+    start = time.perf_counter()
+    app.run()
+    cold = time.perf_counter() - start
+    if app.exception:
+        raise RuntimeError(f"app.py raised: {app.exception[0].value}")
+
+    rerun_times = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        app.run()
+        rerun_times.append(time.perf_counter() - start)
+
+    button = next(button for button in app.button if button.label.endswith("Convert"))
+    start = time.perf_counter()
+    button.click().run()
+    convert_click = time.perf_counter() - start
+
+    return {
+        "cold_seconds": cold,
+        "rerun_seconds": sorted(rerun_times)[len(rerun_times) // 2],
+        "rerun_samples": rerun_times,
+        "convert_click_seconds": convert_click,
+    }
+
+
+def environment():
+    """Interpreter, library versions and git revision the run was taken on"""
+    import numpy as np
+    import pandas as pd
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+    }
+
+
+def compare(baseline, current, threshold=0.10):
+    """Print timings that moved by more than ``threshold`` between two result files"""
+    def flatten(results):
+        flat = {}
+        for entry in results.get("scalar", []):
+            key = f"scalar/{entry['category']}/{entry.get('function', 'convert')}"
+            flat[key] = entry["convert_ns"] / 1e9
+        if "metrics" in results:
+            flat["metrics/convert"] = results["metrics"]["metrics_convert_ns"] / 1e9
+        for entry in results.get("batch", []):
+            for stage, timing in entry["stages"].items():
+                flat[f"batch/{entry['rows']}/{stage}"] = timing["seconds"]
+        if "app" in results:
+            flat["app/rerun"] = results["app"]["rerun_seconds"]
+        return flat
+
+    old, new = flatten(baseline), flatten(current)
+    changed = 0
+    for key in sorted(old.keys() & new.keys()):
+        if old[key] and abs(new[key] / old[key] - 1) > threshold:
+            changed += 1
+            label = "slower" if new[key] > old[key] else "faster"
+            print(f"{key}: {old[key]:.6g}s -> {new[key]:.6g}s ({new[key] / old[key]:.2f}x, {label})")
+    print(f"{changed} of {len(old.keys() & new.keys())} timings changed by more than {threshold:.0%}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the unit converter.")
+    parser.add_argument("--output", default="bench_output.json", help="result file (default: bench_output.json)")
+    parser.add_argument("--max-rows", type=int, default=DEFAULT_SIZES[-1],
+                        help="largest batch size to run (default: 10^7)")
+    parser.add_argument("--skip-scalar", action="store_true", help="skip scalar convert latency and metrics overhead")
+    parser.add_argument("--skip-batch", action="store_true", help="skip batch throughput")
+    parser.add_argument("--skip-app", action="store_true", help="skip the Streamlit rerun benchmark")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare against an earlier result file")
+    args = parser.parse_args(argv)
+
+    converter = UnitConverter()
+    results = {"environment": environment()}
+
+    if not args.skip_scalar:
+        results["scalar"] = bench_scalar(converter)
+        for entry in results["scalar"]:
+            baseline = f"  (baseline {entry['baseline_ns']:.0f} ns, {entry['speedup']:.2f}x)" if entry.get("baseline_ns") else ""
+            print(f"scalar  {entry['category']:<40} {entry['convert_ns']:8.0f} ns{baseline}")
+        results["metrics"] = bench_metrics()
+        print(f"metrics convert() {results['metrics']['metrics_convert_ns']:.0f} ns with ConversionMetrics, "
+              f"+{results['metrics']['overhead_ns']:.0f} ns ({results['metrics']['slowdown']:.2f}x)")
+
+    if not args.skip_batch:
+        try:
+            import pyarrow  # noqa: F401
+            parquet = True
+        except ImportError:
+            parquet = False
+            print("pyarrow not installed: skipping Parquet writes")
+        results["batch"] = []
+        with tempfile.TemporaryDirectory() as workdir:
+            for rows in (size for size in DEFAULT_SIZES if size <= args.max_rows):
+                entry = bench_batch(converter, rows, workdir, parquet)
+                results["batch"].append(entry)
+                print(f"batch   {rows:>10,} rows  {entry['pipeline_seconds']:8.3f} s  "
+                      f"{entry['pipeline_rows_per_second']:12,.0f} rows/s")
+
+    if not args.skip_app:
+        try:
+            results["app"] = bench_app()
+            print(f"app     rerun {results['app']['rerun_seconds'] * 1000:.1f} ms "
+                  f"(cold {results['app']['cold_seconds'] * 1000:.1f} ms)")
+        except ImportError:
+            print("streamlit not installed: skipping the app benchmark")
+
+    with open(args.output, "w") as output:
+        json.dump(results, output, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as baseline:
+            compare(json.load(baseline), results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""Chunked, compressed download artifacts and CSV re-encoding"""
+
+import gzip
+import io
+import json
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from unit_converter.artifacts import (
+    artifact_type,
+    iter_csv,
+    iter_csv_as_ndjson,
+    iter_file,
+    iter_ndjson,
+    render_artifact,
+    spool,
+)
+from unit_converter.columnar import csv_to_columnar, read_table
+
+
+@pytest.fixture
+def results():
+    return pd.DataFrame({"Input Value": [1.0, 2.0, float("nan"), 4.0, 5.0],
+                         "Output Unit": ["bar"] * 5})
+
+
+def test_gzip_artifact_decompresses_to_the_csv(results):
+    data = render_artifact(iter_csv(results, chunk_rows=2), "gzip")
+    assert data[:2] == b"\x1f\x8b"
+    # Written in three chunks, but a single header
+    assert gzip.decompress(data).decode() == results.to_csv(index=False)
+    assert artifact_type("csv", "text/csv", "gzip") == ("csv.gz", "application/gzip")
+    assert artifact_type("csv", "text/csv", "none") == ("csv", "text/csv")
+
+
+def test_ndjson_chunks(results):
+    text = render_artifact(iter_ndjson(results, chunk_rows=2)).decode()
+    records = [json.loads(line) for line in text.splitlines()]
+    assert [record["Input Value"] for record in records] == [1.0, 2.0, None, 4.0, 5.0]
+
+
+def test_spool_spills_to_disk_and_rejects_unknown_compression(results):
+    with spool(iter_csv(results), max_memory=16) as output:
+        assert output._rolled
+        assert output.read().decode() == results.to_csv(index=False)
+    with pytest.raises(ValueError, match="Unsupported compression"):
+        render_artifact(iter_csv(results), "lzma")
+
+
+def test_streamed_csv_file_as_ndjson_and_raw(results, tmp_path):
+    path = tmp_path / "results.csv"
+    results.to_csv(path, index=False)
+    assert b"".join(iter_file(path, block_size=7)) == path.read_bytes()
+    lines = "".join(iter_csv_as_ndjson(path, chunk_rows=2)).splitlines()
+    assert len(lines) == 5 and json.loads(lines[2])["Input Value"] is None
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "feather"])
+def test_csv_to_columnar_keeps_pinned_types(tmp_path, fmt):
+    path = tmp_path / "results.csv"
+    # The first rows look like integers; later ones are floats and empty
+    path.write_text("Input Value,Error Code\n" + "1,0\n" * 5 + "2.5,0\n,2\n")
+    output = io.BytesIO()
+    csv_to_columnar(path, output, fmt, column_types={"Input Value": pa.float64(), "Error Code": pa.uint8()})
+    output.seek(0)
+    table = read_table(output, fmt)
+    assert table.schema.field("Input Value").type == pa.float64()
+    assert table.schema.field("Error Code").type == pa.uint8()
+    assert table.column("Input Value").to_pylist() == [1.0] * 5 + [2.5, None]
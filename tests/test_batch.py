@@ -0,0 +1,99 @@
+"""Chunked CSV streaming and multi-column DataFrame conversion"""
+
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from unit_converter import UnitConverter, convert_dataframe, row_pvt_correction, stream_convert_csv
+from unit_converter.converter import NEGATIVE_VALUE, NOT_A_NUMBER
+
+
+@pytest.fixture(scope="module")
+def converter():
+    return UnitConverter()
+
+
+def test_stream_convert_csv_matches_whole_file(converter):
+    values = [1.0, 2.5, -3.0, 400.0, 0.0]
+    source = io.StringIO("value,note\n" + "".join(f"{value},n{i}\n" for i, value in enumerate(values)) + "abc,x\n")
+    destination = io.StringIO()
+    progress = []
+    rows, rejected = stream_convert_csv(converter, source, destination, "Length", "foot (ft)", "meter (m)",
+                                        chunksize=2, on_progress=progress.append)
+    assert (rows, rejected) == (6, 2)
+    # One callback per chunk with the running row count
+    assert progress == [2, 4, 6]
+
+    destination.seek(0)
+    output = pd.read_csv(destination)
+    # A single header, however many chunks were written
+    assert list(output.columns[:4]) == ["Input Value", "Input Unit", "Output Value", "Output Unit"]
+    assert len(output) == 6
+    expected = converter.convert_array("Length", "foot (ft)", "meter (m)", np.array(values + [np.nan]))
+    assert output["Output Value"].tolist() == pytest.approx(expected[:6].tolist(), nan_ok=True)
+    assert output["Output Unit"].unique().tolist() == ["meter (m)"]
+
+
+def test_stream_convert_csv_needs_value_column(converter):
+    with pytest.raises(ValueError):
+        stream_convert_csv(converter, io.StringIO("depth\n1\n"), io.StringIO(), "Length", "foot (ft)", "meter (m)")
+
+
+def test_convert_dataframe_uses_each_column_spec(converter):
+    df = pd.DataFrame({"depth": [1000.0, -1.0], "pressure": [100.0, 200.0], "gor": [500.0, 600.0], "well": ["A", "B"]})
+    specs = {
+        "depth": ("Length", "foot (ft)", "meter (m)"),
+        "pressure": ("Pressure", "psi", "bar"),
+        "gor": ("Gas-Oil Ratio (GOR)", *converter.get_unit_names("Gas-Oil Ratio (GOR)")[:2]),
+    }
+    result, timings = convert_dataframe(converter, df, specs, pvt_correction=2.0)
+    assert set(timings) == set(specs)
+    assert result["depth"].tolist() == pytest.approx([304.8, np.nan], nan_ok=True)
+    assert result["pressure"].tolist() == pytest.approx([6.89476, 13.78952], rel=1e-5)
+    # The PVT correction only applies to the GOR column
+    gor_factor = converter.get_factor("Gas-Oil Ratio (GOR)", *specs["gor"][1:])
+    assert result["gor"].tolist() == pytest.approx([1000 * gor_factor, 1200 * gor_factor])
+    # The input is left alone and untouched columns come through as they were
+    assert df["depth"].tolist() == [1000.0, -1.0]
+    assert result["well"].tolist() == ["A", "B"]
+
+
+def test_row_pvt_correction():
+    correction = row_pvt_correction([14.7, 29.4, "n/a", -14.7], [60.0, 60.0, 60.0, 60.0])
+    assert correction[:2].tolist() == pytest.approx([1.0, 2.0])
+    # Unparseable and non-positive conditions become NaN
+    assert np.isnan(correction[2:]).all()
+
+
+def test_per_row_pvt_correction_in_stream_and_frame(converter):
+    from_unit, to_unit = converter.get_unit_names("Gas-Oil Ratio (GOR)")[:2]
+    factor = converter.get_factor("Gas-Oil Ratio (GOR)", from_unit, to_unit)
+    csv_in = "value,p,t\n100,14.7,60\n100,29.4,60\n100,,60\n"
+
+    destination = io.StringIO()
+    stream_convert_csv(converter, io.StringIO(csv_in), destination, "Gas-Oil Ratio (GOR)", from_unit, to_unit,
+                       pvt_correction=5.0, chunksize=2, pvt_columns=("p", "t"))
+    destination.seek(0)
+    output = pd.read_csv(destination)
+    assert output["Output Value"].tolist() == pytest.approx([100 * factor, 200 * factor, np.nan], nan_ok=True)
+    assert output["PVT Correction"].tolist() == pytest.approx([1.0, 2.0, np.nan], nan_ok=True)
+
+    df = pd.read_csv(io.StringIO(csv_in))
+    specs = {"value": ("Gas-Oil Ratio (GOR)", from_unit, to_unit)}
+    result, _ = convert_dataframe(converter, df, specs, pvt_correction=5.0, pvt_columns=("p", "t"))
+    assert result["value"].tolist() == pytest.approx(output["Output Value"].tolist(), nan_ok=True)
+
+
+def test_stream_convert_csv_error_codes(converter):
+    source = io.StringIO("value\n1\n-1\nabc\n-2\n")
+    destination = io.StringIO()
+    error_counts = {}
+    rows, rejected = stream_convert_csv(converter, source, destination, "Length", "foot (ft)", "meter (m)",
+                                        chunksize=2, error_counts=error_counts)
+    assert (rows, rejected) == (4, 3)
+    # Counts are summed over the chunks
+    assert error_counts == {"negative value": 2, "not a number": 1}
+    destination.seek(0)
+    assert pd.read_csv(destination)["Error Code"].tolist() == [0, NEGATIVE_VALUE, NOT_A_NUMBER, NEGATIVE_VALUE]
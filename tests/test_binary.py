@@ -0,0 +1,50 @@
+"""Memory-mapped conversion of raw float arrays"""
+
+import numpy as np
+import pytest
+
+from unit_converter import UnitConverter, convert_file_mmap
+
+
+@pytest.fixture(scope="module")
+def converter():
+    return UnitConverter()
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float64"])
+def test_round_trip_across_blocks(converter, tmp_path, dtype):
+    values = np.linspace(0.0, 5000.0, 1001).astype(np.dtype(dtype).newbyteorder("<"))
+    values[7] = -1.0
+    source, metres, feet = tmp_path / "in.bin", tmp_path / "m.bin", tmp_path / "ft.bin"
+    values.tofile(source)
+
+    assert convert_file_mmap(converter, source, metres, "Length", "foot (ft)", "meter (m)",
+                             dtype=dtype, block_size=64) == values.size
+    converted = np.fromfile(metres, dtype=values.dtype)
+    expected = converter.convert_array("Length", "foot (ft)", "meter (m)", values.astype(np.float64))
+    assert converted.tolist() == pytest.approx(expected.astype(values.dtype).tolist(), nan_ok=True)
+
+    convert_file_mmap(converter, metres, feet, "Length", "meter (m)", "foot (ft)", dtype=dtype, block_size=64)
+    back = np.fromfile(feet, dtype=values.dtype)
+    assert np.isnan(back[7])
+    valid = np.arange(values.size) != 7
+    assert back[valid] == pytest.approx(values[valid], rel=1e-6 if dtype == "float32" else 1e-12)
+
+
+def test_in_place_conversion(converter, tmp_path):
+    path = tmp_path / "gauge.bin"
+    np.array([100.0, 200.0, np.nan], dtype="<f8").tofile(path)
+    assert convert_file_mmap(converter, path, None, "Pressure", "psi", "bar") == 3
+    assert np.fromfile(path, dtype="<f8").tolist() == pytest.approx([6.89476, 13.78952, np.nan], rel=1e-5, nan_ok=True)
+
+
+def test_rejects_truncated_files_and_handles_empty_ones(converter, tmp_path):
+    truncated = tmp_path / "truncated.bin"
+    truncated.write_bytes(b"\0" * 12)
+    with pytest.raises(ValueError, match="multiple of 8"):
+        convert_file_mmap(converter, truncated, tmp_path / "out.bin", "Length", "foot (ft)", "meter (m)")
+
+    empty = tmp_path / "empty.bin"
+    empty.write_bytes(b"")
+    assert convert_file_mmap(converter, empty, tmp_path / "empty_out.bin", "Length", "foot (ft)", "meter (m)") == 0
+    assert (tmp_path / "empty_out.bin").read_bytes() == b""
@@ -0,0 +1,58 @@
+"""Vectorized petroleum calculators against their scalar formulas"""
+
+import numpy as np
+import pytest
+
+from unit_converter import (
+    annular_velocity,
+    annular_velocity_grid,
+    hydrostatic_pressure,
+    hydrostatic_profile,
+    pipe_volume,
+    string_tally,
+)
+
+
+def test_hydrostatic_profile_restarts_per_well():
+    profile = hydrostatic_profile([1000, 3000, 500, 1500], [10, 12, 9, 9], well=["A", "A", "B", "B"])
+    expected = [hydrostatic_pressure(1000, 10), hydrostatic_pressure(1000, 10) + hydrostatic_pressure(2000, 12),
+                hydrostatic_pressure(500, 9), hydrostatic_pressure(1500, 9)]
+    assert profile["psi"].tolist() == pytest.approx(expected)
+    assert profile["bar"].tolist() == pytest.approx([psi * 0.0689476 for psi in expected])
+
+
+@pytest.mark.parametrize("tvd, well, message", [
+    ([1000, 900], None, "increase"),
+    ([1000, 500, 2000], ["A", "B", "A"], "contiguous"),
+])
+def test_hydrostatic_profile_rejects_bad_input(tvd, well, message):
+    with pytest.raises(ValueError, match=message):
+        hydrostatic_profile(tvd, [10] * len(tvd), well=well)
+
+
+def test_annular_velocity_grid_matches_scalar():
+    grid = annular_velocity_grid([300, 500], [8.5, 12.25], [5.0, 8.5])
+    assert grid.shape == (2, 2, 2)
+    assert grid[1, 1, 0] == pytest.approx(annular_velocity(500, 12.25, 5.0))
+    # Hole not larger than the pipe: masked instead of raising
+    assert np.isnan(grid[0, 0, 1])
+
+
+def test_annular_velocity_grid_refuses_oversized_sweeps():
+    axis = np.linspace(1.0, 10.0, 1000)
+    with pytest.raises(ValueError, match="exceeds the limit"):
+        annular_velocity_grid(axis, axis, axis)
+    # The default 100 × 100 × 100 sweep stays within the limit
+    assert annular_velocity_grid(axis[:100], axis[:100], axis[:100]).size == 10**6
+
+
+def test_string_tally_totals_per_string():
+    tally = string_tally([9000, 600, 400, 5000], [5, 5, 6.5, 3.5], [4.276, 3, 2.813, 2.992],
+                         [8.5, 8.5, 8.5, 6.0], string=["A", "A", "A", "B"])
+    capacity_a = sum(pipe_volume(length, inner) for length, inner in [(9000, 4.276), (600, 3), (400, 2.813)])
+    assert tally["cumulative_capacity"][2] == pytest.approx(capacity_a)
+    assert tally["cumulative_capacity"][3] == pytest.approx(pipe_volume(5000, 2.992))
+    assert tally["depth"].tolist() == [9000, 9600, 10000, 5000]
+
+    with pytest.raises(ValueError, match="contiguous"):
+        string_tally([100, 100, 100], [5, 5, 5], [4, 4, 4], [8, 8, 8], string=["A", "B", "A"])
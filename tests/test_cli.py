@@ -0,0 +1,55 @@
+"""Command-line stdin-to-stdout conversion"""
+
+import io
+import subprocess
+import sys
+
+import pytest
+
+from unit_converter.cli import main, resolve_unit
+
+
+def run_main(monkeypatch, capsys, argv, stdin):
+    monkeypatch.setattr(sys, "stdin", io.StringIO(stdin))
+    status = main(argv)
+    out, err = capsys.readouterr()
+    return status, out, err
+
+
+def test_csv_column_mode_through_python_m():
+    csv_in = 'well,value,note\nA,100,"keep, this"\nB,abc,x\nC,200\n'
+    result = subprocess.run(
+        [sys.executable, "-m", "unit_converter", "--category", "Pressure", "--from", "psi", "--to", "kPa",
+         "--column", "value", "--block-size", "2"],
+        input=csv_in, capture_output=True, text=True, check=True,
+    )
+    lines = result.stdout.splitlines()
+    assert lines[0] == "well,value,note"
+    assert lines[1].startswith("A,689.47") and lines[1].endswith(',"keep, this"')
+    # Unparseable values are left empty and reported on stderr
+    assert lines[2] == "B,,x"
+    assert lines[3].startswith("C,1378.9")
+    assert "1 of 3 row(s) were invalid" in result.stderr
+
+
+def test_line_mode_and_abbreviations(monkeypatch, capsys):
+    status, out, err = run_main(monkeypatch, capsys, ["--category", "Length", "--from", "ft", "--to", "m"],
+                                "10\n\n-1\n2.5\n")
+    assert status == 0
+    assert out.splitlines() == ["3.048", "", "", repr(2.5 * 0.3048)]
+    assert "2 of 4" in err
+
+
+def test_errors(monkeypatch, capsys):
+    status, _, err = run_main(monkeypatch, capsys, ["--category", "Pressure", "--from", "psi", "--to", "bar",
+                                                    "--column", "depth"], "value\n1\n")
+    assert status == 2 and "depth" in err
+    with pytest.raises(ValueError, match="Unknown unit"):
+        resolve_unit(["psi", "bar"], "atm")
+    with pytest.raises(SystemExit):
+        run_main(monkeypatch, capsys, ["--category", "Nope", "--from", "a", "--to", "b"], "")
+
+
+def test_list_units(monkeypatch, capsys):
+    status, out, _ = run_main(monkeypatch, capsys, ["--list", "--category", "Temperature"], "")
+    assert status == 0 and "Kelvin (K)" in out.splitlines()
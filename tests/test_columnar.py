@@ -0,0 +1,44 @@
+"""Parquet and Feather conversion on Arrow column buffers"""
+
+import pyarrow as pa
+import pytest
+
+from unit_converter import UnitConverter
+from unit_converter.columnar import (
+    convert_columnar_file,
+    detect_format,
+    numeric_columns,
+    read_schema,
+    read_table,
+    write_table,
+)
+
+
+def test_detect_format():
+    assert [detect_format(name) for name in ("a.parquet", "b.PQ", "c.feather", "d.arrow", "e.csv", "f")] == [
+        "parquet", "parquet", "feather", "feather", "csv", "csv"]
+
+
+def test_parquet_to_feather_converts_only_selected_columns(tmp_path):
+    source = tmp_path / "wells.parquet"
+    write_table(pa.table({
+        "depth": pa.array([1000.0, 2000.0, -5.0]),
+        "pressure": pa.array([100, 200, 300], pa.int32()),
+        "well": ["A", "B", "C"],
+        "unused": [1.0, 2.0, 3.0],
+    }), source, "parquet")
+    assert numeric_columns(read_schema(source, "parquet")) == ["depth", "pressure", "unused"]
+
+    destination = tmp_path / "wells.feather"
+    specs = {"depth": ("Length", "foot (ft)", "meter (m)"), "pressure": ("Pressure", "psi", "bar")}
+    timings = convert_columnar_file(UnitConverter(), source, destination, specs, "parquet", "feather",
+                                    extra_columns=["well"])
+    assert set(timings) == set(specs)
+
+    table = read_table(destination, "feather")
+    # Only the converted and extra columns are read and written, in order
+    assert table.column_names == ["depth", "pressure", "well"]
+    assert table.schema.field("pressure").type == pa.float64()
+    assert table.column("depth").to_pylist() == pytest.approx([304.8, 609.6, float("nan")], nan_ok=True)
+    assert table.column("pressure").to_pylist() == pytest.approx([6.89476, 13.78952, 20.68428], rel=1e-5)
+    assert table.column("well").to_pylist() == ["A", "B", "C"]
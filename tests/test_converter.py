@@ -0,0 +1,175 @@
+"""UnitConverter against the semantics of the original dict-based convert()"""
+
+import fractions
+import itertools
+import math
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from unit_converter import CATEGORIES, UnitConverter, error_summary
+from unit_converter.converter import INVALID_CONDITIONS, NEGATIVE_VALUE, NON_POSITIVE_GRAVITY, NOT_A_NUMBER
+from unit_converter.units import INVALID_NEGATIVE, UNITS
+
+GRAVITY = "API Gravity ↔ Specific Gravity"
+GOR = "Gas-Oil Ratio (GOR)"
+LINEAR_CATEGORIES = [category for category in CATEGORIES if category in UNITS]
+
+
+def reference_convert(category, from_unit, to_unit, value, pvt_correction=1.0):
+    """The original convert(): validate, then base-unit round trip or the special formula"""
+    if category in INVALID_NEGATIVE and value < 0:
+        raise ValueError(f"Negative values are not valid for {category}.")
+    if category == GRAVITY and value <= 0:
+        raise ValueError("Invalid value for gravity (must be positive).")
+
+    if category == "Temperature":
+        to_celsius = {
+            "Celsius (°C)": lambda x: x,
+            "Fahrenheit (°F)": lambda x: (x - 32) / 1.8,
+            "Kelvin (K)": lambda x: x - 273.15,
+            "Rankine (°R)": lambda x: (x - 491.67) / 1.8,
+        }[from_unit](value)
+        return {
+            "Celsius (°C)": to_celsius,
+            "Fahrenheit (°F)": to_celsius * 1.8 + 32,
+            "Kelvin (K)": to_celsius + 273.15,
+            "Rankine (°R)": to_celsius * 1.8 + 491.67,
+        }[to_unit]
+    if category == GRAVITY:
+        if from_unit == to_unit:
+            return value
+        if from_unit == "API Gravity (°API)":
+            return 141.5 / (value + 131.5)
+        return 141.5 / value - 131.5
+
+    if from_unit == to_unit:
+        return value
+    units = UNITS[category]
+    return value * units[from_unit] / units[to_unit] * pvt_correction
+
+
+@pytest.fixture(scope="module")
+def converter():
+    return UnitConverter()
+
+
+def unit_pairs(converter, category):
+    return list(itertools.product(converter.get_unit_names(category), repeat=2))
+
+
+def test_import_stays_light():
+    # The package must import without Streamlit and without loading NumPy, pandas or multiprocessing
+    heavy = "{'streamlit', 'numpy', 'pandas', 'multiprocessing', 'concurrent.futures.process'}"
+    code = f"import sys, unit_converter; print(sorted({heavy} & set(sys.modules)))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+
+@pytest.mark.parametrize("category", CATEGORIES)
+def test_convert_matches_reference(converter, category):
+    value = 1.5 if category == GRAVITY else 123.456
+    for from_unit, to_unit in unit_pairs(converter, category):
+        expected = reference_convert(category, from_unit, to_unit, value)
+        assert converter.convert(category, from_unit, to_unit, value) == pytest.approx(expected, rel=1e-12, abs=1e-12)
+
+
+def test_temperature_accepts_negative_values(converter):
+    for from_unit, to_unit in unit_pairs(converter, "Temperature"):
+        expected = reference_convert("Temperature", from_unit, to_unit, -40.0)
+        assert converter.convert("Temperature", from_unit, to_unit, -40.0) == pytest.approx(expected, abs=1e-9)
+
+
+def test_gor_pvt_correction_scales_result(converter):
+    from_unit, to_unit = converter.get_unit_names(GOR)[:2]
+    expected = reference_convert(GOR, from_unit, to_unit, 500.0, pvt_correction=2.5)
+    assert converter.convert(GOR, from_unit, to_unit, 500.0, pvt_correction=2.5) == pytest.approx(expected)
+    # Same-unit conversions return the value untouched, as before
+    assert converter.convert(GOR, from_unit, from_unit, 500.0, pvt_correction=2.5) == 500.0
+
+
+@pytest.mark.parametrize("category, value", [("Length", -1.0), ("Sonic Slowness", -0.5), (GRAVITY, 0.0), (GRAVITY, -3)])
+def test_invalid_values_raise(converter, category, value):
+    from_unit, to_unit = converter.get_unit_names(category)[:2]
+    with pytest.raises(ValueError):
+        reference_convert(category, from_unit, to_unit, value)
+    with pytest.raises(ValueError):
+        converter.convert(category, from_unit, to_unit, value)
+
+
+@pytest.mark.parametrize("value", [12, 12.0, np.float64(12.0), np.int32(12), fractions.Fraction(12)])
+def test_scalar_types(converter, value):
+    result = converter.convert("Length", "foot (ft)", "meter (m)", value)
+    assert float(result) == pytest.approx(12 * 0.3048)
+
+
+def test_compiled_plan_is_reused(converter):
+    plan = converter.get_plan("Temperature", "Fahrenheit (°F)", "Celsius (°C)")
+    assert converter.get_plan("Temperature", "Fahrenheit (°F)", "Celsius (°C)") is plan
+    assert (plan.scale, plan.offset) == pytest.approx((1 / 1.8, -32 / 1.8))
+    assert plan(212.0) == plan.scalar(212.0) == pytest.approx(100.0)
+    with pytest.raises(ValueError):
+        converter.get_plan("Length", "foot (ft)", "meter (m)").scalar(-1.0)
+
+
+@pytest.mark.parametrize("category", LINEAR_CATEGORIES + ["Temperature", GRAVITY])
+def test_convert_array_matches_convert(converter, category):
+    values = np.array([-5.0, 0.0, 0.5, 1.5, 250.0, np.nan])
+    from_unit, to_unit = converter.get_unit_names(category)[:2]
+    result = converter.convert_array(category, from_unit, to_unit, values)
+    assert result.dtype == np.float64
+    for value, converted in zip(values.tolist(), result.tolist()):
+        try:
+            expected = converter.convert(category, from_unit, to_unit, value)
+        except ValueError:
+            expected = math.nan
+        assert converted == pytest.approx(expected, nan_ok=True)
+
+
+@pytest.mark.parametrize("category", LINEAR_CATEGORIES)
+def test_factor_matrix_matches_unit_ratios(converter, category):
+    units = UNITS[category]
+    matrix = converter.factor_matrix(category)
+    assert matrix.shape == (len(units), len(units))
+    for from_unit, to_unit in itertools.product(units, repeat=2):
+        factor = converter.get_factor(category, from_unit, to_unit)
+        # Scalar lookups hand back plain floats, not NumPy scalars
+        assert type(factor) is float
+        assert factor == pytest.approx(units[from_unit] / units[to_unit], rel=1e-15)
+
+
+def test_convert_array_row_correction(converter):
+    from_unit, to_unit = converter.get_unit_names(GOR)[:2]
+    values = np.array([100.0, 100.0, 100.0])
+    correction = np.array([1.0, 2.0, np.nan])
+    result = converter.convert_array(GOR, from_unit, to_unit, values, correction)
+    factor = converter.get_factor(GOR, from_unit, to_unit)
+    assert result[:2].tolist() == pytest.approx([100 * factor, 200 * factor])
+    assert math.isnan(result[2])
+
+    # Same-unit conversions ignore the correction
+    same = converter.convert_array(GOR, from_unit, from_unit, values, correction)
+    assert same.tolist() == values.tolist()
+
+
+def test_error_codes_and_summary(converter):
+    codes = converter.error_codes("Length", "foot (ft)", "meter (m)", np.array([1.0, -1.0, np.nan, -2.0]))
+    assert codes.dtype == np.uint8
+    assert codes.tolist() == [0, NEGATIVE_VALUE, NOT_A_NUMBER, NEGATIVE_VALUE]
+    assert error_summary(codes) == {"negative value": 2, "not a number": 1}
+
+    gravity = converter.error_codes(GRAVITY, *converter.get_unit_names(GRAVITY)[:2], np.array([0.0, 10.0]))
+    assert gravity.tolist() == [NON_POSITIVE_GRAVITY, 0]
+    # Counts accumulate into an existing dict
+    assert error_summary(gravity, {"not a number": 1}) == {"not a number": 1, "gravity must be positive": 1}
+
+
+def test_invalid_conditions_only_where_the_correction_applies(converter):
+    from_unit, to_unit = converter.get_unit_names(GOR)[:2]
+    values = np.array([100.0, 100.0, 100.0])
+    correction = np.array([1.0, 2.0, np.nan])
+    assert converter.error_codes(GOR, from_unit, to_unit, values, correction).tolist() == [0, 0, INVALID_CONDITIONS]
+    # Same-unit conversions ignore the correction, so no row is rejected
+    assert not converter.error_codes(GOR, from_unit, from_unit, values, correction).any()
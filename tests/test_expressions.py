@@ -0,0 +1,44 @@
+"""Compound unit expressions and dimensional analysis"""
+
+import pytest
+
+from unit_converter import compile_expression, expression_factor, parse_unit
+from unit_converter.expressions import format_dimensions
+
+
+def test_productivity_index_factor():
+    # bbl/d/psi -> m³/d/kPa
+    expected = 0.158987 / 6.894757
+    assert expression_factor("bbl/d/psi", "m³/d/kPa") == pytest.approx(expected, rel=1e-6)
+    assert expression_factor("bbl/(d*psi)", "m^3/d/kPa") == pytest.approx(expected, rel=1e-6)
+
+
+@pytest.mark.parametrize("expression", ["ft²", "ft^2", "ft2", "ft·ft", "(ft*ft)"])
+def test_exponent_spellings_agree(expression):
+    assert parse_unit(expression).dimensions == (2, 0, 0, 0)
+    assert parse_unit(expression).factor == pytest.approx(0.3048 ** 2)
+
+
+def test_dimension_mismatch_raises():
+    with pytest.raises(ValueError, match="dimensions L\\^4 M\\^-1 T and L\\^-2 M T\\^-2 differ"):
+        expression_factor("bbl/d/psi", "psi/m")
+    assert format_dimensions(parse_unit("psi").dimensions) == "L^-1 M T^-2"
+    assert format_dimensions((0, 0, 0, 0)) == "dimensionless"
+
+
+@pytest.mark.parametrize("expression, message", [
+    ("", "Empty"),
+    ("ft/(s", "Unbalanced"),
+    ("furlong/s", "Unknown unit symbol"),
+    ("ft/", "ends unexpectedly"),
+    ("ft $", "Cannot parse"),
+])
+def test_malformed_expressions_raise(expression, message):
+    with pytest.raises(ValueError, match=message):
+        parse_unit(expression)
+
+
+def test_compiled_expression_converts_arrays():
+    plan = compile_expression("lbm/ft³", "kg/m³")
+    assert plan(62.4) == pytest.approx(62.4 * 0.453592 / 0.3048 ** 3)
+    assert plan.apply([1.0, 2.0]).tolist() == pytest.approx([16.0185, 32.0370], rel=1e-4)
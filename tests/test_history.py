@@ -0,0 +1,52 @@
+"""Conversion history: in-memory ring buffer, SQLite store and streamed exports"""
+
+import csv
+import io
+import json
+
+from unit_converter import ConversionHistory
+from unit_converter.history import FIELDS
+
+
+def entry(i, category="Length"):
+    return {"timestamp": f"2026-01-{i:02d}T00:00:00", "category": category, "from_value": float(i),
+            "from_unit": "foot (ft)", "to_value": i * 0.3048, "to_unit": "meter (m)", "pvt_correction": 1.0}
+
+
+def test_ring_buffer_keeps_newest_first():
+    history = ConversionHistory(maxlen=3)
+    for i in range(1, 6):
+        history.add(entry(i))
+    assert len(history) == 3
+    assert [item["from_value"] for item in history] == [5.0, 4.0, 3.0]
+
+
+def test_sqlite_store_survives_restart_and_filters(tmp_path):
+    db_path = str(tmp_path / "history.db")
+    history = ConversionHistory(maxlen=2, db_path=db_path)
+    for i in range(1, 6):
+        history.add(entry(i, "Pressure" if i % 2 else "Length"))
+
+    reopened = ConversionHistory(maxlen=2, db_path=db_path)
+    assert [item["from_value"] for item in reopened] == [5.0, 4.0]
+    assert reopened.count() == 5
+    assert [item["from_value"] for item in reopened.search(category="Length")] == [4.0, 2.0]
+    assert [item["from_value"] for item in reopened.search(limit=2, offset=1)] == [4.0, 3.0]
+
+    reopened.clear()
+    assert len(reopened) == 0 and reopened.count() == 5
+    reopened.clear(persistent=True)
+    assert reopened.count() == 0
+
+
+def test_streamed_exports_round_trip():
+    history = ConversionHistory()
+    for i in range(1, 4):
+        history.add(entry(i))
+    expected = [entry(i) for i in (3, 2, 1)]
+
+    assert json.loads("".join(history.iter_json())) == expected
+    assert [json.loads(line) for line in "".join(history.iter_ndjson()).splitlines()] == expected
+    rows = list(csv.DictReader(io.StringIO("".join(history.iter_csv()))))
+    assert [row["from_value"] for row in rows] == ["3.0", "2.0", "1.0"]
+    assert list(rows[0]) == list(FIELDS)
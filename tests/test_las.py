@@ -0,0 +1,89 @@
+"""Streaming LAS conversion: header rewriting and the ~A data section"""
+
+import pytest
+
+from unit_converter import UnitConverter, convert_las
+from unit_converter.las import parse_header_line, read_las_curves, replace_unit
+
+LAS = """~VERSION INFORMATION
+ VERS.                 2.0 :   CWLS LOG ASCII STANDARD - VERSION 2.0
+ WRAP.                  NO :   ONE LINE PER DEPTH STEP
+~WELL INFORMATION
+ STRT.F            1000.0000 : START DEPTH
+ STOP.F            1001.0000 : STOP DEPTH
+ STEP.F               0.5000 : STEP
+ NULL.             -999.2500 : NULL VALUE
+ WELL.           TEST WELL 1 : WELL
+~CURVE INFORMATION
+ DEPT.F                      : 1  DEPTH
+ DT  .US/F                   : 2  SONIC TRANSIT TIME
+ RHOB.G/CC                   : 3  BULK DENSITY
+~ASCII
+1000.0 100.0 2.50
+1000.5 -999.25 2.45
+1001.0 -10.0 2.40
+"""
+
+
+@pytest.fixture
+def las_file(tmp_path):
+    path = tmp_path / "well.las"
+    path.write_text(LAS)
+    return path
+
+
+def read_output(path):
+    header, data = path.read_text().split("~ASCII\n")
+    rows = [[float(token) for token in line.split()] for line in data.splitlines()]
+    return header, rows
+
+
+def test_read_las_curves(las_file):
+    curves = read_las_curves(las_file)
+    assert [(mnemonic, unit) for mnemonic, unit, _ in curves] == [("DEPT", "F"), ("DT", "US/F"), ("RHOB", "G/CC")]
+    assert curves[2][2] == ("Density", "g/cm³")
+
+
+def test_convert_las_rewrites_header_and_data(las_file, tmp_path):
+    output = tmp_path / "out.las"
+    rows = convert_las(UnitConverter(), las_file, output, {"DEPT": "M", "dt": "us/m"}, block_rows=2)
+    assert rows == 3
+
+    header, data = read_output(output)
+    assert " DEPT.M " in header and " DT  .US/M " in header and " RHOB.G/CC " in header
+    # Index parameters follow the converted depth curve
+    parameters = {parsed[0]: parsed[1:3] for parsed in map(parse_header_line, header.splitlines()) if parsed}
+    assert parameters["STRT"] == ("M", "304.8")
+    assert parameters["STOP"] == ("M", "305.1048")
+    assert parameters["STEP"] == ("M", "0.1524")
+
+    assert [row[0] for row in data] == pytest.approx([304.8, 304.9524, 305.1048])
+    assert data[0][1] == pytest.approx(100 / 0.3048, rel=1e-7)
+    # NULL stays NULL and a value rejected by validation is written as NULL
+    assert data[1][1] == -999.25
+    assert data[2][1] == -999.25
+    # Unconverted curves pass through
+    assert [row[2] for row in data] == [2.5, 2.45, 2.4]
+
+
+def test_convert_las_rejects_bad_requests(las_file, tmp_path):
+    converter = UnitConverter()
+    output = tmp_path / "out.las"
+    with pytest.raises(ValueError, match="not found"):
+        convert_las(converter, las_file, output, {"GR": "M"})
+    with pytest.raises(ValueError, match="cannot convert"):
+        convert_las(converter, las_file, output, {"DT": "M"})
+
+    wrapped = tmp_path / "wrapped.las"
+    wrapped.write_text(LAS.replace("WRAP.                  NO", "WRAP.                 YES"))
+    with pytest.raises(ValueError, match="Wrapped"):
+        convert_las(converter, wrapped, output, {"DEPT": "M"})
+
+
+def test_replace_unit_keeps_columns_aligned():
+    line = " DEPT.F                      : 1  DEPTH\n"
+    _, _, _, span = parse_header_line(line)
+    replaced = replace_unit(line, span, "M")
+    assert replaced.index(":") == line.index(":")
+    longer = replace_unit(line, span, "OHMM")
+    assert longer.index(":") == line.index(":")
@@ -0,0 +1,85 @@
+"""Conversion metrics: sharded and shared counters, sampled latency and the Prometheus text format"""
+
+import threading
+
+from unit_converter import ConversionMetrics, MetricsRegistry, UnitConverter
+
+GOR = "Gas-Oil Ratio (GOR)"
+SCF_BBL = "standard cubic foot per barrel (scf/bbl)"
+SM3_M3 = "standard cubic meter per cubic meter (sm³/m³)"
+
+
+def test_counts_are_exact_across_threads_and_shards_are_retired():
+    registry = MetricsRegistry()
+    counter = registry.counter("test_total", "Test counter", ("kind",))
+    histogram = registry.histogram("test_seconds", "Test histogram", (0.5, 1.0))
+
+    def work():
+        for _ in range(1000):
+            counter.inc(("a",))
+            histogram.observe(0.25)
+
+    for _ in range(5):
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    # Finished threads fold their shards into the retired totals
+    assert counter._shards == [] and histogram._shards == []
+    text = registry.render()
+    assert 'test_total{kind="a"} 20000' in text
+    assert 'test_seconds_bucket{le="0.5"} 20000' in text
+    assert "test_seconds_count 20000" in text
+
+
+def test_float_samples_keep_every_digit():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency", (1.0,))
+    histogram.observe(1234567.891)
+    assert "latency_seconds_sum 1234567.891\n" in registry.render()
+
+
+def test_converter_records_conversions_errors_and_batches():
+    import numpy as np
+
+    metrics = ConversionMetrics()
+    converter = UnitConverter(metrics=metrics)
+    converter.convert("Length", "foot (ft)", "meter (m)", 1.0)
+    try:
+        converter.convert("Length", "foot (ft)", "meter (m)", -1.0)
+    except ValueError:
+        pass
+    converter.convert_array("Length", "foot (ft)", "meter (m)", np.array([1.0, -1.0, np.nan]))
+
+    text = metrics.render()
+    # Rejected values count as conversions; the first conversion of a pair is always timed
+    assert 'unit_converter_conversions_total{category="Length",from_unit="foot (ft)",to_unit="meter (m)"} 2' in text
+    assert 'unit_converter_convert_seconds_count{category="Length",from_unit="foot (ft)",to_unit="meter (m)"} 1' in text
+    assert 'unit_converter_validation_errors_total{category="Length"} 1' in text
+    assert 'unit_converter_batch_rows_total{category="Length",from_unit="foot (ft)",to_unit="meter (m)"} 3' in text
+    assert 'unit_converter_batch_rejected_total{category="Length"} 2' in text
+
+
+def test_conversion_counts_are_exact_and_latency_is_sampled():
+    metrics = ConversionMetrics(sample_every=4)
+    converter = UnitConverter(metrics=metrics)
+
+    def work():
+        for _ in range(1000):
+            converter.convert("Pressure", "psi", "bar", 1.0)
+            # Another PVT correction compiles another plan with the same labels
+            converter.convert(GOR, SCF_BBL, SM3_M3, 1.0, pvt_correction=2.0)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    converter.convert(GOR, SCF_BBL, SM3_M3, 1.0)
+
+    text = metrics.render()
+    assert 'unit_converter_conversions_total{category="Pressure",from_unit="psi",to_unit="bar"} 4000' in text
+    assert f'unit_converter_conversions_total{{category="{GOR}",from_unit="{SCF_BBL}",to_unit="{SM3_M3}"}} 4001' in text
+    assert 'unit_converter_convert_seconds_count{category="Pressure",from_unit="psi",to_unit="bar"} 1000' in text
@@ -0,0 +1,35 @@
+"""Parallel directory conversion"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from unit_converter import convert_directory
+from unit_converter.parallel import output_paths
+
+
+def test_output_paths_keep_folders_only_when_needed(tmp_path):
+    single = [str(tmp_path / "in" / "a.csv"), str(tmp_path / "in" / "b.csv")]
+    assert output_paths(single, "out") == {single[0]: os.path.join("out", "a.csv"),
+                                           single[1]: os.path.join("out", "b.csv")}
+    nested = [str(tmp_path / "data" / "x" / "w.csv"), str(tmp_path / "data" / "y" / "w.csv")]
+    assert sorted(output_paths(nested, "out").values()) == [os.path.join("out", "x", "w.csv"),
+                                                            os.path.join("out", "y", "w.csv")]
+
+
+def test_same_named_files_do_not_collide(tmp_path):
+    for folder, values in (("x", [1.0, 2.0]), ("y", [3.0])):
+        os.makedirs(tmp_path / "data" / folder)
+        pd.DataFrame({"value": values}).to_csv(tmp_path / "data" / folder / "w.csv", index=False)
+
+    results = convert_directory(str(tmp_path / "data" / "*" / "w.csv"), str(tmp_path / "out"),
+                                "Length", "foot (ft)", "meter (m)", workers=2)
+    assert [result["error"] for result in results] == [None, None]
+    assert [result["rows"] for result in results] == [2, 1]
+    converted = pd.read_csv(tmp_path / "out" / "y" / "w.csv")
+    assert converted["Output Value"].tolist() == pytest.approx([3 * 0.3048])
+
+    with pytest.raises(ValueError, match="differ"):
+        convert_directory(str(tmp_path / "data" / "x"), str(tmp_path / "data" / "x"),
+                          "Length", "foot (ft)", "meter (m)")
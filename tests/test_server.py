@@ -0,0 +1,122 @@
+"""HTTP service: keep-alive pipelining, chunked request bodies and streamed bulk responses"""
+
+import asyncio
+import json
+
+import pytest
+
+from unit_converter.server import ConversionServer
+
+
+def run_with_server(client, **options):
+    """Start a ConversionServer on a free port, run ``client(port)`` and shut down"""
+    async def main():
+        server = await ConversionServer(**options).start("127.0.0.1", 0)
+        try:
+            return await client(server.sockets[0].getsockname()[1])
+        finally:
+            server.close()
+            await server.wait_closed()
+    return asyncio.run(asyncio.wait_for(main(), timeout=30))
+
+
+async def read_response(reader):
+    """Read one response; returns (status, headers, body) with chunked bodies decoded"""
+    head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+    status = int(head[0].split(" ")[1])
+    headers = dict((name.strip().lower(), value.strip()) for name, value in
+                   (line.split(":", 1) for line in head[1:] if ":" in line))
+    if headers.get("transfer-encoding") == "chunked":
+        body = b""
+        while True:
+            size = int((await reader.readline()).strip(), 16)
+            if size == 0:
+                await reader.readline()
+                return status, headers, body
+            body += await reader.readexactly(size)
+            await reader.readexactly(2)
+    return status, headers, await reader.readexactly(int(headers.get("content-length", 0)))
+
+
+def request(method, target, body=b"", headers=()):
+    lines = [f"{method} {target} HTTP/1.1", "Host: test", *headers]
+    if body and not any(header.lower().startswith("transfer-encoding") for header in headers):
+        lines.append(f"Content-Length: {len(body)}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode() + body
+
+
+def chunked(*parts):
+    return b"".join(b"%x\r\n%s\r\n" % (len(part), part) for part in parts) + b"0\r\n\r\n"
+
+
+def test_pipelined_requests_answer_in_order():
+    async def client(port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(
+            request("GET", "/convert?category=Pressure&from=psi&to=bar&value=100")
+            + request("POST", "/convert", json.dumps({"category": "Length", "from": "foot (ft)",
+                                                      "to": "meter (m)", "value": 10}).encode(),
+                      ["Content-Type: application/json"])
+            + request("GET", "/convert?category=Length&from=foot%20(ft)&to=meter%20(m)&value=-1")
+            + request("GET", "/health")
+        )
+        await writer.drain()
+        responses = [await read_response(reader) for _ in range(4)]
+        writer.close()
+        return responses
+
+    responses = run_with_server(client)
+    assert [status for status, _, _ in responses] == [200, 200, 400, 200]
+    assert json.loads(responses[0][2])["result"] == pytest.approx(6.89476, rel=1e-5)
+    assert json.loads(responses[1][2])["result"] == pytest.approx(3.048)
+    assert "Negative" in json.loads(responses[2][2])["error"]
+    assert json.loads(responses[3][2]) == {"status": "ok"}
+
+
+def test_chunked_csv_bulk_with_split_records():
+    body = b'note,value\nfirst,100\n"quoted\nnewline",200\nbad,abc\n'
+    # Split mid-line and inside the quoted field; block_size=1 streams one record per block
+    parts = [body[:14], body[14:30], body[30:]]
+
+    async def client(port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(request("POST", "/convert/bulk?category=Pressure&from=psi&to=bar", chunked(*parts),
+                             ["Content-Type: text/csv", "Transfer-Encoding: chunked"]))
+        writer.write(request("GET", "/health"))
+        await writer.drain()
+        responses = [await read_response(reader) for _ in range(2)]
+        writer.close()
+        return responses
+
+    (status, headers, payload), health = run_with_server(client, block_size=1)
+    assert status == 200 and headers["transfer-encoding"] == "chunked"
+    lines = payload.decode().split("\n")
+    assert lines[0] == "note,value"
+    assert lines[1].startswith("first,6.89")
+    assert lines[2] == '"quoted' and lines[3].startswith('newline",13.78')
+    assert lines[4] == "bad,"
+    # The connection stays usable after the streamed response
+    assert health[0] == 200
+
+
+def test_ndjson_bulk_and_missing_csv_column():
+    ndjson = b'{"value": 1, "id": "a"}\n{"value": "2.5"}\n7\n{"value": null}\n'
+
+    async def client(port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(request("POST", "/convert/bulk?category=Length&from=meter%20(m)&to=centimeter%20(cm)",
+                             ndjson, ["Content-Type: application/x-ndjson"]))
+        writer.write(request("POST", "/convert/bulk?category=Length&from=meter%20(m)&to=centimeter%20(cm)&column=depth",
+                             b"value\n1\n", ["Content-Type: text/csv"]))
+        await writer.drain()
+        responses = [await read_response(reader) for _ in range(2)]
+        writer.close()
+        return responses
+
+    (status, _, payload), (missing_status, _, missing) = run_with_server(client)
+    assert status == 200
+    records = [json.loads(line) for line in payload.decode().splitlines()]
+    assert [record["result"] for record in records] == [100.0, 250.0, 700.0, None]
+    assert records[0]["id"] == "a"
+    # A missing column is found before any output, so it is still a plain 400
+    assert missing_status == 400 and "depth" in json.loads(missing)["error"]
@@ -0,0 +1,25 @@
+"""Petroleum engineering unit conversion core
+
+Pure Python and free of Streamlit; NumPy and pandas are only imported by the
+functions that need them.
+"""
+
+from .units import UNITS, CATEGORIES, INVALID_NEGATIVE, temperature_units, gravity_units
+from .converter import UnitConverter, ConversionPlan, ERROR_REASONS, error_summary
+from .calculators import (
+    hydrostatic_pressure,
+    pipe_volume,
+    annular_velocity,
+    pump_pressure,
+    pvt_correction_factor,
+    hydrostatic_profile,
+    annular_velocity_grid,
+    string_tally,
+)
+from .batch import stream_convert_csv, convert_dataframe, row_pvt_correction
+from .binary import convert_file_mmap
+from .parallel import convert_directory
+from .las import convert_las, read_las_curves
+from .expressions import parse_unit, expression_factor, compile_expression
+from .history import ConversionHistory
+from .metrics import ConversionMetrics, MetricsRegistry
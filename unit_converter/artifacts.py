@@ -0,0 +1,113 @@
+"""Lazy, chunked and compressed download artifacts
+
+Text exports (CSV, NDJSON) are produced as a stream of chunks and
+compressed as they are written into a SpooledTemporaryFile, so building a
+download never holds the whole text next to its compressed copy, and the
+build spills to disk above ``SPOOL_MAX_BYTES``. Callers wrap
+``render_artifact`` in a callable so the work only happens when the
+download is actually requested. The finished artifact is returned as
+bytes: st.download_button copies whatever it is given into its in-memory
+media store, so the size of one clicked download is not capped here.
+zstd needs the optional zstandard package; gzip is always available.
+"""
+
+import tempfile
+import zlib
+
+# Artifacts larger than this are spooled to a temporary file while built
+SPOOL_MAX_BYTES = 16 * 1024 * 1024
+
+# Compression -> (file name suffix, MIME type of the compressed file)
+COMPRESSION_TYPES = {
+    "gzip": (".gz", "application/gzip"),
+    "zstd": (".zst", "application/zstd"),
+}
+
+
+def compression_options():
+    """Compressions available for text artifacts; the first entry is the default"""
+    options = ["none", "gzip"]
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        return options
+    return options + ["zstd"]
+
+
+def _compressor(compression):
+    """Incremental compressor object with compress()/flush(), or None"""
+    if compression in (None, "none"):
+        return None
+    if compression == "gzip":
+        # wbits=31 writes a gzip header and trailer
+        return zlib.compressobj(6, zlib.DEFLATED, 31)
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise ValueError("zstd compression needs the zstandard package") from None
+        return zstandard.ZstdCompressor().compressobj()
+    raise ValueError(f"Unsupported compression: {compression}")
+
+
+def artifact_type(extension, mime, compression=None):
+    """File extension and MIME type of an artifact after compression"""
+    if compression in (None, "none"):
+        return extension, mime
+    suffix, compressed_mime = COMPRESSION_TYPES[compression]
+    return extension + suffix, compressed_mime
+
+
+def iter_csv(df, chunk_rows=100_000):
+    """Stream a DataFrame as CSV text, ``chunk_rows`` rows per chunk"""
+    for start in range(0, max(len(df), 1), chunk_rows):
+        yield df.iloc[start:start + chunk_rows].to_csv(index=False, header=start == 0)
+
+
+def iter_ndjson(df, chunk_rows=100_000):
+    """Stream a DataFrame as newline-delimited JSON records (NaN -> null)"""
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows].to_json(orient="records", lines=True)
+
+
+def iter_csv_as_ndjson(path, chunk_rows=100_000):
+    """Stream a CSV file as newline-delimited JSON records, one chunk at a time"""
+    import pandas as pd
+
+    for chunk in pd.read_csv(path, chunksize=chunk_rows):
+        yield from iter_ndjson(chunk, chunk_rows)
+
+
+def iter_file(path, block_size=1 << 20):
+    """Stream an existing file in binary blocks"""
+    with open(path, "rb") as source:
+        while block := source.read(block_size):
+            yield block
+
+
+def spool(chunks, compression=None, max_memory=SPOOL_MAX_BYTES):
+    """Write text or bytes chunks, compressed, to a spooled temp file rewound for reading"""
+    compressor = _compressor(compression)
+    output = tempfile.SpooledTemporaryFile(max_size=max_memory)
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            output.write(compressor.compress(chunk) if compressor else chunk)
+        if compressor:
+            output.write(compressor.flush())
+    except BaseException:
+        output.close()
+        raise
+    output.seek(0)
+    return output
+
+
+def render_artifact(chunks, compression=None, max_memory=SPOOL_MAX_BYTES):
+    """The finished (compressed) artifact bytes, built chunk by chunk via spool().
+
+    Only the build is bounded by ``max_memory``; the returned bytes hold
+    the whole artifact.
+    """
+    with spool(chunks, compression, max_memory) as output:
+        return output.read()
@@ -0,0 +1,97 @@
+"""Batch conversion of tabular files
+
+pandas and NumPy are imported inside the functions so that importing this
+module does not pull them in.
+"""
+
+import time
+
+from .calculators import pvt_correction_factor
+from .converter import error_summary
+
+GOR_CATEGORY = "Gas-Oil Ratio (GOR)"
+
+
+def row_pvt_correction(pressure, temperature):
+    """Per-row GOR PVT correction from pressure (psia) and temperature (°F) columns.
+
+    Non-numeric or non-positive corrections become NaN, so the affected rows
+    convert to NaN rather than to a wrong value.
+    """
+    import numpy as np
+    import pandas as pd
+
+    pressure = pd.to_numeric(pd.Series(pressure), errors="coerce").to_numpy(dtype=np.float64)
+    temperature = pd.to_numeric(pd.Series(temperature), errors="coerce").to_numpy(dtype=np.float64)
+    correction = pvt_correction_factor(pressure, temperature)
+    correction[~(correction > 0)] = np.nan
+    return correction
+
+
+def stream_convert_csv(converter, source, destination, category, from_unit, to_unit,
+                       pvt_correction=1.0, chunksize=100_000, on_progress=None, pvt_columns=None,
+                       error_counts=None):
+    """Convert the 'value' column of a CSV chunk by chunk.
+
+    Each converted chunk is appended to ``destination`` as soon as it is ready,
+    so peak memory is bounded by ``chunksize``. For GOR, ``pvt_columns`` names
+    the (pressure, temperature) columns used for a per-row PVT correction
+    instead of ``pvt_correction``. Rejected rows get NaN and a nonzero
+    'Error Code'; ``error_counts``, if given, is a dict that collects their
+    counts by reason. Returns (rows, rejected).
+    """
+    import numpy as np
+    import pandas as pd
+
+    per_row = bool(pvt_columns) and category == GOR_CATEGORY
+    usecols = ["value", *pvt_columns] if per_row else ["value"]
+
+    rows = 0
+    rejected = 0
+    for chunk in pd.read_csv(source, usecols=usecols, chunksize=chunksize):
+        values = pd.to_numeric(chunk["value"], errors="coerce").to_numpy(dtype=np.float64)
+        correction = row_pvt_correction(chunk[pvt_columns[0]], chunk[pvt_columns[1]]) if per_row else pvt_correction
+        codes = converter.error_codes(category, from_unit, to_unit, values, correction)
+        output = pd.DataFrame({
+            "Input Value": values,
+            "Input Unit": from_unit,
+            "Output Value": converter.convert_array(category, from_unit, to_unit, values, correction),
+            "Output Unit": to_unit,
+            "Error Code": codes
+        })
+        if per_row:
+            output["PVT Correction"] = correction
+        output.to_csv(destination, header=(rows == 0), index=False)
+
+        rows += len(values)
+        rejected += int(np.count_nonzero(codes))
+        if error_counts is not None:
+            error_summary(codes, error_counts)
+        if on_progress:
+            on_progress(rows)
+    return rows, rejected
+
+
+def convert_dataframe(converter, df, specs, pvt_correction=1.0, pvt_columns=None):
+    """Convert several DataFrame columns, each with its own unit spec.
+
+    ``specs`` maps column -> (category, from_unit, to_unit). Untouched columns
+    are shared with ``df`` rather than copied. The PVT correction only applies
+    to GOR columns; ``pvt_columns`` (pressure, temperature) makes it per row.
+    Returns (converted_df, seconds_per_column).
+    """
+    if pvt_columns:
+        pvt_correction = row_pvt_correction(df[pvt_columns[0]], df[pvt_columns[1]])
+
+    converted = {}
+    timings = {}
+    for column, (category, from_unit, to_unit) in specs.items():
+        start = time.perf_counter()
+        correction = pvt_correction if category == GOR_CATEGORY else 1.0
+        converted[column] = converter.convert_array(category, from_unit, to_unit, df[column], correction)
+        timings[column] = time.perf_counter() - start
+
+    result = df.copy(deep=False)
+    for column, values in converted.items():
+        result[column] = values
+    return result, timings
@@ -0,0 +1,48 @@
+"""Memory-mapped conversion of raw little-endian float arrays
+
+Gauge data stored as flat float32/float64 files is converted block by block
+between memory maps, so memory use stays flat whatever the file size.
+"""
+
+import os
+
+# Values per block; 64K float64 values (512 KB) stay within a typical L2 cache
+DEFAULT_BLOCK_SIZE = 65_536
+
+
+def convert_file_mmap(converter, source, destination, category, from_unit, to_unit,
+                      dtype="float64", pvt_correction=1.0, block_size=DEFAULT_BLOCK_SIZE):
+    """Convert a raw binary float array file through memory maps.
+
+    ``dtype`` is 'float32' or 'float64' and is always read as little-endian.
+    Pass ``destination=None`` (or the source path) to convert in place.
+    Values rejected by validation become NaN. Returns the number of values.
+    """
+    import numpy as np
+
+    dtype = np.dtype(dtype).newbyteorder("<")
+    size = os.path.getsize(source)
+    if size % dtype.itemsize:
+        raise ValueError(f"File size {size} is not a multiple of {dtype.itemsize} bytes ({dtype.name}).")
+    count = size // dtype.itemsize
+
+    in_place = destination is None or os.path.abspath(destination) == os.path.abspath(source)
+    if count == 0:
+        if not in_place:
+            open(destination, "wb").close()
+        return 0
+
+    plan = converter.get_plan(category, from_unit, to_unit, pvt_correction)
+    if in_place:
+        values = output = np.memmap(source, dtype=dtype, mode="r+", shape=(count,))
+    else:
+        values = np.memmap(source, dtype=dtype, mode="r", shape=(count,))
+        output = np.memmap(destination, dtype=dtype, mode="w+", shape=(count,))
+
+    for start in range(0, count, block_size):
+        stop = min(start + block_size, count)
+        output[start:stop] = plan.apply(values[start:stop])
+
+    output.flush()
+    del values, output
+    return count
@@ -0,0 +1,160 @@
+"""Petroleum engineering calculators
+
+Oilfield units throughout: depths and lengths in ft, diameters in in,
+mud weights in ppg, flow rates in gpm, pressures in psi, volumes in bbl.
+"""
+
+# Common output conversions
+PSI_TO_BAR = 0.0689476
+PSI_TO_MPA = 0.00689476
+BBL_TO_M3 = 0.158987
+BBL_TO_GAL = 42
+FT_TO_M = 0.3048
+
+# Largest sweep grid evaluated at once (40 MB of float64 results)
+MAX_GRID_CELLS = 5_000_000
+
+
+def hydrostatic_pressure(tvd, mud_weight):
+    """Hydrostatic pressure (psi): P = 0.052 × TVD × MW"""
+    return tvd * mud_weight * 0.052
+
+
+def pipe_volume(length_ft, diameter_in):
+    """Pipe capacity (ID) or displacement (OD) in bbl: V = L × D² / 1029.4"""
+    return length_ft * (diameter_in ** 2) / 1029.4
+
+
+def annular_velocity(flow_rate, hole_dia, pipe_od):
+    """Annular velocity (ft/min): V = Q / (2.448 × (D² - d²))"""
+    if hole_dia <= pipe_od:
+        raise ValueError("Hole diameter must be larger than pipe OD")
+    return flow_rate / (2.448 * (hole_dia**2 - pipe_od**2))
+
+
+def pump_pressure(depth, mud_density, friction_loss):
+    """Required pump pressure (psi); returns (total, hydrostatic)"""
+    hydrostatic = hydrostatic_pressure(depth, mud_density)
+    return hydrostatic + friction_loss, hydrostatic
+
+
+def pvt_correction_factor(pressure_psia, temp_f):
+    """GOR PVT correction relative to standard conditions (14.7 psia, 60°F)"""
+    return (pressure_psia / 14.7) * ((temp_f + 460) / 520)
+
+
+def hydrostatic_profile(tvd, mud_weight, well=None):
+    """Cumulative hydrostatic pressure at every survey station.
+
+    ``tvd`` holds station depths (ft) in increasing order and ``mud_weight``
+    the mud weight (ppg) of the interval ending at each station; the first
+    interval starts at surface. Several wells can be stacked by passing a
+    ``well`` id per station, each well's stations contiguous. Returns a dict
+    of arrays in psi, bar and MPa.
+    """
+    import numpy as np
+
+    tvd = np.asarray(tvd, dtype=np.float64)
+    mud_weight = np.asarray(mud_weight, dtype=np.float64)
+    if tvd.shape != mud_weight.shape or tvd.ndim != 1:
+        raise ValueError("TVD and mud weight must be 1-D arrays of the same length")
+    if tvd.size == 0:
+        return {"psi": tvd.copy(), "bar": tvd.copy(), "MPa": tvd.copy()}
+
+    starts = _group_starts(tvd.size, well, "well")
+    previous = np.empty_like(tvd)
+    previous[0] = 0.0
+    previous[1:] = tvd[:-1]
+    previous[starts] = 0.0
+    intervals = tvd - previous
+    if (intervals < 0).any():
+        raise ValueError("TVD must increase along each well")
+
+    psi = _grouped_cumsum(0.052 * mud_weight * intervals, starts)
+    return {"psi": psi, "bar": psi * PSI_TO_BAR, "MPa": psi * PSI_TO_MPA}
+
+
+def _group_starts(size, groups=None, label="group"):
+    """Boolean mask of the first row of each group; each group's rows must be contiguous"""
+    import numpy as np
+
+    starts = np.zeros(size, dtype=bool)
+    if size:
+        starts[0] = True
+    if groups is not None:
+        groups = np.asarray(groups)
+        starts[1:] = groups[1:] != groups[:-1]
+        run_ids = groups[starts].tolist()
+        if len(set(run_ids)) != len(run_ids):
+            raise ValueError(f"Rows of each {label} must be contiguous")
+    return starts
+
+
+def _grouped_cumsum(values, starts):
+    """Cumulative sum of values that restarts at every group start"""
+    import numpy as np
+
+    running = np.cumsum(values)
+    start_index = np.flatnonzero(starts)
+    offsets = running[start_index] - values[start_index]
+    return running - np.repeat(offsets, np.diff(np.append(start_index, values.size)))
+
+
+def annular_velocity_grid(flow_rates, hole_dias, pipe_ods):
+    """Annular velocity (ft/min) over every flow rate × hole diameter × pipe OD.
+
+    Returns an array of shape (len(flow_rates), len(hole_dias), len(pipe_ods))
+    evaluated by broadcasting; cells where the hole is not larger than the
+    pipe are NaN instead of raising. Grids of more than ``MAX_GRID_CELLS``
+    points are refused before anything is allocated.
+    """
+    import numpy as np
+
+    cells = len(flow_rates) * len(hole_dias) * len(pipe_ods)
+    if cells > MAX_GRID_CELLS:
+        raise ValueError(f"Sweep grid of {cells:,} points exceeds the limit of {MAX_GRID_CELLS:,}")
+    flow = np.asarray(flow_rates, dtype=np.float64)[:, None, None]
+    hole = np.asarray(hole_dias, dtype=np.float64)[None, :, None]
+    pipe = np.asarray(pipe_ods, dtype=np.float64)[None, None, :]
+    area = 2.448 * (hole * hole - pipe * pipe)
+    area[area <= 0] = np.nan
+    return flow / area
+
+
+def string_tally(length_ft, od_in, id_in, hole_in, string=None):
+    """Per-section and cumulative volumes (bbl) of one or more drill strings.
+
+    Sections are listed top to bottom; several strings can be stacked by
+    passing a ``string`` id per section, each string's sections contiguous.
+    ``hole_in`` is the open-hole size or casing ID outside the section, and
+    an annulus where it is not larger than the OD is NaN. Returns a dict of
+    arrays: capacity, displacement (steel) and annular volume per section,
+    plus their running totals from surface.
+    """
+    import numpy as np
+
+    length = np.asarray(length_ft, dtype=np.float64)
+    od = np.asarray(od_in, dtype=np.float64)
+    inner = np.asarray(id_in, dtype=np.float64)
+    hole = np.asarray(hole_in, dtype=np.float64)
+    if not length.shape == od.shape == inner.shape == hole.shape or length.ndim != 1:
+        raise ValueError("Section columns must be 1-D arrays of the same length")
+    if (length < 0).any() or (inner > od).any():
+        raise ValueError("Section lengths must be positive and ID no larger than OD")
+
+    capacity = pipe_volume(length, inner)
+    displacement = pipe_volume(length, od) - capacity
+    annular_area = hole * hole - od * od
+    annular_area[annular_area <= 0] = np.nan
+    annular = length * annular_area / 1029.4
+
+    starts = _group_starts(length.size, string, "string")
+    return {
+        "capacity": capacity,
+        "displacement": displacement,
+        "annular": annular,
+        "depth": _grouped_cumsum(length, starts),
+        "cumulative_capacity": _grouped_cumsum(capacity, starts),
+        "cumulative_displacement": _grouped_cumsum(displacement, starts),
+        "cumulative_annular": _grouped_cumsum(np.nan_to_num(annular), starts),
+    }
@@ -0,0 +1,144 @@
+"""Command-line converter for shell pipelines
+
+Reads numbers (one per line) or CSV rows from stdin and writes converted
+rows to stdout in buffered blocks, e.g.::
+
+    zcat pressures.csv.gz | python -m unit_converter --category Pressure \\
+        --from psi --to "kilopascal (kPa)" --column value > kpa.csv
+
+Streamlit and pandas are never imported.
+"""
+
+import argparse
+import csv
+import itertools
+import sys
+
+from .converter import UnitConverter
+from .units import CATEGORIES
+
+
+def resolve_unit(unit_names, text):
+    """Match a unit by full name or by the abbreviation in its parentheses"""
+    if text in unit_names:
+        return text
+    for name in unit_names:
+        if "(" in name and name[name.index("(") + 1:name.rindex(")")] == text:
+            return name
+    raise ValueError(f"Unknown unit {text!r}; use --list to see the available units.")
+
+
+def parse_number(text):
+    """Parse a float, returning NaN for blank or malformed input"""
+    try:
+        return float(text)
+    except ValueError:
+        return float("nan")
+
+
+def format_number(value):
+    """Format a converted value; NaN (rejected or unparseable) becomes empty"""
+    return "" if value != value else repr(value)
+
+
+def convert_lines(plan, lines, output, block_size):
+    """Convert one number per line, block by block. Returns (rows, empty rows)"""
+    rows = empty = 0
+    lines = iter(lines)
+    while True:
+        block = [line.strip() for line in itertools.islice(lines, block_size)]
+        if not block:
+            return rows, empty
+        converted = plan.apply([parse_number(text) for text in block])
+        formatted = [format_number(value) for value in converted.tolist()]
+        output.write("\n".join(formatted) + "\n")
+        output.flush()
+        rows += len(block)
+        empty += formatted.count("")
+
+
+def convert_csv_rows(plan, lines, output, column, delimiter, block_size):
+    """Convert one CSV column in place, block by block. Returns (rows, empty rows)"""
+    reader = csv.reader(lines, delimiter=delimiter)
+    writer = csv.writer(output, delimiter=delimiter, lineterminator="\n")
+    header = next(reader, None)
+    if header is None:
+        return 0, 0
+    if column not in header:
+        raise ValueError(f"Column {column!r} not found in the CSV header.")
+    index = header.index(column)
+    writer.writerow(header)
+
+    rows = empty = 0
+    while True:
+        block = list(itertools.islice(reader, block_size))
+        if not block:
+            return rows, empty
+        values = [parse_number(row[index]) if len(row) > index else float("nan") for row in block]
+        for row, value in zip(block, plan.apply(values).tolist()):
+            if len(row) > index:
+                row[index] = format_number(value)
+                empty += value != value
+        writer.writerows(block)
+        output.flush()
+        rows += len(block)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m unit_converter",
+        description="Convert a stream of values from stdin to stdout."
+    )
+    parser.add_argument("--category", help="conversion category, e.g. Pressure")
+    parser.add_argument("--from", dest="from_unit", help="source unit (full name or abbreviation)")
+    parser.add_argument("--to", dest="to_unit", help="target unit (full name or abbreviation)")
+    parser.add_argument("--column", help="treat input as CSV with a header and convert this column")
+    parser.add_argument("--delimiter", default=",", help="CSV delimiter (default: ,)")
+    parser.add_argument("--pvt-correction", type=float, default=1.0,
+                        help="PVT correction factor applied to the result (default: 1.0)")
+    parser.add_argument("--block-size", type=int, default=8192,
+                        help="rows converted and flushed per block (default: 8192)")
+    parser.add_argument("--list", action="store_true",
+                        help="list the categories, or the units of --category, and exit")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    converter = UnitConverter()
+
+    if args.list:
+        names = converter.get_unit_names(args.category) if args.category else CATEGORIES
+        print("\n".join(names))
+        return 0
+
+    if not (args.category and args.from_unit and args.to_unit):
+        parser.error("--category, --from and --to are required")
+    if args.category not in CATEGORIES:
+        parser.error(f"unknown category {args.category!r}; use --list to see the categories")
+
+    try:
+        unit_names = converter.get_unit_names(args.category)
+        plan = converter.compile(
+            args.category,
+            resolve_unit(unit_names, args.from_unit),
+            resolve_unit(unit_names, args.to_unit),
+            args.pvt_correction
+        )
+        if args.column:
+            rows, empty = convert_csv_rows(plan, sys.stdin, sys.stdout, args.column,
+                                           args.delimiter, args.block_size)
+        else:
+            rows, empty = convert_lines(plan, sys.stdin, sys.stdout, args.block_size)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    except BrokenPipeError:
+        # Downstream closed the pipe (e.g. `| head`); stop quietly
+        sys.stderr.close()
+        return 0
+
+    if empty:
+        print(f"{empty} of {rows} row(s) were invalid and left empty", file=sys.stderr)
+    return 0
@@ -0,0 +1,139 @@
+"""Parquet and Arrow IPC (Feather) input/output for batch conversion
+
+Conversions run on the Arrow column buffers, so float columns never go
+through text. pyarrow is only imported when one of these functions is used.
+"""
+
+import os
+import time
+
+from .batch import GOR_CATEGORY, row_pvt_correction
+
+# File extension -> columnar format
+COLUMNAR_EXTENSIONS = {
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".feather": "feather",
+    ".arrow": "feather",
+    ".ipc": "feather",
+}
+
+# Output compression codecs per format; the first entry is the default
+COMPRESSION_OPTIONS = {
+    "parquet": ["snappy", "zstd", "gzip", "brotli", "lz4", "none"],
+    "feather": ["lz4", "zstd", "uncompressed"],
+}
+
+
+def detect_format(filename):
+    """Guess 'parquet', 'feather' or 'csv' from a file name"""
+    return COLUMNAR_EXTENSIONS.get(os.path.splitext(filename)[1].lower(), "csv")
+
+
+def read_schema(source, fmt):
+    """Read only the schema of a Parquet or Feather file"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if fmt == "parquet":
+        return pq.read_schema(source)
+    return pa.ipc.open_file(source).schema
+
+
+def read_table(source, fmt, columns=None):
+    """Read a Parquet or Feather file into an Arrow table, optionally only some columns"""
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+
+    if fmt == "parquet":
+        return pq.read_table(source, columns=columns)
+    return feather.read_table(source, columns=columns)
+
+
+def write_table(table, destination, fmt, compression=None):
+    """Write an Arrow table as Parquet or Feather"""
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+
+    compression = compression or COMPRESSION_OPTIONS[fmt][0]
+    if fmt == "parquet":
+        pq.write_table(table, destination, compression=compression)
+    else:
+        feather.write_feather(table, destination, compression=compression)
+
+
+def csv_to_columnar(source, destination, fmt, compression=None, column_types=None):
+    """Re-encode a CSV file as Parquet or Feather one record batch at a time.
+
+    ``column_types`` pins column name -> Arrow type, so a batch whose
+    values look different from the first one cannot change the schema.
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pv
+    import pyarrow.parquet as pq
+
+    compression = compression or COMPRESSION_OPTIONS[fmt][0]
+    reader = pv.open_csv(source, convert_options=pv.ConvertOptions(column_types=column_types or {}))
+    if fmt == "parquet":
+        writer = pq.ParquetWriter(destination, reader.schema, compression=compression)
+    else:
+        codec = None if compression == "uncompressed" else compression
+        writer = pa.ipc.new_file(destination, reader.schema, options=pa.ipc.IpcWriteOptions(compression=codec))
+    with writer:
+        for batch in reader:
+            writer.write_batch(batch)
+
+
+def write_dataframe(df, destination, fmt, compression=None):
+    """Write a pandas DataFrame as Parquet or Feather without the index"""
+    import pyarrow as pa
+
+    write_table(pa.Table.from_pandas(df, preserve_index=False), destination, fmt, compression)
+
+
+def convert_table(converter, table, specs, pvt_correction=1.0, pvt_columns=None):
+    """Convert columns of an Arrow table in place of the originals.
+
+    ``specs`` maps column -> (category, from_unit, to_unit) and
+    ``pvt_columns`` works as in convert_dataframe. Returns
+    (converted_table, seconds_per_column).
+    """
+    import pyarrow as pa
+
+    if pvt_columns:
+        pvt_correction = row_pvt_correction(
+            table.column(pvt_columns[0]).to_numpy(), table.column(pvt_columns[1]).to_numpy()
+        )
+
+    timings = {}
+    for column, (category, from_unit, to_unit) in specs.items():
+        start = time.perf_counter()
+        correction = pvt_correction if category == GOR_CATEGORY else 1.0
+        values = table.column(column).to_numpy()
+        converted = converter.convert_array(category, from_unit, to_unit, values, correction)
+        table = table.set_column(table.schema.get_field_index(column), column, pa.array(converted))
+        timings[column] = time.perf_counter() - start
+    return table, timings
+
+
+def convert_columnar_file(converter, source, destination, specs, input_format, output_format=None,
+                          compression=None, pvt_correction=1.0, extra_columns=(), pvt_columns=None):
+    """Convert a Parquet/Feather file, reading only the converted and extra columns.
+
+    Returns the seconds spent converting each column.
+    """
+    columns = list(dict.fromkeys([*specs, *extra_columns, *(pvt_columns or ())]))
+    table = read_table(source, input_format, columns=columns)
+    table, timings = convert_table(converter, table, specs, pvt_correction, pvt_columns)
+    write_table(table, destination, output_format or input_format, compression)
+    return timings
+
+
+def numeric_columns(schema):
+    """Names of the integer and floating point columns of an Arrow schema"""
+    import pyarrow as pa
+
+    return [
+        field.name for field in schema
+        if pa.types.is_integer(field.type) or pa.types.is_floating(field.type)
+    ]
@@ -0,0 +1,337 @@
+"""Unit conversion engine
+
+NumPy is imported on first use so that importing this module stays cheap.
+"""
+
+import numbers
+import time
+
+from .units import UNITS, INVALID_NEGATIVE, temperature_scales, temperature_units, gravity_units
+
+# Batch validation error codes (uint8 per row); 0 means the row converted
+VALID = 0
+NOT_A_NUMBER = 1
+NEGATIVE_VALUE = 2
+NON_POSITIVE_GRAVITY = 3
+INVALID_CONDITIONS = 4
+
+# Exact-type check first: isinstance against the numbers.Real ABC is ~20x slower
+_SCALAR_TYPES = (float, int)
+
+ERROR_REASONS = {
+    VALID: "ok",
+    NOT_A_NUMBER: "not a number",
+    NEGATIVE_VALUE: "negative value",
+    NON_POSITIVE_GRAVITY: "gravity must be positive",
+    INVALID_CONDITIONS: "invalid pressure/temperature",
+}
+
+
+class ConversionPlan:
+    """A conversion resolved ahead of time.
+
+    Linear units and temperature reduce to ``value * scale + offset``; API↔SG
+    keeps a specialized callable. Works on scalars and on arrays/Series.
+    """
+
+    __slots__ = ("category", "from_unit", "to_unit", "scale", "offset", "func",
+                 "minimum", "exclusive", "message", "calls")
+
+    def __init__(self, category, from_unit, to_unit, scale=1.0, offset=0.0, func=None,
+                 minimum=None, exclusive=False, message=None):
+        self.category = category
+        self.from_unit = from_unit
+        self.to_unit = to_unit
+        self.scale = scale
+        self.offset = offset
+        self.func = func
+        self.minimum = minimum
+        self.exclusive = exclusive
+        self.message = message
+        # Conversion count, attached by a UnitConverter that records metrics
+        self.calls = None
+
+    def __repr__(self):
+        return (f"ConversionPlan({self.category!r}, {self.from_unit!r} -> {self.to_unit!r}, "
+                f"scale={self.scale!r}, offset={self.offset!r})")
+
+    def __call__(self, value):
+        if type(value) in _SCALAR_TYPES or isinstance(value, numbers.Real):
+            return self.scalar(value)
+        return self.apply(value)
+
+    def scalar(self, value):
+        """Convert one real number, raising ValueError when it fails validation"""
+        minimum = self.minimum
+        if minimum is not None and (value < minimum or (value == minimum and self.exclusive)):
+            raise ValueError(self.message)
+        if self.func is None:
+            return value * self.scale + self.offset
+        return self.func(value)
+
+    def invalid_mask(self, values):
+        """Flag the array values outside the plan's valid range"""
+        if self.minimum is None:
+            import numpy as np
+
+            return np.zeros(values.shape, dtype=bool)
+        if self.exclusive:
+            return values <= self.minimum
+        return values < self.minimum
+
+    def apply(self, values, correction=None):
+        """Convert an array or Series to float64; invalid values become NaN.
+
+        ``correction`` is an optional per-value multiplier (e.g. row-wise PVT
+        corrections) folded into the linear scale.
+        """
+        import numpy as np
+
+        values = np.asarray(values, dtype=np.float64)
+        if self.func is not None:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                result = np.array(self.func(values), dtype=np.float64)
+        else:
+            result = values * self.scale
+            if correction is not None:
+                result *= np.asarray(correction, dtype=np.float64)
+            if self.offset:
+                result += self.offset
+
+        if self.minimum is not None:
+            result[self.invalid_mask(values)] = np.nan
+        return result
+
+
+def error_summary(codes, counts=None):
+    """Count rejected rows by reason from error codes, adding to ``counts`` if given"""
+    import numpy as np
+
+    counts = {} if counts is None else counts
+    for code, count in enumerate(np.bincount(codes, minlength=len(ERROR_REASONS)).tolist()):
+        if code != VALID and count:
+            reason = ERROR_REASONS[code]
+            counts[reason] = counts.get(reason, 0) + count
+    return counts
+
+
+def _api_to_sg(value):
+    return 141.5 / (value + 131.5)
+
+
+def _sg_to_api(value):
+    return 141.5 / value - 131.5
+
+
+# Unit Converter Class
+class UnitConverter:
+    # Categories where negative values are physically meaningless
+    invalid_negative = INVALID_NEGATIVE
+
+    def __init__(self, metrics=None):
+        self.units = UNITS
+        self.special_conversions = {
+            "Temperature": self.convert_temperature,
+            "API Gravity ↔ Specific Gravity": self.convert_api_sg,
+        }
+
+        # from×to factor matrices are built per category on first use
+        self.unit_index = {
+            category: {unit: i for i, unit in enumerate(units)}
+            for category, units in self.units.items()
+        }
+        self.factor_matrices = {}
+        # Plain floats for scalar lookups; indexing a matrix costs a NumPy scalar per call
+        self._factors = {}
+
+        # Compiled plans reused by convert/convert_array
+        self._plans = {}
+
+        # Optional ConversionMetrics; None keeps the hot path free of bookkeeping
+        self.metrics = metrics
+
+    def validate_input(self, category, value):
+        """Validate input values based on category"""
+        if category in self.invalid_negative and value < 0:
+            raise ValueError(f"Negative values are not valid for {category}.")
+        if category == "API Gravity ↔ Specific Gravity" and value <= 0:
+            raise ValueError("Invalid value for gravity (must be positive).")
+        return True
+
+    def invalid_mask(self, category, values):
+        """Flag the array values that validate_input would reject"""
+        import numpy as np
+
+        if category in self.invalid_negative:
+            return values < 0
+        if category == "API Gravity ↔ Specific Gravity":
+            return values <= 0
+        return np.zeros(values.shape, dtype=bool)
+
+    def error_codes(self, category, from_unit, to_unit, values, pvt_correction=None):
+        """Per-value validation error codes (uint8, see ERROR_REASONS).
+
+        Applies the same rules as validate_input in one vectorized pass; NaN
+        inputs are NOT_A_NUMBER, and an array ``pvt_correction`` with NaN
+        entries flags those rows as INVALID_CONDITIONS when convert_array
+        would actually apply it.
+        """
+        import numpy as np
+
+        values = np.asarray(values, dtype=np.float64)
+        codes = np.zeros(values.shape, dtype=np.uint8)
+        if pvt_correction is not None and self._takes_correction(category, from_unit, to_unit) and not (
+            type(pvt_correction) in _SCALAR_TYPES or isinstance(pvt_correction, numbers.Real)
+        ):
+            codes[np.isnan(np.asarray(pvt_correction, dtype=np.float64))] = INVALID_CONDITIONS
+        codes[np.isnan(values)] = NOT_A_NUMBER
+        if category in self.invalid_negative:
+            codes[values < 0] = NEGATIVE_VALUE
+        elif category == "API Gravity ↔ Specific Gravity":
+            codes[values <= 0] = NON_POSITIVE_GRAVITY
+        return codes
+
+    def get_units(self, category):
+        """Get available units for a category"""
+        return self.units.get(category, {})
+
+    def get_unit_names(self, category):
+        """List the selectable unit names of any category, special ones included"""
+        if category == "Temperature":
+            return temperature_units
+        if category == "API Gravity ↔ Specific Gravity":
+            return gravity_units
+        return list(self.get_units(category))
+
+    def factor_matrix(self, category):
+        """Return the cached from×to factor matrix of a linear category"""
+        matrix = self.factor_matrices.get(category)
+        if matrix is None:
+            import numpy as np
+
+            units = self.units[category]
+            factors = np.fromiter(units.values(), dtype=np.float64, count=len(units))
+            matrix = self.factor_matrices[category] = np.outer(factors, 1.0 / factors)
+        return matrix
+
+    def build_factor_matrices(self):
+        """Precompute the factor matrices of every linear category"""
+        for category in self.units:
+            self.factor_matrix(category)
+
+    def get_factor(self, category, from_unit, to_unit):
+        """Look up the multiplier that converts from_unit into to_unit"""
+        key = (category, from_unit, to_unit)
+        factor = self._factors.get(key)
+        if factor is None:
+            index = self.unit_index[category]
+            factor = self._factors[key] = float(self.factor_matrix(category)[index[from_unit], index[to_unit]])
+        return factor
+
+    def compile(self, category, from_unit, to_unit, pvt_correction=1.0):
+        """Resolve a conversion into a reusable ConversionPlan"""
+        if category in self.invalid_negative:
+            bounds = {"minimum": 0, "message": f"Negative values are not valid for {category}."}
+        elif category == "API Gravity ↔ Specific Gravity":
+            bounds = {"minimum": 0, "exclusive": True,
+                      "message": "Invalid value for gravity (must be positive)."}
+        else:
+            bounds = {}
+
+        if from_unit == to_unit:
+            return ConversionPlan(category, from_unit, to_unit, **bounds)
+
+        if category == "Temperature":
+            scale, offset = self.temperature_affine(from_unit, to_unit)
+            return ConversionPlan(category, from_unit, to_unit, scale, offset, **bounds)
+
+        if category == "API Gravity ↔ Specific Gravity":
+            func = _api_to_sg if from_unit == "API Gravity (°API)" else _sg_to_api
+            return ConversionPlan(category, from_unit, to_unit, func=func, **bounds)
+
+        scale = self.get_factor(category, from_unit, to_unit) * pvt_correction
+        return ConversionPlan(category, from_unit, to_unit, scale, **bounds)
+
+    def get_plan(self, category, from_unit, to_unit, pvt_correction=1.0):
+        """Return a cached compiled plan for the conversion"""
+        key = (category, from_unit, to_unit, pvt_correction)
+        plan = self._plans.get(key)
+        if plan is None:
+            if len(self._plans) >= 1024:
+                self._plans.clear()
+            plan = self._plans[key] = self.compile(*key)
+        return plan
+
+    def convert(self, category, from_unit, to_unit, value, pvt_correction=1.0):
+        """Convert value from one unit to another"""
+        plan = self._plans.get((category, from_unit, to_unit, pvt_correction))
+        if plan is None:
+            plan = self.get_plan(category, from_unit, to_unit, pvt_correction)
+        metrics = self.metrics
+        if metrics is None:
+            # Plain floats/ints skip the __call__ dispatch and the numbers.Real check
+            return plan.scalar(value) if type(value) in _SCALAR_TYPES else plan(value)
+
+        calls = plan.calls
+        if calls is None:
+            calls = plan.calls = metrics.conversion_counter(plan)
+        # Every call is counted; only one in sample_every pays for the clock and the histogram
+        timed = not next(calls) % metrics.sample_every
+        if timed:
+            start = time.perf_counter()
+        try:
+            result = plan.scalar(value) if type(value) in _SCALAR_TYPES else plan(value)
+        except ValueError:
+            metrics.record_error(plan)
+            raise
+        if timed:
+            metrics.record_conversion(plan, time.perf_counter() - start)
+        return result
+
+    def _takes_correction(self, category, from_unit, to_unit):
+        """Like compile(), same-unit and special conversions take no PVT correction"""
+        return from_unit != to_unit and category not in self.special_conversions
+
+    def convert_array(self, category, from_unit, to_unit, values, pvt_correction=1.0):
+        """Convert a NumPy array or pandas Series in one vectorized pass.
+
+        ``pvt_correction`` may be a scalar or one correction per value.
+        Returns a float64 array; values rejected by validation become NaN.
+        """
+        correction = None
+        if type(pvt_correction) in _SCALAR_TYPES or isinstance(pvt_correction, numbers.Real):
+            plan = self.get_plan(category, from_unit, to_unit, pvt_correction)
+        else:
+            plan = self.get_plan(category, from_unit, to_unit)
+            if self._takes_correction(category, from_unit, to_unit):
+                correction = pvt_correction
+        if self.metrics is None:
+            return plan.apply(values, correction)
+
+        import numpy as np
+
+        start = time.perf_counter()
+        result = plan.apply(values, correction)
+        seconds = time.perf_counter() - start
+        self.metrics.record_batch(plan, result.size, int(np.isnan(result).sum()), seconds)
+        return result
+
+    def temperature_affine(self, from_unit, to_unit):
+        """Return (scale, offset) that maps from_unit readings onto to_unit"""
+        from_ratio, from_zero = temperature_scales[from_unit]
+        to_ratio, to_zero = temperature_scales[to_unit]
+        scale = to_ratio / from_ratio
+        return scale, to_zero - from_zero * scale
+
+    def convert_temperature(self, from_unit, to_unit, value):
+        """Convert temperature between different scales"""
+        scale, offset = self.temperature_affine(from_unit, to_unit)
+        return value * scale + offset
+
+    def convert_api_sg(self, from_unit, to_unit, value):
+        """Convert between API Gravity and Specific Gravity"""
+        if from_unit == to_unit:
+            return value
+        if from_unit == "API Gravity (°API)":
+            return _api_to_sg(value)
+        return _sg_to_api(value)
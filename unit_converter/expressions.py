@@ -0,0 +1,173 @@
+"""Compound unit expressions such as ``bbl/d/psi`` or ``lbm/ft²/s``
+
+Expressions are built from base symbols with ``*``, ``·``, ``/``,
+parentheses and exponents (``ft^2``, ``ft²``, ``ft2``). Each symbol carries
+an SI factor and its dimensions in (length, mass, time, temperature), so
+any two expressions with matching dimensions can be converted. Parsed
+expressions are memoized, so repeated lookups in batch jobs are free.
+"""
+
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+from .converter import ConversionPlan
+
+# Factor to SI and dimensions as exponents of (length, mass, time, temperature)
+Quantity = namedtuple("Quantity", ["factor", "dimensions"])
+
+_L = (1, 0, 0, 0)
+_M = (0, 1, 0, 0)
+_T = (0, 0, 1, 0)
+_K = (0, 0, 0, 1)
+_AREA = (2, 0, 0, 0)
+_VOLUME = (3, 0, 0, 0)
+_FORCE = (1, 1, -2, 0)
+_PRESSURE = (-1, 1, -2, 0)
+_ENERGY = (2, 1, -2, 0)
+_POWER = (2, 1, -3, 0)
+_VISCOSITY = (-1, 1, -1, 0)
+
+# Base symbols; temperatures are intervals (°F is 5/9 K), not absolute readings
+SYMBOLS = {
+    # Length
+    "m": (1, _L), "cm": (0.01, _L), "mm": (0.001, _L), "km": (1000, _L),
+    "in": (0.0254, _L), "ft": (0.3048, _L), "yd": (0.9144, _L), "mi": (1609.34, _L),
+    # Mass
+    "kg": (1, _M), "g": (0.001, _M), "mg": (1e-6, _M), "t": (1000, _M),
+    "lb": (0.453592, _M), "lbm": (0.453592, _M), "oz": (0.0283495, _M),
+    # Time
+    "s": (1, _T), "ms": (0.001, _T), "min": (60, _T), "h": (3600, _T), "hr": (3600, _T),
+    "d": (86400, _T), "day": (86400, _T), "wk": (604800, _T), "yr": (31536000, _T),
+    # Temperature intervals
+    "K": (1, _K), "degC": (1, _K), "°C": (1, _K), "degF": (5 / 9, _K), "°F": (5 / 9, _K),
+    "degR": (5 / 9, _K), "°R": (5 / 9, _K),
+    # Area and volume
+    "ha": (10000, _AREA), "acre": (4046.86, _AREA),
+    "L": (0.001, _VOLUME), "l": (0.001, _VOLUME), "mL": (1e-6, _VOLUME),
+    "bbl": (0.158987, _VOLUME), "gal": (0.00378541, _VOLUME),
+    "scf": (0.0283168, _VOLUME), "cf": (0.0283168, _VOLUME), "Mscf": (28.3168, _VOLUME),
+    "MMscf": (28316.8, _VOLUME), "stb": (0.158987, _VOLUME),
+    # Standard metre, so that sm3 / sm³ read as standard cubic metres
+    "sm": (1, _L),
+    # Force, pressure, energy, power
+    "N": (1, _FORCE), "kN": (1000, _FORCE), "lbf": (4.44822, _FORCE), "kgf": (9.80665, _FORCE),
+    "Pa": (1, _PRESSURE), "kPa": (1000, _PRESSURE), "MPa": (1e6, _PRESSURE),
+    "bar": (1e5, _PRESSURE), "psi": (6894.76, _PRESSURE), "atm": (101325, _PRESSURE),
+    "J": (1, _ENERGY), "kJ": (1000, _ENERGY), "MJ": (1e6, _ENERGY), "cal": (4.184, _ENERGY),
+    "Btu": (1055.06, _ENERGY), "BTU": (1055.06, _ENERGY), "kWh": (3.6e6, _ENERGY),
+    "W": (1, _POWER), "kW": (1000, _POWER), "hp": (745.7, _POWER),
+    # Viscosity and permeability
+    "P": (0.1, _VISCOSITY), "cP": (0.001, _VISCOSITY),
+    "D": (9.86923e-13, _AREA), "mD": (9.86923e-16, _AREA),
+}
+
+_SUPERSCRIPTS = {"²": 2, "³": 3}
+_TOKEN = re.compile(r"\s*(?:(?P<symbol>°?[A-Za-zμ]+)(?P<power>\^-?\d+|[²³]|-?\d+)?|(?P<op>[*·/()]))")
+
+
+def _power(text):
+    if not text:
+        return 1
+    if text in _SUPERSCRIPTS:
+        return _SUPERSCRIPTS[text]
+    return int(text.lstrip("^"))
+
+
+def _tokenize(expression):
+    tokens = []
+    position = 0
+    expression = expression.strip()
+    while position < len(expression):
+        match = _TOKEN.match(expression, position)
+        if not match or match.end() == position:
+            raise ValueError(f"Cannot parse unit expression {expression!r} at {expression[position:]!r}.")
+        if match.group("op"):
+            tokens.append(match.group("op"))
+        else:
+            symbol = match.group("symbol")
+            if symbol not in SYMBOLS:
+                raise ValueError(f"Unknown unit symbol {symbol!r} in {expression!r}.")
+            tokens.append((symbol, _power(match.group("power"))))
+        position = match.end()
+    return tokens
+
+
+def _combine(left, right, sign):
+    factor = left.factor * right.factor ** sign
+    dimensions = tuple(a + sign * b for a, b in zip(left.dimensions, right.dimensions))
+    return Quantity(factor, dimensions)
+
+
+def _parse_product(tokens, position):
+    """product := factor (('*' | '·' | '/' | juxtaposition) factor)*"""
+    result, position = _parse_factor(tokens, position)
+    while position < len(tokens) and tokens[position] != ")":
+        sign = 1
+        if tokens[position] in ("*", "·", "/"):
+            sign = -1 if tokens[position] == "/" else 1
+            position += 1
+        right, position = _parse_factor(tokens, position)
+        result = _combine(result, right, sign)
+    return result, position
+
+
+def _parse_factor(tokens, position):
+    """factor := symbol | '(' product ')'"""
+    if position >= len(tokens):
+        raise ValueError("Unit expression ends unexpectedly.")
+    token = tokens[position]
+    if token == "(":
+        result, position = _parse_product(tokens, position + 1)
+        if position >= len(tokens) or tokens[position] != ")":
+            raise ValueError("Unbalanced parentheses in unit expression.")
+        return result, position + 1
+    if isinstance(token, tuple):
+        symbol, power = token
+        factor, dimensions = SYMBOLS[symbol]
+        return Quantity(factor ** power, tuple(power * d for d in dimensions)), position + 1
+    raise ValueError(f"Unexpected {token!r} in unit expression.")
+
+
+@lru_cache(maxsize=1024)
+def parse_unit(expression):
+    """Parse a unit expression into its SI factor and dimensions"""
+    tokens = _tokenize(expression)
+    if not tokens:
+        raise ValueError("Empty unit expression.")
+    result, position = _parse_product(tokens, 0)
+    if position != len(tokens):
+        raise ValueError(f"Unbalanced parentheses in unit expression {expression!r}.")
+    return result
+
+
+@lru_cache(maxsize=1024)
+def expression_factor(from_expression, to_expression):
+    """Multiplier converting from_expression into to_expression.
+
+    Raises ValueError when the two sides have different dimensions.
+    """
+    source = parse_unit(from_expression)
+    target = parse_unit(to_expression)
+    if source.dimensions != target.dimensions:
+        raise ValueError(
+            f"Cannot convert {from_expression!r} to {to_expression!r}: "
+            f"dimensions {format_dimensions(source.dimensions)} and "
+            f"{format_dimensions(target.dimensions)} differ."
+        )
+    return source.factor / target.factor
+
+
+def format_dimensions(dimensions):
+    """Render dimensions as e.g. 'L^-1 M T^-2'"""
+    parts = []
+    for name, power in zip(("L", "M", "T", "Θ"), dimensions):
+        if power:
+            parts.append(name if power == 1 else f"{name}^{power}")
+    return " ".join(parts) or "dimensionless"
+
+
+def compile_expression(from_expression, to_expression):
+    """Compile a compound unit conversion into a ConversionPlan"""
+    return ConversionPlan("Compound Unit", from_expression, to_expression,
+                          expression_factor(from_expression, to_expression))
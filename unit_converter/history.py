@@ -0,0 +1,165 @@
+"""Conversion history: a bounded in-memory ring buffer with an optional SQLite store
+
+Recent entries live in a deque (O(1) insert and trim). When a database
+path is given every entry is also written to a local SQLite file indexed
+on timestamp and category, so months of history stay searchable and can
+be exported as a stream without loading it all.
+"""
+
+import csv
+import io
+import itertools
+import json
+import sqlite3
+import threading
+from collections import deque
+
+FIELDS = ("timestamp", "category", "from_value", "from_unit", "to_value", "to_unit", "pvt_correction")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    category TEXT NOT NULL,
+    from_value REAL,
+    from_unit TEXT,
+    to_value REAL,
+    to_unit TEXT,
+    pvt_correction REAL
+);
+CREATE INDEX IF NOT EXISTS idx_history_timestamp ON history (timestamp);
+CREATE INDEX IF NOT EXISTS idx_history_category ON history (category, timestamp);
+"""
+
+
+class ConversionHistory:
+    """Newest-first conversion history, optionally backed by SQLite"""
+
+    def __init__(self, maxlen=50, db_path=None):
+        self.recent = deque(maxlen=maxlen)
+        self.db_path = db_path
+        self._connection = None
+        self._lock = threading.Lock()
+        if db_path:
+            self._connection = sqlite3.connect(db_path, check_same_thread=False)
+            self._connection.executescript(_SCHEMA)
+            # Warm the ring buffer with the newest stored entries
+            self.recent.extend(self.search(limit=maxlen))
+
+    def __len__(self):
+        return len(self.recent)
+
+    def __iter__(self):
+        return iter(self.recent)
+
+    def latest(self, n):
+        """Return the n newest entries held in memory"""
+        return list(itertools.islice(self.recent, n))
+
+    def add(self, entry):
+        """Record a conversion (a dict with the FIELDS keys)"""
+        self.recent.appendleft(entry)
+        if self._connection is not None:
+            with self._lock, self._connection:
+                self._connection.execute(
+                    f"INSERT INTO history ({', '.join(FIELDS)}) VALUES ({', '.join('?' * len(FIELDS))})",
+                    [entry.get(field) for field in FIELDS]
+                )
+
+    def clear(self, persistent=False):
+        """Empty the in-memory buffer, and the SQLite store too if persistent"""
+        self.recent.clear()
+        if persistent and self._connection is not None:
+            with self._lock, self._connection:
+                self._connection.execute("DELETE FROM history")
+
+    def _where(self, text=None, category=None, since=None, until=None):
+        clauses = []
+        params = []
+        if category:
+            clauses.append("category = ?")
+            params.append(category)
+        if since:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until:
+            clauses.append("timestamp <= ?")
+            params.append(until)
+        if text:
+            clauses.append("(from_unit LIKE ? OR to_unit LIKE ? OR category LIKE ?)")
+            params.extend([f"%{text}%"] * 3)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def _matches(self, entry, text=None, category=None, since=None, until=None):
+        if category and entry["category"] != category:
+            return False
+        if since and entry["timestamp"] < since:
+            return False
+        if until and entry["timestamp"] > until:
+            return False
+        if text:
+            text = text.lower()
+            return any(text in str(entry[field]).lower() for field in ("from_unit", "to_unit", "category"))
+        return True
+
+    def iter_entries(self, text=None, category=None, since=None, until=None, limit=None, offset=0):
+        """Yield matching entries newest first, from SQLite when available"""
+        filters = {"text": text, "category": category, "since": since, "until": until}
+        if self._connection is None:
+            matches = (entry for entry in self.recent if self._matches(entry, **filters))
+            stop = offset + limit if limit is not None else None
+            yield from itertools.islice(matches, offset, stop)
+            return
+
+        where, params = self._where(**filters)
+        query = f"SELECT {', '.join(FIELDS)} FROM history{where} ORDER BY timestamp DESC, id DESC"
+        if limit is not None:
+            query += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        with self._lock:
+            rows = self._connection.execute(query, params)
+        while True:
+            # Hold the lock per page only, never across a yield
+            with self._lock:
+                batch = rows.fetchmany(500)
+            if not batch:
+                return
+            for row in batch:
+                yield dict(zip(FIELDS, row))
+
+    def search(self, text=None, category=None, since=None, until=None, limit=100, offset=0):
+        """Return matching entries newest first as a list"""
+        return list(self.iter_entries(text, category, since, until, limit, offset))
+
+    def count(self, text=None, category=None, since=None, until=None):
+        """Count matching entries in the store (or in memory without one)"""
+        filters = {"text": text, "category": category, "since": since, "until": until}
+        if self._connection is None:
+            return sum(1 for entry in self.recent if self._matches(entry, **filters))
+        where, params = self._where(**filters)
+        with self._lock:
+            return self._connection.execute(f"SELECT COUNT(*) FROM history{where}", params).fetchone()[0]
+
+    def iter_json(self, **filters):
+        """Stream matching entries as a JSON array, one entry per chunk"""
+        yield "["
+        for i, entry in enumerate(self.iter_entries(**filters)):
+            yield ("," if i else "") + "\n" + json.dumps(entry)
+        yield "\n]\n"
+
+    def iter_ndjson(self, **filters):
+        """Stream matching entries as newline-delimited JSON, one entry per chunk"""
+        for entry in self.iter_entries(**filters):
+            yield json.dumps(entry) + "\n"
+
+    def iter_csv(self, **filters):
+        """Stream matching entries as CSV, one row per chunk"""
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=FIELDS, lineterminator="\n")
+        writer.writeheader()
+        yield buffer.getvalue()
+        for entry in self.iter_entries(**filters):
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerow({field: entry.get(field) for field in FIELDS})
+            yield buffer.getvalue()
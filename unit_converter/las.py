@@ -0,0 +1,200 @@
+"""Streaming unit conversion of LAS 2.0 well logs
+
+The header sections are small and are rewritten in memory with the new unit
+mnemonics; the ~A data section is converted in blocks of rows with
+vectorized math, so files of any size use bounded memory.
+Wrapped (WRAP YES) files are not supported.
+"""
+
+import itertools
+
+# LAS unit mnemonic -> (category, unit) in UnitConverter.units
+LAS_UNITS = {
+    "M": ("Length", "meter (m)"),
+    "CM": ("Length", "centimeter (cm)"),
+    "MM": ("Length", "millimeter (mm)"),
+    "F": ("Length", "foot (ft)"),
+    "FT": ("Length", "foot (ft)"),
+    "IN": ("Length", "inch (in)"),
+    "OHMM": ("Electrical Resistivity", "ohm-meter (Ω·m)"),
+    "OHM.M": ("Electrical Resistivity", "ohm-meter (Ω·m)"),
+    "OHMCM": ("Electrical Resistivity", "ohm-centimeter (Ω·cm)"),
+    "OHMFT": ("Electrical Resistivity", "ohm-foot (Ω·ft)"),
+    "G/CC": ("Density", "g/cm³"),
+    "G/CM3": ("Density", "g/cm³"),
+    "KG/M3": ("Density", "kg/m³"),
+    "LB/FT3": ("Density", "lb/ft³"),
+    "US/M": ("Sonic Slowness", "microsecond per meter (μs/m)"),
+    "US/F": ("Sonic Slowness", "microsecond per foot (μs/ft)"),
+    "US/FT": ("Sonic Slowness", "microsecond per foot (μs/ft)"),
+    "DEGC": ("Temperature", "Celsius (°C)"),
+    "DEGF": ("Temperature", "Fahrenheit (°F)"),
+    "DEGK": ("Temperature", "Kelvin (K)"),
+    "PSI": ("Pressure", "psi"),
+    "KPA": ("Pressure", "kilopascal (kPa)"),
+    "MPA": ("Pressure", "megapascal (MPa)"),
+    "BAR": ("Pressure", "bar"),
+    "MD": ("Permeability", "millidarcy (mD)"),
+    "M/H": ("Rate of Penetration (ROP)", "meter per hour (m/h)"),
+    "F/H": ("Rate of Penetration (ROP)", "foot per hour (ft/h)"),
+    "FT/H": ("Rate of Penetration (ROP)", "foot per hour (ft/h)"),
+}
+
+# ~W lines that carry index (depth) values
+INDEX_PARAMETERS = ("STRT", "STOP", "STEP")
+
+
+def parse_header_line(line):
+    """Split 'MNEM.UNIT  VALUE : DESCRIPTION' into (mnemonic, unit, value, unit span)"""
+    dot = line.find(".")
+    colon = line.rfind(":")
+    if dot < 0 or (0 <= colon < dot):
+        return None
+    end = dot + 1
+    while end < len(line) and not line[end].isspace():
+        end += 1
+    value = line[end:colon if colon > end else len(line)].strip()
+    return line[:dot].strip().upper(), line[dot + 1:end], value, (dot + 1, end)
+
+
+def replace_unit(line, span, unit):
+    """Swap the unit field of a header line, keeping the columns after it aligned"""
+    rest = line[span[1]:]
+    growth = len(unit) - (span[1] - span[0])
+    if growth > 0:
+        # Absorb the extra width from the padding, leaving at least one space
+        padding = len(rest) - len(rest.lstrip(" "))
+        rest = rest[min(growth, max(padding - 1, 0)):]
+    elif growth < 0:
+        rest = " " * -growth + rest
+    if rest and not rest[0].isspace():
+        rest = " " + rest
+    return line[:span[0]] + unit + rest
+
+
+def resolve_las_unit(mnemonic):
+    """Look up the (category, unit) of a LAS unit mnemonic, or None"""
+    return LAS_UNITS.get(mnemonic.strip().upper())
+
+
+def read_las_curves(source):
+    """List the curves of a LAS file as (mnemonic, unit mnemonic, (category, unit) or None)"""
+    curves = []
+    section = None
+    with open(source) as las:
+        for line in las:
+            stripped = line.strip()
+            if stripped.startswith("~"):
+                section = stripped[1:2].upper()
+                if section == "A":
+                    break
+            elif section == "C" and stripped and not stripped.startswith("#"):
+                parsed = parse_header_line(line)
+                if parsed:
+                    curves.append((parsed[0], parsed[1], resolve_las_unit(parsed[1])))
+    return curves
+
+
+def convert_las(converter, source, destination, conversions, block_rows=10_000, fmt="%.8g"):
+    """Convert curves of a LAS 2.0 file, streaming the ~A section in blocks.
+
+    ``conversions`` maps curve mnemonic -> target LAS unit mnemonic (e.g.
+    {"DEPT": "M", "DT": "US/M"}). Source and target units must map to the
+    same category in LAS_UNITS. NULL values stay NULL; values rejected by
+    validation are written as NULL. When the index curve is converted, the
+    ~W STRT/STOP/STEP values are converted too. Returns the number of rows.
+    """
+    import numpy as np
+
+    conversions = {curve.upper(): unit.upper() for curve, unit in conversions.items()}
+
+    with open(source) as las, open(destination, "w") as output:
+        # Header sections are small: read them whole, up to and including ~A
+        header = []
+        for line in las:
+            header.append(line)
+            if line.strip()[:2].upper() == "~A":
+                break
+        else:
+            raise ValueError("No ~A data section found.")
+
+        plans, null_value = _rewrite_header(converter, header, conversions, fmt)
+        output.writelines(header)
+
+        # Data section: convert blocks of rows column-wise
+        rows = 0
+        while True:
+            block = [line.split() for line in itertools.islice(las, block_rows) if line.strip()]
+            if not block:
+                return rows
+            data = np.array(block, dtype=np.float64)
+            for column, plan in plans.items():
+                values = data[:, column]
+                converted = plan.apply(values)
+                if null_value is not None:
+                    converted[(values == null_value) | np.isnan(converted)] = null_value
+                for row, token in zip(block, np.char.mod(fmt, converted).tolist()):
+                    row[column] = token
+            output.write("".join(" ".join(row) + "\n" for row in block))
+            rows += len(block)
+
+
+def _rewrite_header(converter, header, conversions, fmt):
+    """Rewrite header lines in place; returns ({column: plan}, NULL value)"""
+    plans = {}
+    curves = []
+    index_lines = []
+    null_value = None
+    section = None
+
+    for i, line in enumerate(header):
+        stripped = line.strip()
+        if stripped.startswith("~"):
+            section = stripped[1:2].upper()
+            continue
+        if not stripped or stripped.startswith("#"):
+            continue
+        parsed = parse_header_line(line)
+        if parsed is None:
+            continue
+
+        mnemonic, unit, value, span = parsed
+        if section == "V" and mnemonic == "WRAP" and value.upper().startswith("Y"):
+            raise ValueError("Wrapped LAS files are not supported.")
+        if section == "W" and mnemonic == "NULL":
+            null_value = float(value)
+        if section == "W" and mnemonic in INDEX_PARAMETERS:
+            index_lines.append(i)
+        if section == "C":
+            curves.append(mnemonic)
+            if mnemonic in conversions:
+                plans[len(curves) - 1] = _curve_plan(converter, mnemonic, unit, conversions[mnemonic])
+                header[i] = replace_unit(line, span, conversions[mnemonic])
+
+    missing = set(conversions) - set(curves)
+    if missing:
+        raise ValueError(f"Curves not found in ~C section: {', '.join(sorted(missing))}")
+
+    # Keep STRT/STOP/STEP in step with a converted index curve
+    if 0 in plans:
+        plan = plans[0]
+        for i in index_lines:
+            mnemonic, _, value, span = parse_header_line(header[i])
+            # STEP is an interval, so the temperature-style offset does not apply
+            offset = 0.0 if mnemonic == "STEP" else plan.offset
+            line = replace_unit(header[i], span, conversions[curves[0]])
+            start = line.index(value, span[0] + len(conversions[curves[0]]))
+            header[i] = line[:start] + fmt % (float(value) * plan.scale + offset) + line[start + len(value):]
+    return plans, null_value
+
+
+def _curve_plan(converter, curve, from_mnemonic, to_mnemonic):
+    """Compile the plan converting one curve between two LAS unit mnemonics"""
+    source = resolve_las_unit(from_mnemonic)
+    target = resolve_las_unit(to_mnemonic)
+    if source is None or target is None:
+        unknown = from_mnemonic if source is None else to_mnemonic
+        raise ValueError(f"Curve {curve}: unknown LAS unit {unknown!r}.")
+    if source[0] != target[0]:
+        raise ValueError(f"Curve {curve}: cannot convert {source[0]} to {target[0]}.")
+    return converter.compile(source[0], source[1], target[1])
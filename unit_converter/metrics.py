@@ -0,0 +1,267 @@
+"""Process-wide conversion metrics in the Prometheus text format
+
+A UnitConverter created with ``metrics=ConversionMetrics()`` counts every
+single-value conversion per category and unit pair, times one conversion
+in ``sample_every`` into a latency histogram, and counts validation
+errors, batch rows and rejected values. Counting a conversion is one
+next() on an itertools.count shared by all threads; the clock reads and
+the histogram update, which cost more than the conversion itself, are
+only paid by the sampled calls. Other metrics record into a shard per
+thread with no lock; when a thread exits its shard is folded into a
+retired total, so threads that come and go (one per Streamlit rerun) do
+not pile up shards. A converter without metrics pays one ``is None``
+check. ``render()`` merges the shards into the exposition text for a
+/metrics endpoint and ``write()`` dumps it to a file for node-exporter
+style textfile collection.
+"""
+
+import itertools
+import os
+import threading
+import weakref
+from bisect import bisect_left
+
+# Upper bounds (seconds) of the latency histogram buckets
+SINGLE_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 1e-3, 1e-2)
+BATCH_BUCKETS = (1e-4, 1e-3, 1e-2, 0.1, 0.5, 1.0, 5.0, 10.0, 60.0)
+
+# One single-value conversion in this many is timed into the latency histogram
+SAMPLE_EVERY = 16
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames, labels):
+    if not labelnames:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(labelnames, labels)) + "}"
+
+
+class _ShardOwner:
+    """Held only by a thread's local storage; its collection marks the thread as gone"""
+
+    __slots__ = ("__weakref__",)
+
+
+class _ShardedMetric:
+    """Per-thread value shards: recording never takes a lock, render merges the shards"""
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards = []
+        self._retired = {}
+        self._lock = threading.Lock()
+
+    def _shard(self):
+        try:
+            return self._local.values
+        except AttributeError:
+            # First record from this thread
+            values = self._local.values = {}
+            owner = self._local.owner = _ShardOwner()
+            weakref.finalize(owner, self._retire, values)
+            with self._lock:
+                self._shards.append(values)
+            return values
+
+    def _retire(self, values):
+        """Fold the shard of a finished thread into the retired total"""
+        with self._lock:
+            self._shards.remove(values)
+            self._fold(self._retired, values)
+
+    def _snapshot(self):
+        """Copies of the retired total and every live shard (dict.copy is atomic under the GIL)"""
+        with self._lock:
+            retired = {}
+            self._fold(retired, self._retired)
+            return [retired] + [shard.copy() for shard in self._shards]
+
+    def _fold(self, total, values):
+        raise NotImplementedError
+
+
+class Counter(_ShardedMetric):
+    """Monotonic counter with one value per label tuple"""
+
+    kind = "counter"
+
+    def inc(self, labels=(), amount=1):
+        values = self._shard()
+        values[labels] = values.get(labels, 0) + amount
+
+    def _fold(self, total, values):
+        for labels, value in values.items():
+            total[labels] = total.get(labels, 0) + value
+
+    def samples(self):
+        totals = {}
+        for shard in self._snapshot():
+            self._fold(totals, shard)
+        for labels, value in totals.items():
+            yield self.name, _format_labels(self.labelnames, labels), value
+
+
+class SharedCounter:
+    """Counter whose value per label tuple is one itertools.count shared by all threads.
+
+    next() on a count is a single C call, so it is atomic under the GIL and
+    needs neither a lock nor a shard. Hot paths keep the count returned by
+    ``handle()`` and call next() on it.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def handle(self, labels=()):
+        counts = self._counts.get(labels)
+        if counts is None:
+            with self._lock:
+                counts = self._counts.setdefault(labels, itertools.count())
+        return counts
+
+    def samples(self):
+        with self._lock:
+            counts = list(self._counts.items())
+        for labels, count in counts:
+            # A count only exposes its next value through repr(), e.g. "count(42)"
+            yield self.name, _format_labels(self.labelnames, labels), int(repr(count)[6:-1])
+
+
+class Histogram(_ShardedMetric):
+    """Cumulative-bucket latency histogram with one series per label tuple"""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, buckets, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, labels=()):
+        shard = self._shard()
+        # Series layout: [per-bucket counts..., +Inf count, sum]
+        series = shard.get(labels)
+        if series is None:
+            series = shard[labels] = [0] * (len(self.buckets) + 2)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def _fold(self, total, values):
+        for labels, series in values.items():
+            merged = total.setdefault(labels, [0] * (len(self.buckets) + 2))
+            for i, value in enumerate(list(series)):
+                merged[i] += value
+
+    def samples(self):
+        merged = {}
+        for shard in self._snapshot():
+            self._fold(merged, shard)
+        for labels, values in merged.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), values):
+                cumulative += count
+                bucket_labels = _format_labels(self.labelnames + ("le",), labels + (bound,))
+                yield f"{self.name}_bucket", bucket_labels, cumulative
+            label_text = _format_labels(self.labelnames, labels)
+            yield f"{self.name}_sum", label_text, values[-1]
+            yield f"{self.name}_count", label_text, cumulative
+
+
+class MetricsRegistry:
+    """A set of metrics rendered together"""
+
+    def __init__(self):
+        self.metrics = []
+
+    def counter(self, name, documentation, labelnames=()):
+        metric = Counter(name, documentation, labelnames)
+        self.metrics.append(metric)
+        return metric
+
+    def shared_counter(self, name, documentation, labelnames=()):
+        metric = SharedCounter(name, documentation, labelnames)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(self, name, documentation, buckets, labelnames=()):
+        metric = Histogram(name, documentation, buckets, labelnames)
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                # repr keeps every digit of a float; :g would round sums to 6 significant digits
+                lines.append(f"{name}{labels} {value!r}" if isinstance(value, float) else f"{name}{labels} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Dump render() to ``path`` atomically, so scrapers never see a partial file"""
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as output:
+            output.write(self.render())
+        os.replace(temporary, path)
+
+
+class ConversionMetrics:
+    """The standard conversion metrics, recorded by UnitConverter"""
+
+    def __init__(self, registry=None, sample_every=SAMPLE_EVERY):
+        self.registry = registry or MetricsRegistry()
+        self.sample_every = sample_every
+        self.conversions = self.registry.shared_counter(
+            "unit_converter_conversions_total", "Single-value conversions, rejected values included",
+            ("category", "from_unit", "to_unit"))
+        self.validation_errors = self.registry.counter(
+            "unit_converter_validation_errors_total", "Single values rejected by validation",
+            ("category",))
+        self.batch_rows = self.registry.counter(
+            "unit_converter_batch_rows_total", "Values converted by batch conversions",
+            ("category", "from_unit", "to_unit"))
+        self.batch_rejected = self.registry.counter(
+            "unit_converter_batch_rejected_total", "Batch values left empty (invalid or unparseable)",
+            ("category",))
+        self.single_latency = self.registry.histogram(
+            "unit_converter_convert_seconds",
+            f"Latency of single-value conversions, sampled one in {sample_every}", SINGLE_BUCKETS,
+            ("category", "from_unit", "to_unit"))
+        self.batch_latency = self.registry.histogram(
+            "unit_converter_batch_seconds", "Latency of batch conversions", BATCH_BUCKETS,
+            ("category",))
+
+    def conversion_counter(self, plan):
+        """The shared count of a plan's conversions; UnitConverter keeps it on the plan"""
+        return self.conversions.handle((plan.category, plan.from_unit, plan.to_unit))
+
+    def record_conversion(self, plan, seconds):
+        self.single_latency.observe(seconds, (plan.category, plan.from_unit, plan.to_unit))
+
+    def record_error(self, plan):
+        self.validation_errors.inc((plan.category,))
+
+    def record_batch(self, plan, rows, rejected, seconds):
+        self.batch_rows.inc((plan.category, plan.from_unit, plan.to_unit), rows)
+        if rejected:
+            self.batch_rejected.inc((plan.category,), rejected)
+        self.batch_latency.observe(seconds, (plan.category,))
+
+    def render(self):
+        return self.registry.render()
+
+    def write(self, path):
+        self.registry.write(path)
@@ -0,0 +1,119 @@
+"""Parallel conversion of whole directories of CSV files
+
+Each file goes through stream_convert_csv in a ProcessPoolExecutor worker,
+so results match the Batch Convert tab file for file. concurrent.futures
+(and with it multiprocessing) is only imported when a directory is
+converted, so importing the package stays fast.
+"""
+
+import glob
+import logging
+import os
+import time
+
+from .batch import stream_convert_csv
+from .converter import UnitConverter
+
+logger = logging.getLogger(__name__)
+
+# One converter per worker process, created on first use
+_worker_converter = None
+
+
+def _convert_file(source, destination, category, from_unit, to_unit, pvt_correction, chunksize):
+    """Convert one CSV file inside a worker; errors are returned, not raised"""
+    global _worker_converter
+    if _worker_converter is None:
+        _worker_converter = UnitConverter()
+
+    result = {"file": source, "output": destination, "worker": os.getpid(),
+              "rows": 0, "rejected": 0, "seconds": 0.0, "error": None}
+    start = time.perf_counter()
+    try:
+        with open(destination, "w", newline="") as output:
+            result["rows"], result["rejected"] = stream_convert_csv(
+                _worker_converter, source, output, category, from_unit, to_unit,
+                pvt_correction, chunksize=chunksize
+            )
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+        # Don't leave a partial output behind
+        if os.path.exists(destination):
+            os.remove(destination)
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def find_input_files(pattern):
+    """Expand a directory (all *.csv inside it) or a glob pattern into sorted paths"""
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, "*.csv")
+    return sorted(path for path in glob.glob(pattern) if os.path.isfile(path))
+
+
+def output_paths(files, output_dir):
+    """Map each input file to its output path under ``output_dir``.
+
+    Paths are kept relative to the deepest directory shared by all inputs,
+    so same-named files from different folders (``data/*/well.csv``) never
+    overwrite each other; inputs from a single folder keep their bare names.
+    """
+    if not files:
+        return {}
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in files])
+    return {
+        path: os.path.join(output_dir, os.path.relpath(os.path.abspath(path), root))
+        for path in files
+    }
+
+
+def convert_directory(pattern, output_dir, category, from_unit, to_unit, pvt_correction=1.0,
+                      workers=None, chunksize=100_000, on_result=None):
+    """Convert every CSV matched by ``pattern`` into ``output_dir`` in parallel.
+
+    Output files keep their paths relative to the deepest folder shared by
+    the inputs (see output_paths). A failing file is reported in
+    its result's 'error' field and does not abort the run. ``on_result`` is
+    called with each per-file result dict as it completes. Returns the
+    results in input order.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    files = find_input_files(pattern)
+    destinations = output_paths(files, output_dir)
+    if {os.path.abspath(path) for path in files} & {os.path.abspath(path) for path in destinations.values()}:
+        raise ValueError("Output directory must differ from the input directory.")
+    for directory in {os.path.dirname(path) for path in destinations.values()} | {output_dir}:
+        os.makedirs(directory, exist_ok=True)
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                _convert_file, path, destinations[path],
+                category, from_unit, to_unit, pvt_correction, chunksize
+            )
+            for path in files
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            results[result["file"]] = result
+            if result["error"]:
+                logger.error("Failed to convert %s: %s", result["file"], result["error"])
+            if on_result:
+                on_result(result)
+
+    ordered = [results[path] for path in files]
+    log_throughput(ordered)
+    return ordered
+
+
+def log_throughput(results):
+    """Log rows/s for each worker process"""
+    per_worker = {}
+    for result in results:
+        rows, seconds = per_worker.get(result["worker"], (0, 0.0))
+        per_worker[result["worker"]] = (rows + result["rows"], seconds + result["seconds"])
+    for worker, (rows, seconds) in sorted(per_worker.items()):
+        logger.info("Worker %d: %d rows in %.2f s (%.0f rows/s)",
+                    worker, rows, seconds, rows / seconds if seconds else 0.0)
@@ -0,0 +1,90 @@
+"""Stage timing and optional cProfile capture for conversion jobs
+
+Wrap each step of a job in ``timer.stage(name, rows)`` to record its wall
+time, throughput and resident-memory change; ``start_profile()`` and
+``stop_profile()`` bracket a job run under cProfile, whose pstats dump can
+then be downloaded.
+Timing a stage costs two perf_counter calls and two /proc reads.
+"""
+
+import cProfile
+import io
+import marshal
+import os
+import pstats
+import sys
+import time
+from contextlib import contextmanager
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def rss_bytes():
+    """Current resident set size, or the peak RSS where /proc is unavailable"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KiB elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class StageTimer:
+    """Collects per-stage wall time, rows/s and memory delta for one run"""
+
+    def __init__(self):
+        self.stages = []
+        self.profiler = None
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        """Time the enclosed block; ``rows`` may also be set later via the yielded dict"""
+        record = {"stage": name, "rows": rows}
+        memory_before = rss_bytes()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            seconds = time.perf_counter() - start
+            record["seconds"] = seconds
+            record["rows_per_second"] = record["rows"] / seconds if record["rows"] and seconds else None
+            record["memory_delta_bytes"] = rss_bytes() - memory_before
+            self.stages.append(record)
+
+    def start_profile(self):
+        """Start capturing a cProfile of everything until stop_profile()"""
+        self.profiler = cProfile.Profile()
+        self.profiler.enable()
+
+    def stop_profile(self):
+        if self.profiler is not None:
+            self.profiler.disable()
+
+    @property
+    def total_seconds(self):
+        return sum(record["seconds"] for record in self.stages)
+
+    def records(self):
+        """Stage records in the order they ran"""
+        return list(self.stages)
+
+    def pstats_dump(self):
+        """The captured profile in the binary format pstats.Stats() loads, or None"""
+        if self.profiler is None:
+            return None
+        self.profiler.create_stats()
+        return marshal.dumps(self.profiler.stats)
+
+    def pstats_text(self, sort="cumulative", limit=25):
+        """Printable summary of the top ``limit`` functions, or None"""
+        if self.profiler is None:
+            return None
+        output = io.StringIO()
+        pstats.Stats(self.profiler, stream=output).strip_dirs().sort_stats(sort).print_stats(limit)
+        return output.getvalue()
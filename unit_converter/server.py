@@ -0,0 +1,509 @@
+"""Asyncio HTTP service exposing UnitConverter to other local services
+
+Endpoints (JSON responses unless noted)::
+
+    GET  /health
+    GET  /metrics                 (Prometheus text format)
+    GET  /units[?category=Pressure]
+    GET  /convert?category=Pressure&from=psi&to=bar&value=100[&pvt_correction=1]
+    POST /convert                 {"category": ..., "from": ..., "to": ..., "value": ...}
+    POST /convert/bulk?category=Pressure&from=psi&to=bar[&column=value][&pvt_correction=1]
+
+The bulk endpoint takes a JSON array of numbers (application/json), or
+streams CSV (text/csv, converting ``column`` in place) and NDJSON
+(application/x-ndjson, numbers or objects with a "value" key) block by
+block, answering with a chunked response in the same format. Rejected or
+unparseable values come back as null (JSON) or empty (CSV).
+
+Connections are kept alive and pipelined requests are answered in order.
+Each connection runs in its own task and streamed bodies are converted
+block by block with a drain between blocks, so one large upload does not
+stall other clients; large JSON documents are parsed and serialized in a
+worker thread. Only the standard library and NumPy are used::
+
+    python -m unit_converter.server --host 127.0.0.1 --port 8080
+"""
+
+import argparse
+import asyncio
+import csv
+import functools
+import io
+import json
+import logging
+from urllib.parse import parse_qsl, urlsplit
+
+from .cli import format_number, parse_number, resolve_unit
+from .converter import UnitConverter
+from .metrics import ConversionMetrics
+from .units import CATEGORIES
+
+logger = logging.getLogger(__name__)
+
+MAX_HEADER_BYTES = 64 * 1024
+MAX_JSON_BYTES = 64 * 1024 * 1024
+READ_SIZE = 64 * 1024
+
+REASONS = {
+    100: "Continue",
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    415: "Unsupported Media Type",
+    431: "Request Header Fields Too Large",
+    500: "Internal Server Error",
+}
+
+
+class HTTPError(Exception):
+    """An error answered with ``status`` and a JSON {"error": message} body.
+
+    ``close`` drops the connection afterwards, for errors that leave the
+    request stream out of step (e.g. a malformed chunked body).
+    """
+
+    def __init__(self, status, message, close=False):
+        super().__init__(message)
+        self.status = status
+        self.close = close
+        self.headers_sent = False
+
+
+class Request:
+    """A parsed request line and headers; the body is read lazily"""
+
+    __slots__ = ("method", "path", "query", "version", "headers", "body", "_writer")
+
+    def __init__(self, method, target, version, headers, reader, writer):
+        url = urlsplit(target)
+        self.method = method
+        self.path = url.path.rstrip("/") or "/"
+        self.query = dict(parse_qsl(url.query))
+        self.version = version
+        self.headers = headers
+        self._writer = writer
+        self.body = self._iter_body(reader)
+
+    @property
+    def keep_alive(self):
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+    @property
+    def content_type(self):
+        return self.headers.get("content-type", "").split(";")[0].strip().lower()
+
+    async def _iter_body(self, reader):
+        """Yield the body in chunks, decoding chunked transfer encoding"""
+        if self.headers.get("expect", "").lower() == "100-continue":
+            self._writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+            await self._writer.drain()
+
+        if "chunked" in self.headers.get("transfer-encoding", "").lower():
+            while True:
+                size_line = await reader.readline()
+                try:
+                    size = int(size_line.split(b";")[0].strip(), 16)
+                except ValueError:
+                    raise HTTPError(400, "Malformed chunked body.", close=True)
+                if size == 0:
+                    # Skip optional trailers up to the blank line
+                    while (await reader.readline()).strip():
+                        pass
+                    return
+                yield await reader.readexactly(size)
+                await reader.readexactly(2)
+        else:
+            try:
+                remaining = int(self.headers.get("content-length", 0))
+            except ValueError:
+                raise HTTPError(400, "Invalid Content-Length.", close=True)
+            while remaining > 0:
+                chunk = await reader.read(min(remaining, READ_SIZE))
+                if not chunk:
+                    raise asyncio.IncompleteReadError(b"", remaining)
+                remaining -= len(chunk)
+                yield chunk
+
+    async def read_body(self, limit):
+        """Read the whole body, refusing more than ``limit`` bytes"""
+        chunks = []
+        size = 0
+        async for chunk in self.body:
+            size += len(chunk)
+            if size > limit:
+                raise HTTPError(413, f"Body larger than {limit} bytes; stream it as CSV or NDJSON.")
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    async def iter_lines(self, keepends=False):
+        """Yield the body as lists of decoded lines, one list per received chunk"""
+        pending = b""
+        async for chunk in self.body:
+            buffer = pending + chunk
+            end = buffer.rfind(b"\n") + 1
+            pending = buffer[end:]
+            if end:
+                # Decode whole lines at once; a split multi-byte character stays pending
+                yield buffer[:end].decode("utf-8").splitlines(keepends)
+        if pending.strip():
+            yield pending.decode("utf-8").splitlines(keepends)
+
+
+class ConversionServer:
+    """HTTP/1.1 front end for one UnitConverter"""
+
+    def __init__(self, converter=None, block_size=8192, max_json_bytes=MAX_JSON_BYTES):
+        self.converter = converter or UnitConverter(metrics=ConversionMetrics())
+        self.block_size = block_size
+        self.max_json_bytes = max_json_bytes
+        self.routes = {
+            "/health": {"GET": self.health},
+            "/metrics": {"GET": self.metrics},
+            "/units": {"GET": self.units},
+            "/convert": {"GET": self.convert, "POST": self.convert},
+            "/convert/bulk": {"POST": self.convert_bulk},
+        }
+
+    async def start(self, host="127.0.0.1", port=8080):
+        """Start listening; returns the asyncio.Server"""
+        return await asyncio.start_server(self.handle_connection, host, port, limit=MAX_HEADER_BYTES)
+
+    async def handle_connection(self, reader, writer):
+        """Serve requests on one connection until it closes or asks to"""
+        try:
+            while True:
+                request = await self._read_request(reader, writer)
+                if request is None:
+                    return
+                keep_alive = await self._dispatch(request, writer)
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except HTTPError as e:
+            # Unreadable request head: answer and drop the connection
+            await _send_json(writer, e.status, {"error": str(e)}, keep_alive=False)
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader, writer):
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError as e:
+            if e.partial.strip():
+                raise HTTPError(400, "Incomplete request head.")
+            return None
+        except asyncio.LimitOverrunError:
+            raise HTTPError(431, "Request head too large.")
+
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ")
+        except ValueError:
+            raise HTTPError(400, "Malformed request line.")
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+        return Request(method.upper(), target, version, headers, reader, writer)
+
+    async def _dispatch(self, request, writer):
+        """Run the route handler; returns whether the connection stays open"""
+        keep_alive = request.keep_alive
+        try:
+            methods = self.routes.get(request.path)
+            if methods is None:
+                raise HTTPError(404, f"No endpoint at {request.path}.")
+            handler = methods.get(request.method)
+            if handler is None:
+                raise HTTPError(405, f"{request.method} is not allowed on {request.path}.")
+            await handler(request, writer, keep_alive)
+        except HTTPError as e:
+            if e.headers_sent:
+                # The chunked response is cut short; the client sees it unterminated
+                return False
+            keep_alive = keep_alive and not e.close
+            await _send_json(writer, e.status, {"error": str(e)}, keep_alive)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            raise
+        except Exception:
+            logger.exception("Request to %s failed", request.path)
+            await _send_json(writer, 500, {"error": "Internal server error."}, keep_alive=False)
+            return False
+
+        if keep_alive:
+            # Discard any unread body so the next pipelined request starts cleanly
+            async for _ in request.body:
+                pass
+        return keep_alive
+
+    # Endpoints
+
+    async def health(self, request, writer, keep_alive):
+        await _send_json(writer, 200, {"status": "ok"}, keep_alive)
+
+    async def metrics(self, request, writer, keep_alive):
+        if self.converter.metrics is None:
+            raise HTTPError(404, "Metrics are not enabled for this converter.")
+        payload = self.converter.metrics.render().encode()
+        await _send(writer, 200, "text/plain; version=0.0.4; charset=utf-8", payload, keep_alive)
+
+    async def units(self, request, writer, keep_alive):
+        category = request.query.get("category")
+        if category is None:
+            payload = {name: self.converter.get_unit_names(name) for name in CATEGORIES}
+        elif category in CATEGORIES:
+            payload = {category: self.converter.get_unit_names(category)}
+        else:
+            raise HTTPError(404, f"Unknown category {category!r}.")
+        await _send_json(writer, 200, payload, keep_alive)
+
+    async def convert(self, request, writer, keep_alive):
+        params = dict(request.query)
+        if request.method == "POST":
+            try:
+                body = json.loads(await request.read_body(MAX_HEADER_BYTES))
+            except ValueError:
+                raise HTTPError(400, "Body must be a JSON object.")
+            if not isinstance(body, dict):
+                raise HTTPError(400, "Body must be a JSON object.")
+            params.update(body)
+
+        category, from_unit, to_unit, pvt_correction = self._conversion(params)
+        try:
+            value = float(params["value"])
+        except KeyError:
+            raise HTTPError(400, "Missing 'value'.")
+        except (TypeError, ValueError):
+            raise HTTPError(400, f"Invalid value {params['value']!r}.")
+        try:
+            result = self.converter.convert(category, from_unit, to_unit, value, pvt_correction)
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+        await _send_json(writer, 200, {
+            "category": category,
+            "from": from_unit,
+            "to": to_unit,
+            "value": value,
+            "result": result,
+        }, keep_alive)
+
+    async def convert_bulk(self, request, writer, keep_alive):
+        category, from_unit, to_unit, pvt_correction = self._conversion(request.query)
+        convert = functools.partial(self.converter.convert_array, category, from_unit, to_unit,
+                                    pvt_correction=pvt_correction)
+        content_type = request.content_type
+        if content_type in ("application/json", ""):
+            await self._bulk_json(request, writer, keep_alive, convert)
+        elif content_type in ("text/csv", "application/csv"):
+            column = request.query.get("column", "value")
+            await _stream(writer, keep_alive, "text/csv", self._csv_blocks(request, convert, column))
+        elif content_type in ("application/x-ndjson", "application/ndjson", "application/jsonl"):
+            await _stream(writer, keep_alive, "application/x-ndjson", self._ndjson_blocks(request, convert))
+        else:
+            raise HTTPError(415, "Bulk bodies must be application/json, text/csv or application/x-ndjson.")
+
+    # Helpers
+
+    def _conversion(self, params):
+        """Resolve the category/from/to/pvt_correction params, checking them"""
+        category = params.get("category")
+        if category not in CATEGORIES:
+            raise HTTPError(400, f"Unknown or missing category {category!r}.")
+        unit_names = self.converter.get_unit_names(category)
+        try:
+            from_unit = resolve_unit(unit_names, params.get("from"))
+            to_unit = resolve_unit(unit_names, params.get("to"))
+            pvt_correction = float(params.get("pvt_correction", 1.0))
+        except (TypeError, ValueError) as e:
+            raise HTTPError(400, str(e))
+        return category, from_unit, to_unit, pvt_correction
+
+    async def _bulk_json(self, request, writer, keep_alive, convert):
+        body = await request.read_body(self.max_json_bytes)
+        loop = asyncio.get_running_loop()
+
+        def run():
+            try:
+                values = json.loads(body) if body.strip() else []
+            except ValueError:
+                raise HTTPError(400, "Body must be a JSON array of numbers.")
+            if not isinstance(values, list):
+                raise HTTPError(400, "Body must be a JSON array of numbers.")
+            numbers = [value if isinstance(value, (int, float)) and not isinstance(value, bool)
+                       else float("nan") for value in values]
+            results = [None if value != value else value for value in convert(numbers).tolist()]
+            return json.dumps({"results": results, "rejected": results.count(None)}).encode()
+
+        # Large documents are parsed and serialized off the event loop
+        payload = await loop.run_in_executor(None, run)
+        await _send(writer, 200, "application/json", payload, keep_alive)
+
+    async def _line_blocks(self, request, keepends=False):
+        """Regroup body lines into blocks of ``block_size``"""
+        block = []
+        async for lines in request.iter_lines(keepends):
+            block.extend(lines)
+            while len(block) >= self.block_size:
+                yield block[:self.block_size]
+                block = block[self.block_size:]
+        if block:
+            yield block
+
+    async def _csv_blocks(self, request, convert, column):
+        index = None
+        pending = []
+        async for block in self._line_blocks(request, keepends=True):
+            # A quoted field may hold newlines: carry an unfinished record over to the next block
+            lines = pending + block
+            end = _complete_records(lines)
+            pending = lines[end:]
+            if end:
+                index, text = _convert_csv(lines[:end], convert, column, index)
+                yield text
+        if pending:
+            index, text = _convert_csv(pending, convert, column, index)
+            yield text
+
+    async def _ndjson_blocks(self, request, convert):
+        async for block in self._line_blocks(request):
+            records = []
+            for line in block:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    record = {"value": line}
+                if not isinstance(record, dict):
+                    record = {"value": record}
+                records.append(record)
+            values = [_as_number(record.get("value")) for record in records]
+            for record, value in zip(records, convert(values).tolist()):
+                record["result"] = None if value != value else value
+            yield "".join(json.dumps(record) + "\n" for record in records)
+
+
+def _complete_records(lines):
+    """Number of leading lines that form whole CSV records (quotes balanced)"""
+    end = 0
+    quoted = False
+    for i, line in enumerate(lines):
+        if line.count('"') % 2:
+            quoted = not quoted
+        if not quoted:
+            end = i + 1
+    return end
+
+
+def _convert_csv(lines, convert, column, index=None):
+    """Convert the ``column`` field of whole CSV records; returns (index, text).
+
+    With ``index`` None the first record is the header, echoed to the output.
+    """
+    rows = list(csv.reader(lines))
+    output = io.StringIO()
+    writer = csv.writer(output, lineterminator="\n")
+    if index is None:
+        header = rows.pop(0) if rows else []
+        if column not in header:
+            raise HTTPError(400, f"Column {column!r} not found in the CSV header.")
+        index = header.index(column)
+        writer.writerow(header)
+    values = [parse_number(row[index]) if len(row) > index else float("nan") for row in rows]
+    for row, value in zip(rows, convert(values).tolist()):
+        if len(row) > index:
+            row[index] = format_number(value)
+    writer.writerows(rows)
+    return index, output.getvalue()
+
+
+def _as_number(value):
+    """NDJSON values: numbers pass through, numeric strings are parsed, the rest is NaN"""
+    if isinstance(value, bool):
+        return float("nan")
+    if isinstance(value, (int, float)):
+        return value
+    return parse_number(value) if isinstance(value, str) else float("nan")
+
+
+def _head(status, content_type, keep_alive, length=None):
+    lines = [
+        f"HTTP/1.1 {status} {REASONS[status]}",
+        f"Content-Type: {content_type}",
+        f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        f"Content-Length: {length}" if length is not None else "Transfer-Encoding: chunked",
+    ]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+async def _send(writer, status, content_type, payload, keep_alive):
+    writer.write(_head(status, content_type, keep_alive, len(payload)) + payload)
+    await writer.drain()
+
+
+async def _send_json(writer, status, payload, keep_alive):
+    await _send(writer, status, "application/json", json.dumps(payload).encode(), keep_alive)
+
+
+async def _stream(writer, keep_alive, content_type, blocks):
+    """Send a chunked response, one chunk per converted block.
+
+    The head goes out with the first block, so errors found while reading
+    the start of the body (e.g. a missing CSV column) still get a 400.
+    """
+    headers_sent = False
+    try:
+        async for block in blocks:
+            data = block.encode()
+            if not headers_sent:
+                writer.write(_head(200, content_type, keep_alive))
+                headers_sent = True
+            if data:
+                writer.write(b"%x\r\n%s\r\n" % (len(data), data))
+                await writer.drain()
+    except HTTPError as e:
+        e.headers_sent = headers_sent
+        raise
+    if not headers_sent:
+        writer.write(_head(200, content_type, keep_alive))
+    writer.write(b"0\r\n\r\n")
+    await writer.drain()
+
+
+async def serve(host="127.0.0.1", port=8080, block_size=8192):
+    """Run a ConversionServer until cancelled"""
+    server = await ConversionServer(block_size=block_size).start(host, port)
+    addresses = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+    logger.info("Serving unit conversions on %s", addresses)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m unit_converter.server",
+        description="Serve unit conversions over HTTP."
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="interface to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8080, help="port to listen on (default: 8080)")
+    parser.add_argument("--block-size", type=int, default=8192,
+                        help="rows converted per streamed block (default: 8192)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    try:
+        asyncio.run(serve(args.host, args.port, args.block_size))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,336 @@
+"""Unit tables for every conversion category"""
+
+import math
+
+# Unit definitions (comprehensive)
+length_units = {
+    "millimeter (mm)": 0.001,
+    "centimeter (cm)": 0.01,
+    "meter (m)": 1,
+    "kilometer (km)": 1000,
+    "inch (in)": 0.0254,
+    "foot (ft)": 0.3048,
+    "yard (yd)": 0.9144,
+    "mile (mi)": 1609.34,
+    "nautical mile (nmi)": 1852
+}
+
+area_units = {
+    "square millimeter (mm²)": 1e-6,
+    "square centimeter (cm²)": 1e-4,
+    "square meter (m²)": 1,
+    "square kilometer (km²)": 1e6,
+    "square inch (in²)": 0.00064516,
+    "square foot (ft²)": 0.092903,
+    "square yard (yd²)": 0.836127,
+    "acre": 4046.86,
+    "hectare (ha)": 10000,
+    "square mile (mi²)": 2.58999e6
+}
+
+volume_units = {
+    "cubic millimeter (mm³)": 1e-9,
+    "cubic centimeter (cm³)": 1e-6,
+    "cubic meter (m³)": 1,
+    "liter (L)": 0.001,
+    "milliliter (mL)": 1e-6,
+    "barrel (bbl)": 0.158987,
+    "US gallon (gal)": 0.00378541,
+    "imperial gallon (UK gal)": 0.00454609,
+    "cubic foot (ft³)": 0.0283168,
+    "cubic inch (in³)": 1.63871e-5,
+    "acre-foot": 1233.48,
+    "standard cubic foot (scf)": 0.0283168,
+    "thousand standard cubic feet (mscf)": 28.3168,
+    "million standard cubic feet (mmscf)": 28316.8,
+    "billion cubic feet (bcf)": 2.83168e7,
+    "standard cubic meter (sm³)": 1
+}
+
+mass_units = {
+    "milligram (mg)": 1e-6,
+    "gram (g)": 0.001,
+    "kilogram (kg)": 1,
+    "tonne (metric ton)": 1000,
+    "ounce (oz)": 0.0283495,
+    "pound (lb)": 0.453592,
+    "short ton (US)": 907.185,
+    "long ton (UK)": 1016.05
+}
+
+density_units = {
+    "kg/m³": 1,
+    "g/cm³": 1000,
+    "g/mL": 1000,
+    "lb/ft³": 16.0185,
+    "lb/gal (US)": 119.826,
+    "lb/bbl": 2.85301,
+    "g/L": 1
+}
+
+pressure_units = {
+    "Pascal (Pa)": 1,
+    "kilopascal (kPa)": 1000,
+    "megapascal (MPa)": 1e6,
+    "bar": 1e5,
+    "millibar (mbar)": 100,
+    "psi": 6894.76,
+    "ksi (1000 psi)": 6.89476e6,
+    "atmosphere (atm)": 101325,
+    "mmHg (torr)": 133.322,
+    "kg/cm²": 98066.5,
+    "kg/m²": 9.80665
+}
+
+force_units = {
+    "Newton (N)": 1,
+    "kilonewton (kN)": 1000,
+    "meganewton (MN)": 1e6,
+    "pound-force (lbf)": 4.44822,
+    "kilogram-force (kgf)": 9.80665,
+    "dyne": 1e-5,
+    "kilopond (kp)": 9.80665
+}
+
+energy_units = {
+    "Joule (J)": 1,
+    "kilojoule (kJ)": 1000,
+    "megajoule (MJ)": 1e6,
+    "gigajoule (GJ)": 1e9,
+    "erg": 1e-7,
+    "calorie (cal)": 4.184,
+    "kilocalorie (kcal)": 4184,
+    "British thermal unit (BTU)": 1055.06,
+    "kilowatt-hour (kWh)": 3.6e6,
+    "megawatt-hour (MWh)": 3.6e9,
+    "therm": 1.05506e8,
+    "barrel of oil equivalent (boe)": 6.12e9,
+    "tonne of oil equivalent (toe)": 4.1868e10,
+    "foot-pound (ft·lbf)": 1.35582
+}
+
+power_units = {
+    "Watt (W)": 1,
+    "kilowatt (kW)": 1000,
+    "megawatt (MW)": 1e6,
+    "gigawatt (GW)": 1e9,
+    "horsepower (hp)": 745.7,
+    "metric horsepower (PS)": 735.499,
+    "BTU/hour": 0.293071,
+    "ton of refrigeration": 3516.85
+}
+
+dynamic_visc_units = {
+    "Pascal-second (Pa·s)": 1,
+    "centipoise (cP)": 0.001,
+    "millipascal-second (mPa·s)": 0.001,
+    "poise (P)": 0.1,
+    "lb/(ft·s)": 1.48816,
+    "lb/(ft·hr)": 0.000413378
+}
+
+kinematic_visc_units = {
+    "square meter per second (m²/s)": 1,
+    "centistoke (cSt)": 1e-6,
+    "stoke (St)": 1e-4,
+    "square millimeter per second (mm²/s)": 1e-6,
+    "square foot per second (ft²/s)": 0.092903
+}
+
+liquid_flow_units = {
+    "cubic meter per second (m³/s)": 1,
+    "cubic meter per hour (m³/h)": 1/3600,
+    "cubic meter per day (m³/d)": 1/86400,
+    "barrel per second (bps)": 0.158987,
+    "barrel per minute (bpm)": 0.158987 / 60,
+    "barrel per hour (bph)": 0.158987 / 3600,
+    "barrel per day (bpd)": 0.158987 / 86400,
+    "US gallon per minute (gpm)": 0.00378541 / 60,
+    "US gallon per hour (gph)": 0.00378541 / 3600,
+    "liter per second (L/s)": 0.001,
+    "liter per minute (L/min)": 0.001 / 60,
+    "liter per hour (L/h)": 0.001 / 3600
+}
+
+gas_flow_units = {
+    "standard cubic meter per day (sm³/d)": 1,
+    "standard cubic meter per hour (sm³/h)": 24,
+    "thousand standard cubic feet per day (mscfd)": 28.3168,
+    "million standard cubic feet per day (mmscfd)": 28316.8,
+    "billion cubic feet per day (bcfd)": 2.83168e7,
+    "normal cubic meter per hour (nm³/h)": 24 / 1.0549,
+    "normal cubic meter per day (nm³/d)": 1 / 1.0549,
+    "standard cubic foot per hour (scfh)": 0.0283168 / 24,
+    "standard cubic foot per day (scfd)": 0.0283168
+}
+
+perm_units = {
+    "square meter (m²)": 1,
+    "Darcy (D)": 9.86923e-13,
+    "millidarcy (mD)": 9.86923e-16,
+    "microdarcy (μD)": 9.86923e-19
+}
+
+time_units = {
+    "microsecond (μs)": 1e-6,
+    "millisecond (ms)": 0.001,
+    "second (s)": 1,
+    "minute (min)": 60,
+    "hour (h)": 3600,
+    "day (d)": 86400,
+    "week": 604800,
+    "month (30 days)": 2592000,
+    "year (yr)": 31536000
+}
+
+velocity_units = {
+    "meter per second (m/s)": 1,
+    "kilometer per hour (km/h)": 1/3.6,
+    "foot per second (ft/s)": 0.3048,
+    "foot per minute (ft/min)": 0.00508,
+    "mile per hour (mph)": 0.44704,
+    "knot (nautical mile/h)": 0.514444
+}
+
+torque_units = {
+    "Newton-meter (N·m)": 1,
+    "kilonewton-meter (kN·m)": 1000,
+    "foot-pound (ft·lb)": 1.35582,
+    "foot-pound-force (ft·lbf)": 1.35582,
+    "inch-pound (in·lb)": 0.112985,
+    "dyne-centimeter (dyn·cm)": 1e-7
+}
+
+gor_units = {
+    "standard cubic meter per cubic meter (sm³/m³)": 1,
+    "standard cubic foot per barrel (scf/bbl)": 0.178107,
+    "normal cubic meter per cubic meter (nm³/m³)": 1.0549,
+    "cubic foot per barrel (cf/bbl)": 0.178107
+}
+
+conc_units = {
+    "milligram per liter (mg/L)": 1,
+    "parts per million (ppm)": 1,
+    "gram per liter (g/L)": 1000,
+    "kilogram per cubic meter (kg/m³)": 1,
+    "parts per billion (ppb)": 0.001,
+    "percent (%)": 10000,
+    "pound per million gallon (lb/Mgal)": 0.119826
+}
+
+heat_cap_units = {
+    "J/(kg·K)": 1,
+    "kJ/(kg·K)": 1000,
+    "cal/(g·°C)": 4186.8,
+    "Btu/(lb·°F)": 4186.8
+}
+
+therm_cond_units = {
+    "W/(m·K)": 1,
+    "cal/(cm·s·°C)": 418.68,
+    "Btu/(hr·ft·°F)": 1.73073,
+    "Btu·in/(hr·ft²·°F)": 0.144228
+}
+
+angle_units = {
+    "radian (rad)": 1,
+    "degree (deg or °)": math.pi / 180,
+    "gradian (grad)": math.pi / 200,
+    "minute of arc (')" : math.pi / 10800,
+    "second of arc (\")" : math.pi / 648000
+}
+
+resist_units = {
+    "ohm-meter (Ω·m)": 1,
+    "ohm-centimeter (Ω·cm)": 0.01,
+    "ohm-foot (Ω·ft)": 0.3048
+}
+
+mud_units = {
+    "Specific Gravity (SG)": 1,
+    "pounds per gallon (ppg)": 1 / 8.3454,
+    "pounds per cubic foot (lb/ft³)": 1 / 62.428,
+    "kilograms per cubic meter (kg/m³)": 1 / 1000,
+    "grams per cubic centimeter (g/cm³)": 1
+}
+
+rop_units = {
+    "meter per hour (m/h)": 1,
+    "meter per minute (m/min)": 60,
+    "foot per hour (ft/h)": 0.3048,
+    "foot per minute (ft/min)": 18.288
+}
+
+productivity_units = {
+    "barrel per day per psi (bpd/psi)": 1,
+    "cubic meter per day per bar (m³/d/bar)": 6.89476 / 0.158987,
+    "cubic meter per day per kPa (m³/d/kPa)": 0.00689476 / 0.158987
+}
+
+slowness_units = {
+    "microsecond per meter (μs/m)": 1,
+    "microsecond per foot (μs/ft)": 1 / 0.3048,
+    "second per meter (s/m)": 1e6
+}
+
+
+# Category name -> unit table for every linear (factor-based) category
+UNITS = {
+    "Length": length_units,
+    "Area": area_units,
+    "Volume": volume_units,
+    "Mass": mass_units,
+    "Density": density_units,
+    "Pressure": pressure_units,
+    "Force": force_units,
+    "Energy": energy_units,
+    "Power": power_units,
+    "Dynamic Viscosity": dynamic_visc_units,
+    "Kinematic Viscosity": kinematic_visc_units,
+    "Liquid Flow Rate": liquid_flow_units,
+    "Gas Flow Rate": gas_flow_units,
+    "Permeability": perm_units,
+    "Time": time_units,
+    "Velocity": velocity_units,
+    "Torque": torque_units,
+    "Gas-Oil Ratio (GOR)": gor_units,
+    "Salinity / Concentration": conc_units,
+    "Heat Capacity": heat_cap_units,
+    "Thermal Conductivity": therm_cond_units,
+    "Angle": angle_units,
+    "Electrical Resistivity": resist_units,
+    "Mud Weight": mud_units,
+    "Rate of Penetration (ROP)": rop_units,
+    "Productivity Index": productivity_units,
+    "Sonic Slowness": slowness_units
+}
+
+# Temperature scales as (degree size relative to °C, reading at 0 °C)
+temperature_scales = {
+    "Celsius (°C)": (1, 0),
+    "Fahrenheit (°F)": (1.8, 32),
+    "Kelvin (K)": (1, 273.15),
+    "Rankine (°R)": (1.8, 491.67)
+}
+
+# Units of the categories that are not a simple factor
+temperature_units = list(temperature_scales)
+gravity_units = ["API Gravity (°API)", "Specific Gravity (SG at 60°F)"]
+
+# Categories in display order
+CATEGORIES = [
+    "Length", "Area", "Volume", "Mass", "Density", "Temperature", "Pressure", 
+    "Force", "Energy", "Power", "Dynamic Viscosity", "Kinematic Viscosity", 
+    "Liquid Flow Rate", "Gas Flow Rate", "Permeability", "Time", "Velocity", 
+    "Torque", "Gas-Oil Ratio (GOR)", "API Gravity ↔ Specific Gravity", 
+    "Salinity / Concentration", "Heat Capacity", "Thermal Conductivity", 
+    "Angle", "Electrical Resistivity", "Mud Weight", "Rate of Penetration (ROP)",
+    "Productivity Index", "Sonic Slowness"
+]
+
+# Categories where negative values are physically meaningless
+INVALID_NEGATIVE = [
+    "Length", "Mass", "Volume", "Area", "Density", "Time", "Permeability",
+    "Dynamic Viscosity", "Kinematic Viscosity", "Liquid Flow Rate", 
+    "Gas Flow Rate", "Energy", "Power", "Force", "Sonic Slowness"
+]